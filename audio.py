@@ -2,21 +2,49 @@
 
 Provides a minimal interface to play sound events, toggle captions,
 manage volume and expose a stub for future text-to-speech integration.
+
+Nothing audio related happens at import time: pygame's mixer is imported and
+initialised by :func:`get_mixer` the first time a sound is actually played or
+loaded, and the decoder thread pool is created with the first decode.
+Headless runs can use :class:`NullSoundManager`, which never touches either.
 """
 
 from __future__ import annotations
 
+import threading
+import time
+from collections import OrderedDict
 from enum import Enum
-from typing import Dict, List
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Set
 from pathlib import Path
 
 from assets.loader import AssetLoader
 
-try:  # pragma: no cover - optional dependency
-    from pygame import mixer
-    mixer.init()  # type: ignore[attr-defined]
-except Exception:  # pragma: no cover - pygame may be unavailable
-    mixer = None  # type: ignore[assignment]
+if TYPE_CHECKING:  # pragma: no cover - imported lazily at runtime
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+# pygame's mixer once :func:`get_mixer` has initialised it, otherwise ``None``
+mixer = None
+_mixer_attempted = False
+
+
+def get_mixer() -> object | None:
+    """Return the initialised pygame mixer, or ``None`` if it is unavailable.
+
+    The first call imports pygame and initialises the audio device; later
+    calls are free.
+    """
+    global mixer, _mixer_attempted
+    if mixer is None and not _mixer_attempted:
+        _mixer_attempted = True
+        try:  # pragma: no cover - optional dependency
+            from pygame import mixer as pygame_mixer
+
+            pygame_mixer.init()
+            mixer = pygame_mixer
+        except Exception:  # pragma: no cover - pygame may be unavailable
+            mixer = None
+    return mixer
 
 
 class SoundEvent(Enum):
@@ -27,16 +55,172 @@ class SoundEvent(Enum):
     TTS = "tts"  # placeholder for text-to-speech events
 
 
+SOUND_FILES: Dict[SoundEvent, str] = {
+    SoundEvent.BELL: "bell.wav",
+    SoundEvent.ALERT: "alert.wav",
+    SoundEvent.TTS: "tts.wav",
+}
+
+
+def _sound_size(sound: object) -> int:
+    """Best-effort size in bytes of a decoded sound.
+
+    Computed from the duration and the mixer's sample format so the PCM buffer
+    is never copied just to be measured.
+    """
+    try:
+        frequency, fmt, channels = mixer.get_init()  # type: ignore[union-attr]
+        seconds = float(sound.get_length())  # type: ignore[attr-defined]
+    except Exception:
+        return 0
+    return int(seconds * frequency * channels * (abs(fmt) // 8))
+
+
+class SoundCache:
+    """Thread-safe LRU of decoded sounds bounded by a byte budget.
+
+    The most recently inserted sound is always kept, even when it alone
+    exceeds the budget.
+    """
+
+    def __init__(self, budget: int = 32 * 1024 * 1024) -> None:
+        self.budget = budget
+        self.size = 0
+        self._items: "OrderedDict[SoundEvent, tuple[object, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, event: SoundEvent) -> Optional[object]:
+        """Return the decoded sound for ``event`` and mark it recently used."""
+        with self._lock:
+            item = self._items.get(event)
+            if item is None:
+                return None
+            self._items.move_to_end(event)
+            return item[0]
+
+    def put(self, event: SoundEvent, sound: object, size: int = 0) -> None:
+        """Insert a decoded sound and evict the least recently used ones."""
+        with self._lock:
+            old = self._items.pop(event, None)
+            if old is not None:
+                self.size -= old[1]
+            self._items[event] = (sound, size)
+            self.size += size
+            while self.size > self.budget and len(self._items) > 1:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self.size -= evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+    def __contains__(self, event: object) -> bool:
+        return event in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class AudioDispatcher:
+    """Queue of sound events drained once per frame.
+
+    :meth:`submit` is cheap and bounded: an event that is already pending, or
+    that was played less than ``window`` seconds ago, is coalesced into that
+    playback instead of being queued again.  :meth:`drain` plays pending events
+    in submission order, deferring any event whose ``rate_limits`` entry (the
+    minimum number of seconds between two playbacks) has not yet elapsed.
+    """
+
+    def __init__(
+        self,
+        window: float = 0.05,
+        rate_limits: Dict[SoundEvent, float] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.window = window
+        self.rate_limits: Dict[SoundEvent, float] = dict(rate_limits or {})
+        self.clock = clock
+        self.coalesced = 0
+        self.played = 0
+        self._pending: Dict[SoundEvent, None] = {}
+        self._last_played: Dict[SoundEvent, float] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, event: SoundEvent) -> None:
+        """Queue ``event`` for the next :meth:`drain`."""
+        with self._lock:
+            if event in self._pending:
+                self.coalesced += 1
+                return
+            last = self._last_played.get(event)
+            if last is not None and self.clock() - last < self.window:
+                self.coalesced += 1
+                return
+            self._pending[event] = None
+
+    def drain(self, output: Callable[[SoundEvent], None]) -> int:
+        """Play pending events through ``output``; return how many played."""
+        with self._lock:
+            if not self._pending:
+                return 0
+            now = self.clock()
+            ready = []
+            for event in self._pending:
+                limit = self.rate_limits.get(event)
+                last = self._last_played.get(event)
+                if limit and last is not None and now - last < limit:
+                    continue  # deferred to a later frame
+                ready.append(event)
+                self._last_played[event] = now
+            for event in ready:
+                del self._pending[event]
+        for event in ready:
+            output(event)
+        self.played += len(ready)
+        return len(ready)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+
 class SoundManager:
-    """Manage playback of sound events and caption display."""
+    """Manage playback of sound events and caption display.
+
+    Decoded sounds live in a byte-budgeted :class:`SoundCache`.  Every known
+    sound is queued for background decoding (see :attr:`preloading`) as soon
+    as a mixer is available: when the manager is created if one was already
+    initialised, otherwise on the first playback, which is what initialises
+    it.  :meth:`play` never decodes on the calling
+    thread: a sound that is still not cached is handed to the background
+    decoder and skipped for that call.
 
-    def __init__(self, loader: AssetLoader | None = None) -> None:
+    With a ``dispatcher`` (:class:`AudioDispatcher`), :meth:`play` only
+    records history and captions and queues the event; the mixer is touched
+    when the game loop calls :meth:`drain` at a frame boundary.
+    """
+
+    def __init__(
+        self,
+        loader: AssetLoader | None = None,
+        cache_budget: int = 32 * 1024 * 1024,
+        decode_workers: int = 2,
+        dispatcher: AudioDispatcher | None = None,
+    ) -> None:
         self.loader = loader or AssetLoader()
+        self.dispatcher = dispatcher
         self.volume: float = 1.0
         self.captions_enabled: bool = False
         self.history: List[SoundEvent] = []
         self.captions: List[str] = []
-        self.sounds: Dict[SoundEvent, object] = {}
+        self.sounds = SoundCache(cache_budget)
+        self._paths: Dict[SoundEvent, Path] = {}
+        self._decode_workers = decode_workers
+        self._executor: Optional["ThreadPoolExecutor"] = None
+        self._pending: Dict[SoundEvent, "Future"] = {}
+        self._pending_lock = threading.Lock()
+        # events whose background decode failed; only explicit loads retry them
+        self._failed: Set[SoundEvent] = set()
         # Map events to logical channels for independent volume/mute control
         self._event_channel = {
             SoundEvent.BELL: "effects",
@@ -45,6 +229,8 @@ class SoundManager:
         }
         self.channel_volumes: Dict[str, float] = {"effects": 1.0, "tts": 1.0}
         self.muted_channels: set[str] = set()
+        # preload stage: decode every sound off the game thread up front
+        self.preloading: List["Future"] = self.preload() if mixer is not None else []
 
     # --- volume controls -------------------------------------------------
     def set_volume(self, level: float) -> None:
@@ -70,53 +256,106 @@ class SoundManager:
     # --- playback --------------------------------------------------------
     def _resolve_sound(self, event: SoundEvent) -> Path:
         """Return the file path for a given sound event."""
-        mapping = {
-            SoundEvent.BELL: "bell.wav",
-            SoundEvent.ALERT: "alert.wav",
-            SoundEvent.TTS: "tts.wav",
-        }
-        return self.loader.audio(mapping[event])
+        path = self._paths.get(event)
+        if path is None:
+            path = self._paths[event] = self.loader.audio(SOUND_FILES[event])
+        return path
 
     def load(self, event: SoundEvent) -> None:
         """Load a sound file for the given event using :mod:`pygame.mixer`."""
-        if mixer is None or event in self.sounds:
+        if get_mixer() is None or event in self.sounds:
             return
         path = self._resolve_sound(event)
         try:
-            self.sounds[event] = mixer.Sound(str(path))  # type: ignore[attr-defined]
+            sound = mixer.Sound(str(path))  # type: ignore[attr-defined]
         except Exception:
             # Loading failures shouldn't crash the game; keep as unresolved.
-            pass
+            self._failed.add(event)
+            return
+        self._failed.discard(event)
+        self.sounds.put(event, sound, _sound_size(sound))
 
     def load_all(self) -> None:
         """Preload all known sound events."""
         for event in SoundEvent:
             self.load(event)
 
+    def preload(self, events: Iterable[SoundEvent] | None = None) -> List["Future"]:
+        """Decode ``events`` (default: all) on the background thread pool.
+
+        Returns the futures so callers may wait for the preload to finish.
+        """
+        return [self._request(event) for event in (events or SoundEvent)]
+
+    def _request(self, event: SoundEvent) -> "Future":
+        with self._pending_lock:
+            future = self._pending.get(event)
+            if future is not None:
+                return future
+            if self._executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+
+                self._executor = ThreadPoolExecutor(
+                    self._decode_workers, thread_name_prefix="sound-decode"
+                )
+            future = self._executor.submit(self.load, event)
+            self._pending[event] = future
+        # registered outside the lock: the callback runs inline if already done
+        future.add_done_callback(lambda _f: self._finish(event))
+        return future
+
+    def _finish(self, event: SoundEvent) -> None:
+        with self._pending_lock:
+            self._pending.pop(event, None)
+
+    def close(self) -> None:
+        """Stop the background decoder threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
     def play(self, event: SoundEvent, caption: str | None = None) -> None:
         """Record a sound event and optionally show a caption."""
-        # Ensure the asset path is resolved for all consumers
-        _path = self._resolve_sound(event)
-        self.load(event)
-
-        channel = self._event_channel.get(event, "effects")
-        if channel not in self.muted_channels:
-            sound = self.sounds.get(event)
-            if sound is not None and mixer is not None:
-                vol = self.volume * self.channel_volumes.get(channel, 1.0)
-                try:
-                    sound.set_volume(vol)
-                except Exception:
-                    pass
-                try:
-                    sound.play()
-                except Exception:
-                    pass
+        if self.dispatcher is not None:
+            self.dispatcher.submit(event)
+        else:
+            self._output(event)
 
         self.history.append(event)
         if self.captions_enabled and caption:
             self.captions.append(caption)
 
+    def drain(self) -> int:
+        """Play events queued on the dispatcher; call once per frame."""
+        if self.dispatcher is None:
+            return 0
+        return self.dispatcher.drain(self._output)
+
+    def _output(self, event: SoundEvent) -> None:
+        """Send ``event`` to the mixer if its sound is decoded and audible."""
+        channel = self._event_channel.get(event, "effects")
+        if channel in self.muted_channels:
+            return
+        if mixer is None:
+            if get_mixer() is None:
+                return
+            # first real playback: decode the rest of the sounds in the background
+            self.preloading = self.preload()
+        sound = self.sounds.get(event)
+        if sound is None:
+            if event not in self._pending and event not in self._failed:
+                self._request(event)
+            return
+        vol = self.volume * self.channel_volumes.get(channel, 1.0)
+        try:
+            sound.set_volume(vol)
+        except Exception:
+            pass
+        try:
+            sound.play()
+        except Exception:
+            pass
+
     # --- text to speech --------------------------------------------------
     def speak(self, text: str) -> None:
         """Placeholder method for future text-to-speech integration."""
@@ -126,5 +365,29 @@ class SoundManager:
             self.captions.append(text)
 
 
-# Global sound manager instance used across the game.
+class NullSoundManager(SoundManager):
+    """Sound manager for headless runs.
+
+    Playback, speech and loading do nothing: no history or captions are
+    recorded, no decoder threads start and the mixer is never initialised,
+    so a long simulation pays nothing for audio.
+    """
+
+    def play(self, event: SoundEvent, caption: str | None = None) -> None:
+        pass
+
+    def speak(self, text: str) -> None:
+        pass
+
+    def drain(self) -> int:
+        return 0
+
+    def load(self, event: SoundEvent) -> None:
+        pass
+
+    def preload(self, events: Iterable[SoundEvent] | None = None) -> List["Future"]:
+        return []
+
+
+# Default sound manager for code not given one; see ``main.Game.sound``.
 sound_manager = SoundManager()
@@ -0,0 +1,12 @@
+"""Performance benchmarks for the simulation hot paths.
+
+The suite runs headless: SDL is pointed at its dummy drivers before any game
+module is imported so no display or audio device is needed.  Use
+``python -m bench run`` to record timings and ``python -m bench compare`` to
+check them against the stored baseline.
+"""
+
+import os
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
@@ -0,0 +1,61 @@
+"""Command line entry point: ``python -m bench {run,compare,memory}``."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from . import memory, suite
+
+
+def _print_results(document: dict) -> None:
+    for name, result in document["results"].items():
+        print(f"{name:40s} best {result['best'] * 1e6:12.1f}us"
+              f"  median {result['median'] * 1e6:12.1f}us")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench")
+    parser.add_argument("mode", choices=("run", "compare", "memory"))
+    parser.add_argument("--baseline", type=Path, default=suite.DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown as a fraction (compare mode)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("-k", dest="names", action="append",
+                        help="only run benchmarks whose name contains this")
+    parser.add_argument("--require-same-env", action="store_true",
+                        help="refuse to compare against a baseline recorded "
+                             "on a different Python version or architecture")
+    args = parser.parse_args(argv)
+
+    if args.mode == "memory":
+        for kind, size in memory.measure().items():
+            print(f"{kind:40s} {size:8.1f} bytes")
+        return 0
+
+    document = suite.run_all(args.repeat, args.names)
+    _print_results(document)
+    if args.mode == "run":
+        if args.names and args.baseline.exists():
+            # a filtered run only replaces the benchmarks it measured
+            document = suite.merge(suite.load(args.baseline), document)
+        suite.save(document, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    baseline = suite.load(args.baseline)
+    mismatch = suite.environment_mismatch(baseline, document)
+    if mismatch:
+        print(f"WARNING baseline recorded in a different environment: {mismatch}")
+        if args.require_same_env:
+            return 2
+    regressions = suite.compare(baseline, document, args.threshold)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""Memory footprint of the simulation's per-object state.
+
+``python -m bench memory`` reports how many bytes one customer and one
+machine cost, measured with :mod:`tracemalloc` over a large batch so that
+allocator overhead is included.  Request types are decoded from bytes, as
+:mod:`customers.arrivals` does, so every customer gets a fresh string unless
+the class interns it.
+"""
+
+from __future__ import annotations
+
+import gc
+import tracemalloc
+from typing import Callable, Dict, List
+
+from customers.customer import (
+    AverageCustomer,
+    Customer,
+    DIYCustomer,
+    ElderlyCustomer,
+    RushedCustomer,
+)
+from machines import Binder, Cutter, Folder, Laminator, Printer
+
+
+def bytes_per_object(factory: Callable[[int], object], count: int) -> float:
+    """Average bytes allocated per object when building ``count`` of them."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects: List[object] = [factory(index) for index in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    # the list holding them is not part of any object's footprint
+    list_bytes = objects.__sizeof__()
+    del objects
+    return (after - before - list_bytes) / count
+
+
+_REQUESTS = [name.encode() for name in ("copy", "scan", "bind", "laminate")]
+_CUSTOMER_KINDS = (Customer, AverageCustomer, ElderlyCustomer, RushedCustomer, DIYCustomer)
+_MACHINE_KINDS = (Printer, Cutter, Binder, Laminator, Folder)
+
+
+def _customer(index: int) -> object:
+    kind = _CUSTOMER_KINDS[index % len(_CUSTOMER_KINDS)]
+    return kind(_REQUESTS[index % len(_REQUESTS)].decode(), 50 + index % 500)
+
+
+def _machine(index: int) -> object:
+    return _MACHINE_KINDS[index % len(_MACHINE_KINDS)]()
+
+
+def measure(customers: int = 100_000, machines: int = 10_000) -> Dict[str, float]:
+    """Return bytes per customer and per machine."""
+    return {
+        "customer": bytes_per_object(_customer, customers),
+        "machine": bytes_per_object(_machine, machines),
+    }
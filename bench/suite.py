@@ -0,0 +1,475 @@
+"""Benchmark definitions, timing and baseline comparison."""
+
+from __future__ import annotations
+
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from audio import AudioDispatcher, SoundEvent, SoundManager
+from customers.arrivals import Arrival, ArrivalFeeder, read_binary, write_binary
+from customers.customer import Customer, ElderlyCustomer, RushedCustomer
+from customers.queue import DeadlineQueueManager, IndexedQueueManager, QueueManager
+from dispatch import DispatchPolicy, Dispatcher
+from journal import Journal, replay
+from machines import Binder, Cutter, CutJob, Laminator, Printer, plan_batches
+from latency import QuantileSketch
+from main import Game
+from metrics import Metrics
+from routing import Route, Router
+import snapshot
+from ui.navigation import Navigator
+from tutorial import Tutorial, TutorialStep
+from workflow import Pipeline, Station, run_workflow
+
+BASELINE_VERSION = 1
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+@dataclass
+class Benchmark:
+    """A named benchmark.
+
+    ``setup`` builds fresh state and returns the callable to time, so every
+    repeat starts from the same state.  ``number`` is how many times the
+    callable runs per repeat; results are reported per call.
+    """
+
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    number: int = 1
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str, number: int = 1) -> Callable:
+    """Register the decorated setup function as a benchmark."""
+
+    def register(setup: Callable[[], Callable[[], object]]) -> Callable:
+        BENCHMARKS.append(Benchmark(name, setup, number))
+        return setup
+
+    return register
+
+
+def _customers(count: int) -> List[Customer]:
+    kinds = (Customer, ElderlyCustomer, RushedCustomer)
+    return [kinds[i % 3]("copy", 50 + i % 500) for i in range(count)]
+
+
+# ----------------------------------------------------------------------
+# Benchmarks
+
+
+@benchmark("queue.add_customer[2000]")
+def _queue_add() -> Callable[[], object]:
+    customers = _customers(2000)
+
+    def run() -> None:
+        queue = QueueManager()
+        for customer in customers:
+            queue.add_customer(customer)
+
+    return run
+
+
+def _filled(queue: QueueManager, count: int) -> QueueManager:
+    for customer in _customers(count):
+        queue.add_customer(customer)
+    return queue
+
+
+@benchmark("queue.tick[2000]", number=50)
+def _queue_tick() -> Callable[[], object]:
+    return _filled(QueueManager(), 2000).tick
+
+
+@benchmark("deadline_queue.tick[2000]", number=50)
+def _deadline_queue_tick() -> Callable[[], object]:
+    return _filled(DeadlineQueueManager(), 2000).tick
+
+
+def _pop_for_tail(queue: QueueManager) -> Callable[[], object]:
+    # one binding customer behind 10k copy customers, taken by a free binder
+    queue.restore(_customers(10_000))
+    binding = Customer("bind", 50)
+
+    def run() -> None:
+        queue.restore([binding])
+        queue.pop_for(lambda request: request == "bind")
+
+    return run
+
+
+@benchmark("queue.pop_for[10k waiting, match at tail]", number=20)
+def _queue_pop_for() -> Callable[[], object]:
+    return _pop_for_tail(QueueManager())
+
+
+@benchmark("indexed_queue.pop_for[10k waiting, match at tail]", number=20)
+def _indexed_queue_pop_for() -> Callable[[], object]:
+    return _pop_for_tail(IndexedQueueManager())
+
+
+def _busy_printers(game: Game) -> Callable[[], object]:
+    for index in range(200):
+        game.spawn_machine(Printer()).start_job(f"job-{index}")
+
+    def run() -> None:
+        # stay below 100% so every call does the same work
+        for machine in game.machines.values():
+            machine.progress_value = 0
+        game.progress_jobs(1)
+
+    return run
+
+
+@benchmark("game.progress_jobs[200 machines]", number=20)
+def _progress_jobs() -> Callable[[], object]:
+    return _busy_printers(Game())
+
+
+@benchmark("game.progress_jobs[200 machines, metrics]", number=20)
+def _progress_jobs_metered() -> Callable[[], object]:
+    return _busy_printers(Game(metrics=Metrics()))
+
+
+@benchmark("game.progress_jobs[1000 machines, 10 busy]", number=200)
+def _progress_mostly_idle() -> Callable[[], object]:
+    game = Game()
+    machines = [game.spawn_machine(Printer()) for _ in range(1000)]
+    busy = machines[::100]
+    for index, machine in enumerate(busy):
+        machine.start_job(f"job-{index}")
+
+    def run() -> None:
+        for machine in busy:
+            machine.progress_value = 0
+        game.progress_jobs(1)
+
+    return run
+
+
+def _grid(size: int) -> Dict[str, List[str]]:
+    graph: Dict[str, List[str]] = {}
+    for x in range(size):
+        for y in range(size):
+            neighbours = []
+            for dx, dy in ((1, 0), (0, 1), (-1, 0), (0, -1)):
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < size and 0 <= ny < size:
+                    neighbours.append(f"{nx},{ny}")
+            graph[f"{x},{y}"] = neighbours
+    return graph
+
+
+@benchmark("navigator._bfs_path[100x100 grid]", number=5)
+def _navigator_bfs() -> Callable[[], object]:
+    navigator = Navigator(_grid(100))
+    return lambda: navigator._bfs_path("0,0", "99,99")
+
+
+@benchmark("navigator.select_station[100x100 grid]", number=1000)
+def _navigator_route() -> Callable[[], object]:
+    navigator = Navigator(_grid(100))
+    navigator.select_station("0,0", "99,99")  # build the routing tree once
+    return lambda: navigator.select_station("0,0", "99,99")
+
+
+@benchmark("sound_manager.play", number=1000)
+def _sound_play() -> Callable[[], object]:
+    manager = SoundManager()
+    return lambda: manager.play(SoundEvent.BELL, caption="customer entered")
+
+
+@benchmark("sound_manager.play[dispatch burst 200]", number=20)
+def _sound_play_dispatched() -> Callable[[], object]:
+    manager = SoundManager(dispatcher=AudioDispatcher())
+
+    def run() -> None:
+        for _ in range(200):
+            manager.play(SoundEvent.BELL, caption="customer entered")
+        manager.drain()
+
+    return run
+
+
+@benchmark("cutter.start_job[stack 1000]")
+def _cutter_stacking() -> Callable[[], object]:
+    def run() -> None:
+        cutter = Cutter()
+        cutter.unlock()
+        for index in range(1000):
+            cutter.start_job(f"cut-{index}", cut_type="trim", cuts=2)
+
+    return run
+
+
+@benchmark("cutter.plan_batches[1000]")
+def _cutter_planning() -> Callable[[], object]:
+    jobs = [
+        CutJob(f"cut-{index}", f"type-{index % 8}", 1 + index % 5, due=float(index * 4))
+        for index in range(1000)
+    ]
+    return lambda: plan_batches(jobs, setup_time=2.0, time_per_cut=1.0)
+
+
+@benchmark("game.dispatch[200 machines]", number=20)
+def _dispatch_pool() -> Callable[[], object]:
+    game = Game(dispatcher=Dispatcher(DispatchPolicy.LEAST_LOADED))
+    for _ in range(200):
+        game.spawn_machine(Printer())
+    queues = [_filled(QueueManager(), 200) for _ in range(20)]
+
+    def run() -> None:
+        game.queue = queues.pop()
+        for assignment in game.dispatch():
+            assignment.machine.complete()
+
+    return run
+
+
+def _large_shop() -> Game:
+    game = Game(queue=DeadlineQueueManager())
+    game.spawn_machine(Printer())
+    game.queue.restore(_customers(100_000))
+    return game
+
+
+@benchmark("snapshot.save[100k customers]")
+def _snapshot_save() -> Callable[[], object]:
+    game = _large_shop()
+    return lambda: snapshot.save(game)
+
+
+@benchmark("snapshot.load[100k customers]")
+def _snapshot_load() -> Callable[[], object]:
+    data = snapshot.save(_large_shop())
+    return lambda: snapshot.load(data)
+
+
+@benchmark("journal.replay[10k commands]")
+def _journal_replay() -> Callable[[], object]:
+    stream = io.StringIO()
+    game = Game()
+    game.journal = Journal(stream, game, checkpoint_every=2500, flush_every=1000)
+    for command in (["spawn", "printer"], ["spawn", "binder"], ["spawn", "printer"]):
+        game.execute(command)
+    for index in range(10_000 - 3):
+        step = index % 4
+        if step < 2:
+            game.execute(["add", "copy", str(5 + index % 20)])
+        elif step == 2:
+            game.execute(["process"])
+        else:
+            game.execute(["progress", "25"])
+    lines = stream.getvalue().splitlines()
+    return lambda: replay(lines)
+
+
+@benchmark("arrivals.feed[100k binary records]")
+def _arrival_feed() -> Callable[[], object]:
+    path = Path(tempfile.gettempdir()) / "print-shop-bench-arrivals.bin"
+    write_binary(str(path), (
+        Arrival(index // 4, ("copy", "scan", "bind")[index % 3], "average", 50)
+        for index in range(100_000)
+    ))
+
+    def run() -> None:
+        feeder = ArrivalFeeder(read_binary(str(path)), DeadlineQueueManager())
+        while feeder.next_time is not None:
+            feeder.feed(feeder.next_time + 999)
+
+    return run
+
+
+@benchmark("workflow.run_workflow", number=1000)
+def _run_workflow() -> Callable[[], object]:
+    customer = Customer("scan", patience=3)
+    station = Station()
+    return lambda: run_workflow(customer, station)
+
+
+def _cold_import(module: str) -> Callable[[], object]:
+    # a fresh interpreter per call, so the time includes its startup as well
+    command = [sys.executable, "-c", f"import {module}"]
+    root = Path(__file__).resolve().parent.parent
+    return lambda: subprocess.run(command, cwd=root, check=True)
+
+
+@benchmark("import machines[cold]", number=5)
+def _import_machines() -> Callable[[], object]:
+    return _cold_import("machines")
+
+
+@benchmark("import main[cold]", number=5)
+def _import_main() -> Callable[[], object]:
+    return _cold_import("main")
+
+
+@benchmark("stations.serial[10k customers]")
+def _run_workflow_many() -> Callable[[], object]:
+    customers = _customers(10_000)
+    station = Station()
+
+    def run() -> None:
+        for customer in customers:
+            run_workflow(customer, station)
+
+    return run
+
+
+@benchmark("stations.pipeline[10k customers]")
+def _pipeline() -> Callable[[], object]:
+    customers = _customers(10_000)
+    pipeline = Pipeline(workers=2, batch_size=256)
+    return lambda: pipeline.process(customers)
+
+
+@benchmark("routing.run[1k orders, 4 steps]")
+def _routing() -> Callable[[], object]:
+    route = Route("cards", {
+        "printer": (),
+        "cutter": ("printer",),
+        "laminator": ("printer",),
+        "binder": ("cutter", "laminator"),
+    })
+
+    def run() -> None:
+        router = Router(rate=50)
+        for factory in (Printer, Cutter, Laminator, Binder):
+            for _ in range(4):
+                machine = factory()
+                machine.unlock()
+                router.add_machine(machine)
+        router.run(600, ((tick // 2, route) for tick in range(1000)))
+
+    return run
+
+
+@benchmark("latency.sketch_add[100k samples]")
+def _sketch_add() -> Callable[[], object]:
+    values = [(i * 7919) % 10_000 / 10 for i in range(100_000)]
+
+    def run() -> None:
+        sketch = QuantileSketch()
+        for value in values:
+            sketch.add(value)
+
+    return run
+
+
+@benchmark("tutorial.notify[1000 steps]", number=20)
+def _tutorial_notify() -> Callable[[], object]:
+    steps = [
+        TutorialStep(f"step {i}", "E", "Printer", until=((f"event-{i}", "printer"),))
+        for i in range(1000)
+    ]
+    tutorial = Tutorial(steps)
+    events = [(f"event-{i}", "printer") for i in range(1000)]
+
+    def run() -> None:
+        tutorial.start()
+        for event, station in events:
+            tutorial.notify("job_started", station)  # ignored by every step
+            tutorial.notify(event, station)
+
+    return run
+
+
+# ----------------------------------------------------------------------
+# Running and comparing
+
+
+def time_benchmark(bench: Benchmark, repeat: int = 5) -> Dict[str, float]:
+    """Time ``bench`` and return best and median seconds per call."""
+    samples = []
+    for _ in range(repeat):
+        func = bench.setup()
+        start = time.perf_counter()
+        for _ in range(bench.number):
+            func()
+        samples.append((time.perf_counter() - start) / bench.number)
+    return {"best": min(samples), "median": statistics.median(samples)}
+
+
+def run_all(repeat: int = 5, names: Optional[List[str]] = None) -> Dict[str, object]:
+    """Run the registered benchmarks and return a baseline document."""
+    results = {}
+    for bench in BENCHMARKS:
+        if names and not any(name in bench.name for name in names):
+            continue
+        results[bench.name] = time_benchmark(bench, repeat)
+    return {
+        "version": BASELINE_VERSION,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def save(document: Dict[str, object], path: Path) -> None:
+    """Write a baseline document as JSON."""
+    path.write_text(json.dumps(document, indent=2, sort_keys=True) + "\n")
+
+
+def load(path: Path) -> Dict[str, object]:
+    """Read a baseline document, rejecting unknown versions."""
+    document = json.loads(path.read_text())
+    if document.get("version") != BASELINE_VERSION:
+        raise ValueError(f"unsupported baseline version in {path}")
+    return document
+
+
+def merge(baseline: Dict[str, object], document: Dict[str, object]) -> Dict[str, object]:
+    """Return ``baseline`` with the results of ``document`` added or replaced."""
+    merged = dict(document)
+    results = dict(baseline["results"])  # type: ignore[arg-type]
+    results.update(document["results"])  # type: ignore[arg-type]
+    merged["results"] = results
+    return merged
+
+
+def environment_mismatch(
+    baseline: Dict[str, object], current: Dict[str, object]
+) -> Optional[str]:
+    """Describe how the recording environments differ, if they do."""
+    differences = [
+        f"{key} {baseline.get(key)} != {current.get(key)}"
+        for key in ("python", "machine")
+        if baseline.get(key) != current.get(key)
+    ]
+    return ", ".join(differences) or None
+
+
+def compare(
+    baseline: Dict[str, object], current: Dict[str, object], threshold: float
+) -> List[str]:
+    """Return a message for every benchmark slower than ``threshold`` allows.
+
+    ``threshold`` is a fraction: ``0.25`` fails timings more than 25 % slower
+    than the baseline.  Benchmarks missing from either side are ignored.
+    """
+    regressions = []
+    old_results = baseline["results"]
+    new_results = current["results"]
+    for name, old in old_results.items():  # type: ignore[union-attr]
+        new = new_results.get(name)  # type: ignore[union-attr]
+        if new is None or old["best"] <= 0:
+            continue
+        ratio = new["best"] / old["best"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: {new['best'] * 1e6:.1f}us vs {old['best'] * 1e6:.1f}us"
+                f" ({ratio:.2f}x)"
+            )
+    return regressions
@@ -0,0 +1,200 @@
+"""Streaming customer arrivals from request logs.
+
+Arrival records carry a timestamp (in simulation ticks), a request type, an
+archetype name and a starting patience.  They are read lazily from either
+
+* JSON lines, one object per line::
+
+      {"time": 12, "request_type": "copy", "archetype": "elderly", "patience": 40}
+
+* or a fixed-width binary file, which is memory-mapped and decoded record by
+  record.  Its layout is a header (magic ``b"PSAR"``, u16 version, u64 record
+  count, u64 offset of the request type table), the records as
+  ``<qBHi`` (time, archetype code, request type code, patience) and the
+  request type table (u16 count, then u16 length and UTF-8 bytes per entry).
+
+:class:`ArrivalFeeder` adds the customers to a queue as simulated time
+reaches their timestamp, holding only one record of lookahead, so memory
+stays bounded however large the log is.  Logs must be sorted by time.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+from typing import IO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Type
+
+from .customer import Customer
+from .pool import ARCHETYPES
+from .queue import QueueManager
+
+ARCHETYPE_NAMES: Dict[str, Type[Customer]] = {
+    "customer": ARCHETYPES[0],
+    "average": ARCHETYPES[1],
+    "elderly": ARCHETYPES[2],
+    "rushed": ARCHETYPES[3],
+    "diy": ARCHETYPES[4],
+}
+_ARCHETYPE_CODES = {name: ARCHETYPES.index(cls) for name, cls in ARCHETYPE_NAMES.items()}
+_NAMES_BY_CODE = {code: name for name, code in _ARCHETYPE_CODES.items()}
+
+MAGIC = b"PSAR"
+VERSION = 1
+_HEADER = struct.Struct("<4sHQQ")
+_RECORD = struct.Struct("<qBHi")
+_U16 = struct.Struct("<H")
+
+
+class Arrival(NamedTuple):
+    """A customer entering the shop at ``time``."""
+
+    time: int
+    request_type: str
+    archetype: str = "average"
+    patience: int = 100
+
+    def customer(self) -> Customer:
+        return ARCHETYPE_NAMES[self.archetype](self.request_type, self.patience)
+
+
+# ----------------------------------------------------------------------
+# Readers
+
+
+def read_jsonl(path: str) -> Iterator[Arrival]:
+    """Yield the arrivals of a JSON lines log one line at a time."""
+    with open(path, encoding="utf-8") as source:
+        for line in source:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            yield Arrival(
+                int(record["time"]),
+                record["request_type"],
+                record.get("archetype", "average"),
+                int(record.get("patience", 100)),
+            )
+
+
+def read_binary(path: str) -> Iterator[Arrival]:
+    """Yield the arrivals of a fixed-width binary log through a memory map."""
+    with open(path, "rb") as source:
+        if not source.seek(0, 2):
+            return
+        with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            records = None
+            try:
+                magic, version, count, table = _HEADER.unpack_from(view)
+                if magic != MAGIC or version != VERSION:
+                    raise ValueError(f"{path} is not an arrival log")
+                requests = _read_table(view, table)
+                records = view[_HEADER.size:_HEADER.size + count * _RECORD.size]
+                names = _NAMES_BY_CODE
+                for time, archetype, request, patience in _RECORD.iter_unpack(records):
+                    yield Arrival(time, requests[request], names[archetype], patience)
+            finally:
+                # the map cannot close while views of it are alive
+                if records is not None:
+                    records.release()
+                view.release()
+
+
+def _read_table(view: memoryview, offset: int) -> List[str]:
+    (count,) = _U16.unpack_from(view, offset)
+    offset += _U16.size
+    names = []
+    for _ in range(count):
+        (length,) = _U16.unpack_from(view, offset)
+        offset += _U16.size
+        names.append(str(view[offset:offset + length], "utf-8"))
+        offset += length
+    return names
+
+
+def write_binary(path: str, arrivals: Iterable[Arrival]) -> int:
+    """Write ``arrivals`` as a binary log, streaming; returns the record count."""
+    requests: Dict[str, int] = {}
+    count = 0
+    with open(path, "wb") as target:
+        target.write(_HEADER.pack(MAGIC, VERSION, 0, 0))
+        pack = _RECORD.pack
+        for arrival in arrivals:
+            code = requests.setdefault(arrival.request_type, len(requests))
+            target.write(pack(
+                arrival.time, _ARCHETYPE_CODES[arrival.archetype], code, arrival.patience
+            ))
+            count += 1
+        table = target.tell()
+        _write_table(target, list(requests))
+        target.seek(0)
+        target.write(_HEADER.pack(MAGIC, VERSION, count, table))
+    return count
+
+
+def _write_table(target: IO[bytes], names: List[str]) -> None:
+    if len(names) > 0xFFFF:
+        raise ValueError("too many distinct request types for the binary format")
+    target.write(_U16.pack(len(names)))
+    for name in names:
+        encoded = name.encode("utf-8")
+        target.write(_U16.pack(len(encoded)))
+        target.write(encoded)
+
+
+def read_arrivals(path: str) -> Iterator[Arrival]:
+    """Pick :func:`read_jsonl` or :func:`read_binary` by file extension."""
+    if path.endswith((".jsonl", ".json")):
+        return read_jsonl(path)
+    return read_binary(path)
+
+
+# ----------------------------------------------------------------------
+# Feeding a queue
+
+
+class ArrivalFeeder:
+    """Release arrivals into ``queue`` as simulated time advances.
+
+    Only the next pending record is held in memory.  :attr:`next_time` is the
+    timestamp of that record, or ``None`` once the log is exhausted, which
+    lets event-driven callers jump straight to it.
+
+    Customers are added with :meth:`QueueManager.restore` unless ``announce``
+    is set, so replaying a long log does not ring the shop bell (and grow the
+    sound history) once per customer.
+    """
+
+    def __init__(
+        self, arrivals: Iterable[Arrival], queue: QueueManager, announce: bool = False
+    ) -> None:
+        self._arrivals = iter(arrivals)
+        self.queue = queue
+        self.announce = announce
+        self.released = 0
+        self._pending: Optional[Arrival] = next(self._arrivals, None)
+
+    @property
+    def next_time(self) -> Optional[int]:
+        return None if self._pending is None else self._pending.time
+
+    def feed(self, now: int) -> List[Customer]:
+        """Add every customer arriving at or before ``now``; returns them."""
+        added: List[Customer] = []
+        pending = self._pending
+        while pending is not None and pending.time <= now:
+            added.append(pending.customer())
+            following = next(self._arrivals, None)
+            if following is not None and following.time < pending.time:
+                raise ValueError(
+                    f"arrival log is not sorted: {following.time} after {pending.time}"
+                )
+            pending = self._pending = following
+        if self.announce:
+            for customer in added:
+                self.queue.add_customer(customer)
+        elif added:
+            self.queue.restore(added)
+        self.released += len(added)
+        return added
@@ -4,12 +4,17 @@ This module now contains multiple customer archetypes used by the tests.
 Each subtype has its own flavour of patience behaviour or interaction. The
 base :class:`Customer` also supports a ``assist`` method allowing one customer
 to temporarily help another, representing the optional "delegate" mechanic.
+
+The classes use ``__slots__`` and intern their ``request_type``, so a queue of
+a million customers holds a few shared strings instead of one per customer.
+Subclasses that do not declare slots of their own get a ``__dict__`` again.
 """
 
+import sys
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Customer:
     """Represents a customer waiting for service."""
 
@@ -17,9 +22,23 @@ class Customer:
     patience: int
     satisfaction: int = 0
 
+    def __post_init__(self) -> None:
+        self.request_type = sys.intern(self.request_type)
+
+    @classmethod
+    def patience_decay(cls, amount: int = 1) -> int:
+        """Return how much patience is lost when time advances by ``amount``.
+
+        This is the hook archetypes must override to change how fast they lose
+        patience; :meth:`decrement_patience` should not be overridden because
+        :class:`~customers.queue.DeadlineQueueManager` applies the rule without
+        calling it and rejects archetypes that replace it.
+        """
+        return amount
+
     def decrement_patience(self, amount: int = 1) -> int:
         """Decrease patience by ``amount`` and return remaining patience."""
-        self.patience = max(0, self.patience - amount)
+        self.patience = max(0, self.patience - self.patience_decay(amount))
         return self.patience
 
     def assist(self, other: "Customer") -> None:
@@ -39,33 +58,34 @@ class Customer:
         return self.patience == 0
 
 
-@dataclass
+@dataclass(slots=True)
 class AverageCustomer(Customer):
     """Standard customer with no special behaviour."""
 
 
-@dataclass
+@dataclass(slots=True)
 class ElderlyCustomer(Customer):
     """Elderly customer who loses patience more slowly."""
 
-    def decrement_patience(self, amount: int = 1) -> int:
+    @classmethod
+    def patience_decay(cls, amount: int = 1) -> int:
         """Half-speed patience decay (rounded down, minimum of one)."""
 
-        reduction = max(1, amount // 2)
-        return super().decrement_patience(reduction)
+        return max(1, amount // 2)
 
 
-@dataclass
+@dataclass(slots=True)
 class RushedCustomer(Customer):
     """Businessperson with rapid patience decay."""
 
-    def decrement_patience(self, amount: int = 1) -> int:
+    @classmethod
+    def patience_decay(cls, amount: int = 1) -> int:
         """Patience decays twice as fast."""
 
-        return super().decrement_patience(amount * 2)
+        return amount * 2
 
 
-@dataclass
+@dataclass(slots=True)
 class DIYCustomer(Customer):
     """DIY customer who will call for help if a jam occurs."""
 
@@ -0,0 +1,266 @@
+"""Struct-of-arrays customer storage for large stress scenarios.
+
+:class:`CustomerPool` keeps every customer attribute in a NumPy array instead
+of a separate :class:`~customers.customer.Customer` object, so patience decay
+for the whole population is a single masked array operation.  Individual
+customers are exposed through :class:`CustomerView` objects which read and
+write the underlying arrays and otherwise behave like ordinary customers.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterator, List, Sequence, Tuple, Type
+
+from .customer import (
+    AverageCustomer,
+    Customer,
+    DIYCustomer,
+    ElderlyCustomer,
+    RushedCustomer,
+)
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except Exception:  # pragma: no cover - numpy may be unavailable
+    np = None  # type: ignore[assignment]
+
+
+# Archetype codes stored in the pool are indexes into this tuple.
+ARCHETYPES: Tuple[Type[Customer], ...] = (
+    Customer,
+    AverageCustomer,
+    ElderlyCustomer,
+    RushedCustomer,
+    DIYCustomer,
+)
+_ARCHETYPE_CODES: Dict[Type[Customer], int] = {
+    cls: code for code, cls in enumerate(ARCHETYPES)
+}
+
+
+class CustomerView(Customer):
+    """Customer backed by a row of a :class:`CustomerPool`.
+
+    Views hold only the pool and row index; reading or assigning
+    ``request_type``, ``patience``, ``satisfaction`` (and ``called_for_help``
+    for DIY rows) goes straight to the pool arrays.  :meth:`CustomerPool.view`
+    returns an instance of a per-archetype subclass, so ``isinstance`` checks
+    and archetype behaviour such as
+    :meth:`~customers.customer.DIYCustomer.handle_jam` work as for ordinary
+    customers.  Views compare equal to any customer of the same archetype with
+    the same field values.
+    """
+
+    def __init__(self, pool: "CustomerPool", index: int) -> None:  # noqa: D107
+        self.pool = pool
+        self.index = index
+
+    @property  # type: ignore[override]
+    def request_type(self) -> str:
+        return self.pool.request_types[self.pool.request_code[self.index]]
+
+    @request_type.setter
+    def request_type(self, value: str) -> None:
+        self.pool.request_code[self.index] = self.pool.intern(value)
+
+    @property  # type: ignore[override]
+    def patience(self) -> int:
+        return int(self.pool.patience[self.index])
+
+    @patience.setter
+    def patience(self, value: int) -> None:
+        self.pool.patience[self.index] = value
+
+    @property  # type: ignore[override]
+    def satisfaction(self) -> int:
+        return int(self.pool.satisfaction[self.index])
+
+    @satisfaction.setter
+    def satisfaction(self, value: int) -> None:
+        self.pool.satisfaction[self.index] = value
+
+    @property
+    def archetype(self) -> Type[Customer]:
+        """Customer class whose behaviour this row follows."""
+        return ARCHETYPES[self.pool.archetype[self.index]]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Customer):
+            return NotImplemented
+        other_type = other.archetype if isinstance(other, CustomerView) else type(other)
+        return (self.archetype is other_type
+                and (self.request_type, self.patience, self.satisfaction)
+                == (other.request_type, other.patience, other.satisfaction))
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+class DIYCustomerView(CustomerView, DIYCustomer):
+    """View of a DIY row; ``called_for_help`` lives in the pool."""
+
+    @property  # type: ignore[override]
+    def called_for_help(self) -> bool:
+        return bool(self.pool.called_for_help[self.index])
+
+    @called_for_help.setter
+    def called_for_help(self, value: bool) -> None:
+        self.pool.called_for_help[self.index] = value
+
+
+def _view_class(archetype: Type[Customer]) -> Type[CustomerView]:
+    if archetype is DIYCustomer:
+        return DIYCustomerView
+    if archetype is Customer:
+        return CustomerView
+    return type(f"{archetype.__name__}View", (CustomerView, archetype), {})
+
+
+# View class per archetype code, so views inherit the archetype's behaviour.
+_VIEW_CLASSES: Tuple[Type[CustomerView], ...] = tuple(
+    _view_class(cls) for cls in ARCHETYPES
+)
+
+
+class CustomerPool:
+    """Columnar storage for many customers with vectorised patience decay.
+
+    Rows are appended with :meth:`add` or :meth:`add_many` and stay in the pool
+    until they walk out or are removed, which only clears their ``waiting``
+    flag; row indexes are therefore stable for the lifetime of the pool.
+    """
+
+    _COLUMNS = (
+        "request_code",
+        "patience",
+        "satisfaction",
+        "archetype",
+        "waiting",
+        "called_for_help",
+    )
+
+    def __init__(self, capacity: int = 1024) -> None:
+        if np is None:
+            raise RuntimeError("CustomerPool requires numpy")
+        capacity = max(1, capacity)
+        self.request_types: List[str] = []
+        self._request_codes: Dict[str, int] = {}
+        self.request_code = np.zeros(capacity, dtype=np.int32)
+        self.patience = np.zeros(capacity, dtype=np.int64)
+        self.satisfaction = np.zeros(capacity, dtype=np.int64)
+        self.archetype = np.zeros(capacity, dtype=np.int8)
+        self.waiting = np.zeros(capacity, dtype=bool)
+        self.called_for_help = np.zeros(capacity, dtype=bool)
+        self._size = 0
+        self._decay_tables: Dict[int, "np.ndarray"] = {}
+
+    # ------------------------------------------------------------------
+    # Population management
+    def intern(self, request_type: str) -> int:
+        """Return the integer code for ``request_type``, allocating if new."""
+        code = self._request_codes.get(request_type)
+        if code is None:
+            code = self._request_codes[request_type] = len(self.request_types)
+            self.request_types.append(request_type)
+        return code
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._size + extra
+        capacity = len(self.patience)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in self._COLUMNS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[: self._size] = old[: self._size]
+            setattr(self, name, new)
+
+    def add(
+        self, request_type: str, patience: int, archetype: Type[Customer] = Customer
+    ) -> CustomerView:
+        """Append a single waiting customer and return a view of it."""
+        self._reserve(1)
+        index = self._size
+        self.request_code[index] = self.intern(request_type)
+        self.patience[index] = patience
+        self.satisfaction[index] = 0
+        self.archetype[index] = _ARCHETYPE_CODES[archetype]
+        self.waiting[index] = True
+        self.called_for_help[index] = False
+        self._size += 1
+        return self.view(index)
+
+    def add_many(
+        self,
+        request_type: str,
+        patience: Sequence[int],
+        archetype: Type[Customer] = Customer,
+    ) -> "np.ndarray":
+        """Append customers sharing a request type and archetype in bulk.
+
+        Returns the row indexes of the new customers.
+        """
+        values = np.asarray(patience, dtype=np.int64)
+        count = len(values)
+        self._reserve(count)
+        rows = slice(self._size, self._size + count)
+        self.request_code[rows] = self.intern(request_type)
+        self.patience[rows] = values
+        self.satisfaction[rows] = 0
+        self.archetype[rows] = _ARCHETYPE_CODES[archetype]
+        self.waiting[rows] = True
+        self.called_for_help[rows] = False
+        self._size += count
+        return np.arange(rows.start, rows.stop)
+
+    def remove(self, index: int) -> None:
+        """Take a customer out of the waiting population."""
+        self.waiting[index] = False
+
+    # ------------------------------------------------------------------
+    # Simulation
+    def _decay_table(self, amount: int) -> "np.ndarray":
+        table = self._decay_tables.get(amount)
+        if table is None:
+            table = np.array(
+                [cls.patience_decay(amount) for cls in ARCHETYPES], dtype=np.int64
+            )
+            self._decay_tables[amount] = table
+        return table
+
+    def tick(self, amount: int = 1) -> "np.ndarray":
+        """Decay patience of all waiting customers at once.
+
+        Each archetype's :meth:`~customers.customer.Customer.patience_decay`
+        rule is applied through a per-archetype lookup table.  Customers whose
+        patience reaches zero stop waiting and their row indexes are returned.
+        """
+        n = self._size
+        waiting = self.waiting[:n]
+        patience = self.patience[:n]
+        reduction = self._decay_table(amount)[self.archetype[:n]]
+        np.subtract(patience, reduction, out=patience, where=waiting)
+        np.maximum(patience, 0, out=patience)
+        walked_out = np.flatnonzero(waiting & (patience == 0))
+        waiting[walked_out] = False
+        return walked_out
+
+    # ------------------------------------------------------------------
+    # Access
+    def view(self, index: int) -> CustomerView:
+        """Return a :class:`CustomerView` for row ``index``."""
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        return _VIEW_CLASSES[self.archetype[index]](self, index)
+
+    def waiting_indices(self) -> "np.ndarray":
+        """Row indexes of customers still waiting, in arrival order."""
+        return np.flatnonzero(self.waiting[: self._size])
+
+    def __iter__(self) -> Iterator[CustomerView]:
+        for index in self.waiting_indices():
+            yield self.view(int(index))
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.waiting[: self._size]))
@@ -1,26 +1,43 @@
+import heapq
 from collections import deque
-from typing import Deque, List, Optional
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
 
 from .customer import Customer
-from audio import SoundEvent, sound_manager
+from audio import SoundEvent, SoundManager, sound_manager
 
 
 class QueueManager:
-    """Manages a line of customers waiting for service."""
+    """Manages a line of customers waiting for service.
 
-    def __init__(self) -> None:
+    The entry bell rings on ``sound``, or on the shared
+    :data:`audio.sound_manager` when none is given.
+    """
+
+    def __init__(self, sound: Optional[SoundManager] = None) -> None:
         self._queue: Deque[Customer] = deque()
+        self.sound = sound
+
+    def _announce(self) -> None:
+        # ding the bell when a customer enters the shop
+        (self.sound or sound_manager).play(SoundEvent.BELL, caption="customer entered")
 
     def add_customer(self, customer: Customer) -> None:
         """Add a new customer to the queue."""
         self._queue.append(customer)
-        # ding the bell when a customer enters the shop
-        sound_manager.play(SoundEvent.BELL, caption="customer entered")
+        self._announce()
 
     def list_customers(self) -> List[Customer]:
         """Return a snapshot list of customers currently in queue."""
         return list(self._queue)
 
+    def restore(self, customers: Iterable[Customer]) -> None:
+        """Append ``customers`` in order without announcing them.
+
+        Used when loading saved state, where the customers are already in
+        the shop.
+        """
+        self._queue.extend(customers)
+
     def tick(self, amount: int = 1) -> List[Customer]:
         """Advance time by reducing patience; return customers who walked out."""
         walked_out: List[Customer] = []
@@ -31,11 +48,496 @@ class QueueManager:
                 walked_out.append(cust)
         return walked_out
 
+    def peek_next(self) -> Optional[Customer]:
+        """Return the next customer in line without removing them."""
+        return self._queue[0] if self._queue else None
+
     def pop_next(self) -> Optional[Customer]:
         """Retrieve the next customer in line."""
         if self._queue:
             return self._queue.popleft()
         return None
 
+    def pop_for(self, accepts: Callable[[str], bool]) -> Optional[Customer]:
+        """Remove and return the first customer whose request type ``accepts`` allows.
+
+        This scans the line; :class:`IndexedQueueManager` answers it from its
+        per-request-type index instead.
+        """
+        for index, customer in enumerate(self._queue):
+            if accepts(customer.request_type):
+                del self._queue[index]
+                return customer
+        return None
+
     def __len__(self) -> int:  # pragma: no cover - trivial
         return len(self._queue)
+
+
+class _Lane:
+    """Customers sharing one patience decay rule.
+
+    ``elapsed`` is the total patience every member has lost since the lane was
+    created, so a customer walks out once ``elapsed`` reaches the deadline
+    recorded when they joined.
+    """
+
+    __slots__ = ("decay", "elapsed", "heap", "stale")
+
+    def __init__(self, decay: Callable[[int], int]) -> None:
+        self.decay = decay
+        self.elapsed = 0
+        self.heap: List[Tuple[int, int, "_Entry"]] = []
+        self.stale = 0
+
+
+class _Entry:
+    """Position of a customer in a :class:`DeadlineQueueManager`.
+
+    ``synced`` is the lane clock at the last time the customer's ``patience``
+    was brought up to date; the decay since then is still owed.
+    """
+
+    __slots__ = ("customer", "seq", "deadline", "lane", "synced", "waiting")
+
+    def __init__(self, customer: Customer, seq: int, lane: _Lane) -> None:
+        self.customer = customer
+        self.seq = seq
+        self.lane = lane
+        self.synced = lane.elapsed
+        self.deadline = lane.elapsed + customer.patience
+        self.waiting = True
+
+    def sync(self) -> Customer:
+        """Apply the decay owed since the last sync to the customer.
+
+        The delta is applied to the customer's current patience, so changes
+        made while waiting (e.g. through :meth:`Customer.assist`) are kept.
+        """
+        elapsed = self.lane.elapsed
+        customer = self.customer
+        customer.patience = max(0, customer.patience - (elapsed - self.synced))
+        self.synced = elapsed
+        return customer
+
+    def live(self, item: Tuple[int, int, "_Entry"]) -> bool:
+        """Whether heap ``item`` is this entry's current deadline slot."""
+        return self.waiting and item[0] == self.deadline
+
+
+def _decay_rule(cls: type) -> object:
+    """Return the ``patience_decay`` attribute object ``cls`` resolves to.
+
+    The raw class attribute (classmethod, staticmethod or function) identifies
+    the rule, so archetypes that inherit a rule share a lane.
+    """
+    for klass in cls.__mro__:
+        if "patience_decay" in vars(klass):
+            return vars(klass)["patience_decay"]
+    raise TypeError(f"{cls.__name__} has no patience_decay rule")
+
+
+class DeadlineQueueManager(QueueManager):
+    """Queue that stores each customer's walk-out deadline in a heap.
+
+    Customers are grouped by their archetype's
+    :meth:`~customers.customer.Customer.patience_decay` rule, which is the
+    required extension point: archetypes that override ``decrement_patience``
+    instead are rejected by :meth:`add_customer`.  Ticking only advances a
+    per-rule clock and pops the customers whose deadline has been reached, so
+    :meth:`tick` costs ``O(k log n)`` for ``k`` walk-outs instead of touching
+    every waiting customer.
+
+    Patience is decayed lazily and applied to a customer when it is handed out
+    by :meth:`pop_next` or :meth:`list_customers`.  Changes made to a waiting
+    customer's ``patience`` are preserved; a raise is picked up when the old
+    deadline is reached, while a customer who lost patience (e.g. through
+    :meth:`~customers.customer.Customer.assist`) only walks out earlier once
+    :meth:`reschedule` is called for them.
+    """
+
+    def __init__(self, sound: Optional[SoundManager] = None) -> None:
+        self.sound = sound
+        # QueueManager's deque is not used: entries are tracked here instead
+        self._entries: Deque[_Entry] = deque()
+        self._lanes: Dict[object, _Lane] = {}
+        self._lane_for_type: Dict[type, _Lane] = {}
+        self._by_id: Dict[int, _Entry] = {}
+        self._seq = 0
+        self._size = 0
+        self._dead = 0
+
+    def _lane(self, customer: Customer) -> _Lane:
+        cls = type(customer)
+        lane = self._lane_for_type.get(cls)
+        if lane is None:
+            if cls.decrement_patience is not Customer.decrement_patience:
+                raise TypeError(
+                    f"{cls.__name__} overrides decrement_patience; "
+                    "override patience_decay instead"
+                )
+            rule = _decay_rule(cls)
+            lane = self._lanes.get(rule)
+            if lane is None:
+                lane = self._lanes[rule] = _Lane(customer.patience_decay)
+            self._lane_for_type[cls] = lane
+        return lane
+
+    def add_customer(self, customer: Customer) -> None:
+        """Add a new customer to the queue."""
+        lane = self._lane(customer)
+        entry = _Entry(customer, self._seq, lane)
+        self._seq += 1
+        heapq.heappush(lane.heap, (entry.deadline, entry.seq, entry))
+        self._entries.append(entry)
+        self._by_id[id(customer)] = entry
+        self._size += 1
+        self._announce()
+
+    def restore(self, customers: Iterable[Customer]) -> None:
+        """Append ``customers`` in order without announcing them.
+
+        A lane receiving many customers has its heap rebuilt once at the end
+        instead of pushing each one.
+        """
+        entries, by_id, lanes = self._entries, self._by_id, self._lane_for_type
+        sizes = {id(lane): len(lane.heap) for lane in self._lanes.values()}
+        seq = self._seq
+        for customer in customers:
+            lane = lanes.get(type(customer)) or self._lane(customer)
+            entry = _Entry(customer, seq, lane)
+            seq += 1
+            lane.heap.append((entry.deadline, entry.seq, entry))
+            entries.append(entry)
+            by_id[id(customer)] = entry
+        self._size += seq - self._seq
+        self._seq = seq
+        for lane in self._lanes.values():
+            heap = lane.heap
+            before = sizes.get(id(lane), 0)
+            if len(heap) - before > before // 8:
+                heapq.heapify(heap)
+            else:
+                added = heap[before:]
+                del heap[before:]
+                for item in added:
+                    heapq.heappush(heap, item)
+
+    def reschedule(self, customer: Customer) -> None:
+        """Recompute the deadline of a waiting customer whose patience changed."""
+        entry = self._by_id[id(customer)]
+        entry.sync()
+        lane = entry.lane
+        entry.deadline = lane.elapsed + customer.patience
+        heapq.heappush(lane.heap, (entry.deadline, entry.seq, entry))
+        lane.stale += 1
+
+    def list_customers(self) -> List[Customer]:
+        """Return a snapshot list of customers currently in queue."""
+        return [entry.sync() for entry in self._entries if entry.waiting]
+
+    def tick(self, amount: int = 1) -> List[Customer]:
+        """Advance time by reducing patience; return customers who walked out.
+
+        Walk-outs are returned in queue order, matching :class:`QueueManager`.
+        """
+        return self.advance(1, amount)
+
+    def advance(self, ticks: int, amount: int = 1) -> List[Customer]:
+        """Apply ``ticks`` consecutive calls of :meth:`tick` at once.
+
+        Every tick removes the same patience, so the jump only costs one clock
+        update per decay rule plus the walk-outs it produces.
+        """
+        walked_out: List[_Entry] = []
+        for lane in self._lanes.values():
+            lane.elapsed += lane.decay(amount) * ticks
+            heap = lane.heap
+            while heap and heap[0][0] <= lane.elapsed:
+                item = heapq.heappop(heap)
+                entry = item[2]
+                if not entry.live(item):
+                    lane.stale -= 1
+                    continue
+                if entry.sync().patience > 0:
+                    # patience was raised while waiting: move the deadline
+                    entry.deadline = lane.elapsed + entry.customer.patience
+                    heapq.heappush(heap, (entry.deadline, entry.seq, entry))
+                    continue
+                entry.waiting = False
+                walked_out.append(entry)
+        if not walked_out:
+            return []
+        self._size -= len(walked_out)
+        self._dead += len(walked_out)
+        if self._dead > self._size:
+            self._entries = deque(e for e in self._entries if e.waiting)
+            self._dead = 0
+        walked_out.sort(key=lambda entry: entry.seq)
+        for entry in walked_out:
+            del self._by_id[id(entry.customer)]
+        return [entry.customer for entry in walked_out]
+
+    def ticks_until_walkout(self, amount: int = 1) -> Optional[int]:
+        """Return how many ``tick(amount)`` calls until the next walk-out.
+
+        ``None`` is returned when nobody would ever walk out.  A customer whose
+        deadline has already passed still needs one more tick to leave.
+        """
+        best: Optional[int] = None
+        for lane in self._lanes.values():
+            heap = lane.heap
+            while heap and not heap[0][2].live(heap[0]):
+                heapq.heappop(heap)
+                lane.stale -= 1
+            decay = lane.decay(amount)
+            if not heap or decay <= 0:
+                continue
+            remaining = heap[0][0] - lane.elapsed
+            ticks = max(1, -(-remaining // decay))
+            if best is None or ticks < best:
+                best = ticks
+        return best
+
+    def peek_next(self) -> Optional[Customer]:
+        """Return the next customer in line without removing them."""
+        entries = self._entries
+        while entries and not entries[0].waiting:
+            entries.popleft()
+            self._dead -= 1
+        return entries[0].sync() if entries else None
+
+    def pop_next(self) -> Optional[Customer]:
+        """Retrieve the next customer in line."""
+        entries = self._entries
+        while entries:
+            entry = entries.popleft()
+            if not entry.waiting:
+                self._dead -= 1
+                continue
+            return self._take(entry)
+        return None
+
+    def pop_for(self, accepts: Callable[[str], bool]) -> Optional[Customer]:
+        """Remove and return the first customer whose request type ``accepts`` allows."""
+        for entry in self._entries:
+            if entry.waiting and accepts(entry.customer.request_type):
+                # the entry stays in the line as a tombstone, like a walk-out
+                self._dead += 1
+                return self._take(entry)
+        return None
+
+    def _take(self, entry: _Entry) -> Customer:
+        entry.waiting = False
+        self._size -= 1
+        del self._by_id[id(entry.customer)]
+        lane = entry.lane
+        lane.stale += 1
+        if lane.stale * 2 > len(lane.heap):
+            # drop heap slots of customers who have already been served
+            lane.heap = [item for item in lane.heap if item[2].live(item)]
+            heapq.heapify(lane.heap)
+            lane.stale = 0
+        return entry.sync()
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class _Slot:
+    """A customer's place in an :class:`IndexedQueueManager`.
+
+    The slot is shared by the line and both indexes; clearing ``waiting``
+    removes the customer from all of them at once.
+    """
+
+    __slots__ = ("customer", "seq", "waiting")
+
+    def __init__(self, customer: Customer, seq: int) -> None:
+        self.customer = customer
+        self.seq = seq
+        self.waiting = True
+
+
+def _head(bucket: Optional[Deque[_Slot]]) -> Optional[_Slot]:
+    """First waiting slot of ``bucket``, dropping removed ones in front of it."""
+    if not bucket:
+        return None
+    while bucket and not bucket[0].waiting:
+        bucket.popleft()
+    return bucket[0] if bucket else None
+
+
+class IndexedQueueManager(QueueManager):
+    """Queue indexed by request type and by archetype.
+
+    Besides the line itself every customer sits in a bucket for their
+    ``request_type`` and one for their class, each in arrival order, so
+    :meth:`peek_request`, :meth:`pop_request`, :meth:`peek_archetype` and
+    :meth:`pop_archetype` only look at the head of one bucket, and
+    :meth:`pop_for` at one head per request type.  Removing a customer, by
+    serving them, a walk-out or :meth:`remove`, marks their slot and costs
+    ``O(1)``; buckets drop marked slots when they reach the front and are
+    compacted once marked slots outnumber waiting customers.
+
+    ``priority`` optionally maps a customer to a lane: higher lanes are
+    served first and arrival order holds within a lane.  Lookups check each
+    lane in turn, so they scale with the number of lanes, not customers.
+    Archetype lookups match the exact class.
+    """
+
+    def __init__(
+        self,
+        sound: Optional[SoundManager] = None,
+        priority: Optional[Callable[[Customer], int]] = None,
+    ) -> None:
+        self.sound = sound
+        self.priority = priority
+        # id(customer) -> slot of every waiting customer, in arrival order
+        self._by_id: Dict[int, _Slot] = {}
+        self._lanes: Dict[int, Deque[_Slot]] = {}
+        self._lane_order: List[int] = []  # highest lane first
+        self._by_type: Dict[Tuple[int, str], Deque[_Slot]] = {}
+        self._by_archetype: Dict[Tuple[int, type], Deque[_Slot]] = {}
+        self._request_types: Dict[str, None] = {}
+        self._seq = 0
+        self._dead = 0
+
+    def _insert(self, customer: Customer) -> None:
+        lane = self.priority(customer) if self.priority is not None else 0
+        slot = _Slot(customer, self._seq)
+        self._seq += 1
+        line = self._lanes.get(lane)
+        if line is None:
+            line = self._lanes[lane] = deque()
+            self._lane_order = sorted(self._lanes, reverse=True)
+        line.append(slot)
+        request_type = customer.request_type
+        self._request_types[request_type] = None
+        self._by_type.setdefault((lane, request_type), deque()).append(slot)
+        self._by_archetype.setdefault((lane, type(customer)), deque()).append(slot)
+        self._by_id[id(customer)] = slot
+
+    def add_customer(self, customer: Customer) -> None:
+        """Add a new customer to the queue."""
+        self._insert(customer)
+        self._announce()
+
+    def restore(self, customers: Iterable[Customer]) -> None:
+        """Append ``customers`` in order without announcing them."""
+        for customer in customers:
+            self._insert(customer)
+
+    def list_customers(self) -> List[Customer]:
+        """Return a snapshot list of customers in service order."""
+        return [
+            slot.customer
+            for lane in self._lane_order
+            for slot in self._lanes[lane]
+            if slot.waiting
+        ]
+
+    # --- removal -----------------------------------------------------------
+    def _take(self, slot: _Slot) -> Customer:
+        slot.waiting = False
+        del self._by_id[id(slot.customer)]
+        self._dead += 1
+        if self._dead > len(self._by_id) + 64:
+            self._compact()
+        return slot.customer
+
+    def _compact(self) -> None:
+        indexes: Tuple[Dict[Any, Deque[_Slot]], ...] = (
+            self._lanes, self._by_type, self._by_archetype
+        )
+        for index in indexes:
+            for key, bucket in list(index.items()):
+                live = deque(slot for slot in bucket if slot.waiting)
+                if live or index is self._lanes:
+                    index[key] = live
+                else:
+                    del index[key]
+        self._request_types = {lane_type: None for _, lane_type in self._by_type}
+        self._dead = 0
+
+    def remove(self, customer: Customer) -> bool:
+        """Take ``customer`` out of the queue; returns whether they were waiting."""
+        slot = self._by_id.get(id(customer))
+        if slot is None:
+            return False
+        self._take(slot)
+        return True
+
+    def tick(self, amount: int = 1) -> List[Customer]:
+        """Advance time by reducing patience; return customers who walked out."""
+        walked_out: List[Customer] = []
+        for slot in list(self._by_id.values()):
+            customer = slot.customer
+            customer.decrement_patience(amount)
+            if customer.walked_out:
+                self._take(slot)
+                walked_out.append(customer)
+        return walked_out
+
+    # --- lookups -----------------------------------------------------------
+    def _first(self, index: Dict[Any, Deque[_Slot]], key: object) -> Optional[_Slot]:
+        for lane in self._lane_order:
+            slot = _head(index.get((lane, key)))
+            if slot is not None:
+                return slot
+        return None
+
+    def peek_next(self) -> Optional[Customer]:
+        """Return the next customer in line without removing them."""
+        for lane in self._lane_order:
+            slot = _head(self._lanes[lane])
+            if slot is not None:
+                return slot.customer
+        return None
+
+    def pop_next(self) -> Optional[Customer]:
+        """Retrieve the next customer in line."""
+        for lane in self._lane_order:
+            slot = _head(self._lanes[lane])
+            if slot is not None:
+                return self._take(slot)
+        return None
+
+    def peek_request(self, request_type: str) -> Optional[Customer]:
+        """Next customer waiting for ``request_type``, without removing them."""
+        slot = self._first(self._by_type, request_type)
+        return slot.customer if slot is not None else None
+
+    def pop_request(self, request_type: str) -> Optional[Customer]:
+        """Remove and return the next customer waiting for ``request_type``."""
+        slot = self._first(self._by_type, request_type)
+        return self._take(slot) if slot is not None else None
+
+    def peek_archetype(self, archetype: type) -> Optional[Customer]:
+        """Next waiting customer of class ``archetype``, without removing them."""
+        slot = self._first(self._by_archetype, archetype)
+        return slot.customer if slot is not None else None
+
+    def pop_archetype(self, archetype: type) -> Optional[Customer]:
+        """Remove and return the next waiting customer of class ``archetype``."""
+        slot = self._first(self._by_archetype, archetype)
+        return self._take(slot) if slot is not None else None
+
+    def pop_for(self, accepts: Callable[[str], bool]) -> Optional[Customer]:
+        """Remove and return the first customer whose request type ``accepts`` allows.
+
+        Only the head of each request type's bucket is considered.
+        """
+        wanted = [t for t in self._request_types if accepts(t)]
+        for lane in self._lane_order:
+            best: Optional[_Slot] = None
+            for request_type in wanted:
+                slot = _head(self._by_type.get((lane, request_type)))
+                if slot is not None and (best is None or slot.seq < best.seq):
+                    best = slot
+            if best is not None:
+                return self._take(best)
+        return None
+
+    def __len__(self) -> int:
+        return len(self._by_id)
@@ -0,0 +1,171 @@
+"""Automatic assignment of waiting customers to idle machines.
+
+A :class:`Dispatcher` looks at the customer at the head of the queue, collects
+the idle machines that can serve its ``request_type`` and lets a policy pick
+one of them.  Customers are served strictly in queue order; dispatching stops
+as soon as the head customer has no idle compatible machine.
+
+With ``skip_blocked`` set, a head customer nobody idle can serve no longer
+holds up the line: each idle machine, in policy order, takes the earliest
+waiting customer it can serve through ``queue.pop_for``, which
+:class:`~customers.queue.IndexedQueueManager` answers from its request type
+index.
+
+Policies are either a :class:`DispatchPolicy` or a callable returning a sort
+key for a candidate machine; the candidate with the smallest key wins and
+ties go to the machine spawned first::
+
+    Dispatcher(DispatchPolicy.LEAST_LOADED)
+    Dispatcher(lambda key, machine, dispatcher: machine.progress_value)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+from functools import partial
+from typing import Callable, Collection, Dict, List, Mapping, Optional, Union
+
+from customers.customer import Customer
+from customers.queue import QueueManager
+from machines import Machine, MachineError
+
+
+class DispatchPolicy(Enum):
+    FIRST_IDLE = "first_idle"  # first idle machine in spawn order
+    LEAST_LOADED = "least_loaded"  # idle machine that has been given the fewest jobs
+    SHORTEST_EXPECTED_FINISH = "shortest_expected_finish"  # quickest machine for a new job
+
+
+PolicyKey = Callable[[str, Machine, "Dispatcher"], float]
+
+
+@dataclass
+class Assignment:
+    """A customer handed to machine ``key``.
+
+    ``error`` holds the reason when the machine refused the job; the customer
+    has left the queue either way.
+    """
+
+    key: str
+    machine: Machine
+    customer: Customer
+    error: Optional[str] = None
+
+
+def machine_kind(key: str) -> str:
+    """Pool a machine key belongs to: ``"printer-2"`` -> ``"printer"``."""
+    kind, _, number = key.rpartition("-")
+    return kind if kind and number.isdigit() else key
+
+
+class Dispatcher:
+    """Match waiting customers to idle compatible machines.
+
+    Parameters
+    ----------
+    policy:
+        How to choose between several idle compatible machines.
+    routes:
+        Optional mapping of ``request_type`` to the machine kinds (pool names
+        such as ``"printer"``) allowed to serve it.  Request types without an
+        entry may use any machine whose :meth:`~machines.base.Machine.accepts`
+        returns true.
+    rate:
+        Progress per tick used to estimate job durations for
+        :attr:`DispatchPolicy.SHORTEST_EXPECTED_FINISH`.
+    skip_blocked:
+        Let idle machines serve customers behind a head customer that
+        cannot be served right now.
+    """
+
+    def __init__(
+        self,
+        policy: Union[DispatchPolicy, PolicyKey] = DispatchPolicy.FIRST_IDLE,
+        routes: Optional[Mapping[str, Collection[str]]] = None,
+        rate: int = 10,
+        skip_blocked: bool = False,
+    ) -> None:
+        self.policy = policy
+        self.routes = dict(routes or {})
+        self.rate = rate
+        self.skip_blocked = skip_blocked
+        # machine key -> jobs handed out so far
+        self.load: Dict[str, int] = {}
+
+    def compatible(self, key: str, machine: Machine, request_type: str) -> bool:
+        kinds = self.routes.get(request_type)
+        if kinds is not None and machine_kind(key) not in kinds:
+            return False
+        return machine.accepts(request_type)
+
+    def _key(self, key: str, machine: Machine) -> float:
+        policy = self.policy
+        if policy is DispatchPolicy.FIRST_IDLE:
+            return 0
+        if policy is DispatchPolicy.LEAST_LOADED:
+            return self.load.get(key, 0)
+        if policy is DispatchPolicy.SHORTEST_EXPECTED_FINISH:
+            return machine.expected_ticks(self.rate)
+        return policy(key, machine, self)
+
+    def choose(
+        self, machines: Mapping[str, Machine], customer: Customer
+    ) -> Optional[str]:
+        """Key of the idle machine that should serve ``customer``, if any."""
+        best: Optional[str] = None
+        best_key = 0.0
+        for key, machine in machines.items():
+            if not machine.can_start() or not self.compatible(key, machine, customer.request_type):
+                continue
+            sort_key = self._key(key, machine)
+            if best is None or sort_key < best_key:
+                best, best_key = key, sort_key
+                if self.policy is DispatchPolicy.FIRST_IDLE:
+                    break
+        return best
+
+    def dispatch(
+        self, queue: QueueManager, machines: Mapping[str, Machine]
+    ) -> List[Assignment]:
+        """Start jobs for waiting customers while compatible machines are idle."""
+        if self.skip_blocked:
+            return self._dispatch_idle(queue, machines)
+        assignments: List[Assignment] = []
+        while len(queue):
+            head = queue.peek_next()
+            if head is None:
+                break
+            key = self.choose(machines, head)
+            if key is None:
+                break
+            customer = queue.pop_next()
+            assignments.append(self._assign(key, machines[key], customer))
+        return assignments
+
+    def _dispatch_idle(
+        self, queue: QueueManager, machines: Mapping[str, Machine]
+    ) -> List[Assignment]:
+        idle = sorted(
+            (self._key(key, machine), order, key)
+            for order, (key, machine) in enumerate(machines.items())
+            if machine.can_start()
+        )
+        assignments: List[Assignment] = []
+        for _, _, key in idle:
+            if not len(queue):
+                break
+            machine = machines[key]
+            customer = queue.pop_for(partial(self.compatible, key, machine))
+            if customer is not None:
+                assignments.append(self._assign(key, machine, customer))
+        return assignments
+
+    def _assign(self, key: str, machine: Machine, customer: Customer) -> Assignment:
+        self.load[key] = self.load.get(key, 0) + 1
+        try:
+            machine.start_job(customer.request_type)
+        except MachineError as exc:
+            return Assignment(key, machine, customer, str(exc))
+        return Assignment(key, machine, customer)
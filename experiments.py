@@ -0,0 +1,241 @@
+"""Parallel Monte-Carlo experiments over simulated shop days.
+
+A :class:`Scenario` describes a shop layout and its customer traffic.
+:func:`run_experiment` simulates many independently seeded days of that
+scenario with :class:`~simulation.Simulation`, fanning the runs out over a
+process pool, and summarises the per-run statistics as confidence intervals.
+Every run builds its own :class:`~main.Game`, so no state leaks between runs,
+and run ``i`` always uses the seed derived from ``(master_seed, i)``; results
+are therefore identical for a given master seed regardless of worker count.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from statistics import NormalDist, fmean, stdev
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+from customers.customer import (
+    AverageCustomer,
+    Customer,
+    ElderlyCustomer,
+    RushedCustomer,
+)
+from audio import NullSoundManager
+from customers.queue import DeadlineQueueManager
+from dispatch import DispatchPolicy, Dispatcher
+from machines import Binder, Folder, Laminator, Machine, Printer
+from main import Game
+from simulation import Simulation
+from tutorial import TutorialMode
+from workflow import Station, run_workflow
+
+MACHINE_TYPES: Dict[str, Type[Machine]] = {
+    "printer": Printer,
+    "binder": Binder,
+    "laminator": Laminator,
+    "folder": Folder,
+}
+
+ARCHETYPES: Dict[str, Type[Customer]] = {
+    "average": AverageCustomer,
+    "elderly": ElderlyCustomer,
+    "rushed": RushedCustomer,
+}
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Parameters of one simulated shop day.
+
+    ``arrival_rate`` is the mean number of customers per tick.  Each entry of
+    ``rush_hours`` is ``(start, end, multiplier)`` and scales the arrival rate
+    for ticks in ``[start, end)``.  Machines are given by type name and may
+    repeat to form a pool; all of them are unlocked so the scenario measures
+    capacity.  Waiting customers are assigned to idle machines according to
+    ``policy``.
+    """
+
+    machines: Tuple[str, ...] = ("printer",)
+    duration: int = 8 * 60 * 60
+    arrival_rate: float = 0.01
+    rush_hours: Tuple[Tuple[int, int, float], ...] = ()
+    request_types: Tuple[str, ...] = ("copy",)
+    archetypes: Tuple[Tuple[str, float], ...] = (("average", 1.0),)
+    patience: Tuple[int, int] = (60, 600)
+    rate: int = 10
+    policy: DispatchPolicy = DispatchPolicy.FIRST_IDLE
+
+    def rate_at(self, tick: int) -> float:
+        """Arrival rate in effect at ``tick``."""
+        rate = self.arrival_rate
+        for start, end, multiplier in self.rush_hours:
+            if start <= tick < end:
+                rate *= multiplier
+        return rate
+
+
+@dataclass
+class RunStats:
+    """Statistics collected from a single simulated day."""
+
+    seed: int
+    arrivals: int
+    jobs_completed: int
+    jobs_failed: int
+    jobs_rejected: int
+    walkouts: int
+    mean_satisfaction: float
+
+
+@dataclass
+class Estimate:
+    """Mean of a statistic across runs with its confidence interval."""
+
+    mean: float
+    stdev: float
+    low: float
+    high: float
+    n: int
+
+
+@dataclass
+class ExperimentResult:
+    """Per-run statistics and their merged estimates."""
+
+    scenario: Scenario
+    runs: List[RunStats] = field(default_factory=list)
+    summary: Dict[str, Estimate] = field(default_factory=dict)
+
+
+def derive_seed(master_seed: int, index: int) -> int:
+    """Return the seed for run ``index`` of an experiment.
+
+    String seeding of :class:`random.Random` is hashed with SHA-512, so the
+    derived seeds do not depend on the interpreter's hash randomisation.
+    """
+    return random.Random(f"{master_seed}/{index}").getrandbits(64)
+
+
+def build_simulation(scenario: Scenario, seed: int) -> Tuple[Simulation, int]:
+    """Create a fully isolated simulation of ``scenario``.
+
+    Returns the simulation and the number of scheduled arrivals.
+    """
+    rng = random.Random(seed)
+    game = Game(
+        queue=DeadlineQueueManager(),
+        dispatcher=Dispatcher(scenario.policy, rate=scenario.rate),
+        sound=NullSoundManager(),
+        tutorial_mode=TutorialMode.OFF,
+    )
+    for type_name in scenario.machines:
+        game.spawn_machine(MACHINE_TYPES[type_name]()).unlock()
+
+    sim = Simulation(game, rate=scenario.rate)
+    peak = max(
+        [scenario.arrival_rate]
+        + [scenario.rate_at(start) for start, _, _ in scenario.rush_hours]
+    )
+    names = [name for name, _ in scenario.archetypes]
+    weights = [weight for _, weight in scenario.archetypes]
+    low, high = scenario.patience
+    arrivals = 0
+    time = 0.0
+    while peak > 0:
+        # thinning of a Poisson process with the peak rate
+        time += rng.expovariate(peak)
+        tick = int(time)
+        if tick >= scenario.duration:
+            break
+        if rng.random() * peak > scenario.rate_at(tick):
+            continue
+        archetype = ARCHETYPES[rng.choices(names, weights)[0]]
+        request_type = rng.choice(scenario.request_types)
+        sim.add_arrival(tick, archetype(request_type, rng.randint(low, high)))
+        arrivals += 1
+    return sim, arrivals
+
+
+def run_scenario(scenario: Scenario, seed: int) -> RunStats:
+    """Simulate one day of ``scenario`` and collect its statistics.
+
+    Served customers go through :func:`workflow.run_workflow`; the mean
+    satisfaction is taken over every customer who arrived.  Runs are silent:
+    the game plays through a :class:`audio.NullSoundManager`, so nothing is
+    recorded on the shared :data:`audio.sound_manager`.
+    """
+    sim, arrivals = build_simulation(scenario, seed)
+    report = sim.run(until=scenario.duration)
+    station = Station()
+    for customer in report.served:
+        run_workflow(customer, station)
+    satisfaction = sum(customer.satisfaction for customer in report.served)
+    return RunStats(
+        seed=seed,
+        arrivals=arrivals,
+        jobs_completed=len(report.completed),
+        jobs_failed=len(report.failed),
+        jobs_rejected=len(report.rejected),
+        walkouts=len(report.walkouts),
+        mean_satisfaction=satisfaction / arrivals if arrivals else 0.0,
+    )
+
+
+def _run_indexed(args: Tuple[Scenario, int, int]) -> RunStats:
+    scenario, master_seed, index = args
+    return run_scenario(scenario, derive_seed(master_seed, index))
+
+
+def summarise(values: Sequence[float], confidence: float = 0.95) -> Estimate:
+    """Normal-approximation confidence interval for the mean of ``values``."""
+    n = len(values)
+    if n == 0:
+        return Estimate(math.nan, math.nan, math.nan, math.nan, 0)
+    mean = fmean(values)
+    spread = stdev(values) if n > 1 else 0.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    half = z * spread / math.sqrt(n)
+    return Estimate(mean, spread, mean - half, mean + half, n)
+
+
+STATISTICS = (
+    "jobs_completed",
+    "jobs_failed",
+    "jobs_rejected",
+    "walkouts",
+    "mean_satisfaction",
+)
+
+
+def run_experiment(
+    scenario: Scenario,
+    runs: int,
+    master_seed: int = 0,
+    workers: Optional[int] = None,
+    confidence: float = 0.95,
+    chunksize: Optional[int] = None,
+) -> ExperimentResult:
+    """Simulate ``runs`` seeded days of ``scenario`` in parallel.
+
+    ``workers=1`` runs everything in the calling process; otherwise a
+    :class:`~concurrent.futures.ProcessPoolExecutor` with ``workers``
+    processes (default: CPU count) is used.  Results are returned in run order.
+    """
+    jobs = [(scenario, master_seed, index) for index in range(runs)]
+    if workers == 1:
+        stats = [_run_indexed(job) for job in jobs]
+    else:
+        workers = workers or os.cpu_count() or 1
+        size = chunksize or max(1, runs // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            stats = list(pool.map(_run_indexed, jobs, chunksize=size))
+    result = ExperimentResult(scenario, stats)
+    for name in STATISTICS:
+        values = [float(getattr(run, name)) for run in stats]
+        result.summary[name] = summarise(values, confidence)
+    return result
@@ -0,0 +1,187 @@
+"""Append-only command journal and deterministic replay.
+
+A :class:`Journal` attached to :attr:`main.Game.journal` writes one JSON
+object per line: a header naming the queue type and tutorial mode, then one
+record per :meth:`~main.Game.execute` call with the command and the events
+it produced::
+
+    {"journal": 1, "queue": "QueueManager", "tutorial": "guided"}
+    {"seq": 0, "command": ["spawn", "printer"], "events": [{"event": "spawned", ...}]}
+    {"seq": 5000, "checkpoint": "3f2a..."}
+
+Every ``checkpoint_every`` commands, and when the journal is closed, a
+checkpoint records a digest of the full game state (the SHA-256 of its
+:func:`snapshot.save` output).  :func:`replay` streams a journal back through
+a fresh :class:`~main.Game`, compares the events of every command and every
+checkpoint digest, and writes event descriptions through a buffer.  The
+game is deterministic, so a faithful replay reproduces the recorded session
+exactly.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import time
+from dataclasses import dataclass, field
+from typing import IO, Iterable, List, Optional, Sequence
+
+import snapshot
+from audio import NullSoundManager
+from customers.queue import DeadlineQueueManager, IndexedQueueManager, QueueManager
+from main import Event, Game, describe
+from tutorial import TutorialMode
+
+JOURNAL_VERSION = 1
+QUEUE_TYPES = {
+    cls.__name__: cls for cls in (QueueManager, DeadlineQueueManager, IndexedQueueManager)
+}
+
+
+def state_digest(game: Game) -> str:
+    """Hex digest identifying the complete state of ``game``."""
+    return hashlib.sha256(snapshot.save(game)).hexdigest()
+
+
+class Journal:
+    """Write commands and their events to an append-only JSONL stream.
+
+    Records are flushed every ``flush_every`` commands; the default of one
+    keeps an interactive session safe against crashes.
+    """
+
+    def __init__(
+        self,
+        stream: IO[str],
+        game: Game,
+        checkpoint_every: int = 1000,
+        flush_every: int = 1,
+    ) -> None:
+        self.stream = stream
+        self.checkpoint_every = checkpoint_every
+        self.flush_every = flush_every
+        self.seq = 0
+        self._write({
+            "journal": JOURNAL_VERSION,
+            "queue": type(game.queue).__name__,
+            "tutorial": game.tutorial_mode.value,
+        })
+        self.stream.flush()
+
+    @classmethod
+    def open(cls, path: str, game: Game, **options: int) -> "Journal":
+        """Start a journal at ``path``, appending if the file exists."""
+        return cls(open(path, "a", encoding="utf-8"), game, **options)
+
+    def _write(self, record: dict) -> None:
+        self.stream.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def record(self, game: Game, command: Sequence[str], events: List[Event]) -> None:
+        """Append ``command`` and the ``events`` it produced."""
+        self._write({"seq": self.seq, "command": list(command), "events": events})
+        self.seq += 1
+        if self.checkpoint_every and self.seq % self.checkpoint_every == 0:
+            self.checkpoint(game)
+        if self.seq % self.flush_every == 0:
+            self.stream.flush()
+
+    def checkpoint(self, game: Game) -> None:
+        """Record the digest of the current game state."""
+        self._write({"seq": self.seq, "checkpoint": state_digest(game)})
+
+    def close(self, game: Game) -> None:
+        """Write a final checkpoint and close the stream."""
+        self.checkpoint(game)
+        self.stream.close()
+
+
+@dataclass
+class ReplayResult:
+    """Outcome of :func:`replay`.
+
+    ``mismatches`` describes every command whose events differed from the
+    journal and every checkpoint whose digest did not match.
+    """
+
+    game: Game
+    commands: int = 0
+    checkpoints: int = 0
+    mismatches: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches
+
+    def summary(self) -> str:
+        rate = self.commands / self.seconds if self.seconds else float("inf")
+        status = "OK" if self.ok else f"{len(self.mismatches)} mismatch(es)"
+        return (
+            f"replayed {self.commands} commands, {self.checkpoints} checkpoints "
+            f"in {self.seconds:.3f}s ({rate:,.0f} commands/s): {status}"
+        )
+
+
+def _new_game(header: dict) -> Game:
+    # replays are headless: sounds would only grow the shared history.  The
+    # tutorial mode is kept since the tutorial unlocks machines.
+    return Game(
+        queue=QUEUE_TYPES[header["queue"]](),
+        sound=NullSoundManager(),
+        tutorial_mode=TutorialMode(header.get("tutorial", TutorialMode.GUIDED.value)),
+    )
+
+
+def replay(
+    lines: Iterable[str],
+    output: Optional[IO[str]] = None,
+    verify: bool = True,
+    buffer_size: int = 1 << 16,
+) -> ReplayResult:
+    """Run the commands of a journal through a new :class:`Game`.
+
+    ``lines`` is any iterable of journal lines, typically an open file, and
+    is consumed lazily.  Each header starts a new game, so sessions appended
+    to one file replay one after another.  Event descriptions go to
+    ``output`` in chunks of about ``buffer_size`` characters.  With ``verify``
+    the recorded events and checkpoints are compared against the replay.
+    """
+    start = time.perf_counter()
+    records = (json.loads(line) for line in lines if line.strip())
+    header = next(records, None)
+    if header is None or header.get("journal") != JOURNAL_VERSION:
+        raise ValueError("not a print shop journal")
+    result = ReplayResult(_new_game(header))
+    game = result.game
+    buffer = io.StringIO()
+    for record in records:
+        if "journal" in record:
+            # a later session appended to the same file starts from scratch
+            game = result.game = _new_game(record)
+            continue
+        if "checkpoint" in record:
+            result.checkpoints += 1
+            if verify and state_digest(game) != record["checkpoint"]:
+                result.mismatches.append(f"state differs at checkpoint {record['seq']}")
+            continue
+        events = game.execute(record["command"])
+        result.commands += 1
+        if verify and events != record["events"]:
+            result.mismatches.append(
+                f"command {record['seq']} {record['command']}: "
+                f"recorded {record['events']}, replayed {events}"
+            )
+        if output is not None:
+            for event in events:
+                buffer.write(describe(event))
+                buffer.write("\n")
+            if buffer.tell() >= buffer_size:
+                output.write(buffer.getvalue())
+                buffer.seek(0)
+                buffer.truncate()
+    if output is not None:
+        output.write(buffer.getvalue())
+        output.flush()
+    result.seconds = time.perf_counter() - start
+    return result
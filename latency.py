@@ -0,0 +1,339 @@
+"""Streaming wait and service time percentiles.
+
+A :class:`LatencyTracker` passed as :attr:`main.Game.latency` measures, for
+every customer, three intervals (see :class:`Interval`):
+
+* ``wait``: from joining the queue until a machine starts their job;
+* ``service``: from the job starting until the machine completes it;
+* ``total``: from joining the queue until the job completes.
+
+Samples are folded into a :class:`QuantileSketch` per interval, request type
+and customer archetype as they happen and then dropped.  The tracker only
+remembers the customers currently waiting or being served, so memory does not
+grow with the length of a run.  :meth:`LatencyTracker.summary` gives
+p50/p95/p99 for any grouping, and :meth:`LatencyTracker.check` compares them
+against a list of :class:`SLO` targets.
+
+Times come from the tracker's ``clock``, seconds of
+:func:`time.perf_counter` by default.  :class:`~simulation.Simulation` sets
+it to the simulation clock, so simulated runs report ticks.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from customers.customer import Customer
+
+# (interval, request type, archetype)
+Key = Tuple["Interval", str, str]
+
+
+class Interval(Enum):
+    """The spans of a customer's visit that are measured."""
+
+    WAIT = "wait"
+    SERVICE = "service"
+    TOTAL = "total"
+
+
+class QuantileSketch:
+    """Constant-memory quantile estimate with bounded relative error.
+
+    Values are counted in logarithmic buckets whose bounds grow by
+    ``(1 + relative_accuracy) / (1 - relative_accuracy)``, so any quantile is
+    reported within ``relative_accuracy`` of a value that was actually
+    recorded (the DDSketch scheme).  At most ``max_buckets`` buckets are kept.
+    Beyond that the lowest buckets are folded together, which only loses
+    accuracy for the smallest values.  Values at or below ``min_value``
+    (including zero) share one bucket and are reported as zero.  Sketches with
+    the same accuracy can be merged.
+    """
+
+    __slots__ = ("relative_accuracy", "max_buckets", "min_value", "_log_gamma",
+                 "_gamma", "buckets", "zeros", "count", "total", "min", "max")
+
+    def __init__(
+        self,
+        relative_accuracy: float = 0.01,
+        max_buckets: int = 2048,
+        min_value: float = 1e-9,
+    ) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.min_value = min_value
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        """Record one sample."""
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value <= self.min_value:
+            self.zeros += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        buckets = self.buckets
+        buckets[index] = buckets.get(index, 0) + 1
+        if len(buckets) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self) -> None:
+        lowest, second = sorted(self.buckets)[:2]
+        self.buckets[second] += self.buckets.pop(lowest)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Add the samples of ``other``, which must have the same accuracy."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("cannot merge sketches of different accuracy")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        while len(self.buckets) > self.max_buckets:
+            self._collapse()
+        self.zeros += other.zeros
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Estimated value below which a fraction ``q`` of the samples fall."""
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return max(self.min, 0.0)
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                value = 2 * self._gamma ** index / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def __len__(self) -> int:
+        return self.count
+
+
+@dataclass(frozen=True)
+class SLO:
+    """A target such as "95% of copy customers wait at most 30 ticks".
+
+    ``request_type`` and ``archetype`` narrow the target to one group; left
+    as ``None`` it covers every customer.
+    """
+
+    interval: Interval
+    quantile: float
+    threshold: float
+    request_type: Optional[str] = None
+    archetype: Optional[str] = None
+
+    def describe(self) -> str:
+        scope = "/".join(part for part in (self.request_type, self.archetype) if part) or "all"
+        return f"{scope} {self.interval.value} p{self.quantile * 100:g} <= {self.threshold:g}"
+
+
+@dataclass
+class SLOResult:
+    """Outcome of one :class:`SLO`; ``observed`` is ``None`` without samples."""
+
+    slo: SLO
+    observed: Optional[float]
+    samples: int
+
+    @property
+    def met(self) -> bool:
+        return self.observed is None or self.observed <= self.slo.threshold
+
+
+@dataclass
+class SLOReport:
+    """Results of :meth:`LatencyTracker.check`."""
+
+    results: List[SLOResult]
+
+    @property
+    def met(self) -> bool:
+        return all(result.met for result in self.results)
+
+    @property
+    def violations(self) -> List[SLOResult]:
+        return [result for result in self.results if not result.met]
+
+    def format(self) -> str:
+        """One line per target, e.g. ``ok    all wait p95 <= 30  (12.1, n=420)``."""
+        lines = []
+        for result in self.results:
+            status = "ok" if result.met else "MISS"
+            observed = "-" if result.observed is None else f"{result.observed:.4g}"
+            lines.append(
+                f"{status:<5} {result.slo.describe()}  ({observed}, n={result.samples})"
+            )
+        return "\n".join(lines)
+
+
+def archetype_name(customer: Customer) -> str:
+    """Name of ``customer``'s archetype as used in arrival logs (``"elderly"``)."""
+    from customers.arrivals import ARCHETYPE_NAMES
+
+    cls = type(customer)
+    for name, archetype in ARCHETYPE_NAMES.items():
+        if archetype is cls:
+            return name
+    return cls.__name__
+
+
+class LatencyTracker:
+    """Per-customer wait, service and total times folded into sketches.
+
+    :class:`~main.Game` reports queue arrivals, job starts and completions,
+    walk-outs and rejected jobs through the ``arrived``/``started``/
+    ``finished``/``left`` methods; see :meth:`main.Game.track_latency`.
+    Walk-outs and failed jobs are counted per request type and archetype
+    but produce no samples.
+    """
+
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.perf_counter,
+        relative_accuracy: float = 0.01,
+    ) -> None:
+        self.clock = clock
+        self.relative_accuracy = relative_accuracy
+        self.sketches: Dict[Key, QuantileSketch] = {}
+        self.walkouts: Dict[Tuple[str, str], int] = {}
+        self.failures: Dict[Tuple[str, str], int] = {}
+        # id(customer) -> (arrival time, request type, archetype)
+        self._waiting: Dict[int, Tuple[float, str, str]] = {}
+        # id(machine) -> (arrival time, start time, request type, archetype)
+        self._serving: Dict[int, Tuple[float, float, str, str]] = {}
+        self._names: Dict[type, str] = {}
+
+    # --- recording -------------------------------------------------------
+    def _record(self, interval: Interval, request_type: str, archetype: str, value: float) -> None:
+        key = (interval, request_type, archetype)
+        sketch = self.sketches.get(key)
+        if sketch is None:
+            sketch = self.sketches[key] = QuantileSketch(self.relative_accuracy)
+        sketch.add(value)
+
+    def arrived(self, customer: Customer) -> None:
+        """``customer`` joined the queue."""
+        cls = type(customer)
+        name = self._names.get(cls)
+        if name is None:
+            name = self._names[cls] = archetype_name(customer)
+        self._waiting[id(customer)] = (self.clock(), customer.request_type, name)
+
+    def started(self, customer: Customer, machine: object) -> None:
+        """``machine`` started the job of ``customer``, who left the queue."""
+        waiting = self._waiting.pop(id(customer), None)
+        if waiting is None:
+            return
+        arrival, request_type, archetype = waiting
+        now = self.clock()
+        self._record(Interval.WAIT, request_type, archetype, now - arrival)
+        self._serving[id(machine)] = (arrival, now, request_type, archetype)
+
+    def finished(self, machine: object, failed: bool = False) -> None:
+        """``machine`` completed (or, with ``failed``, aborted) its job."""
+        serving = self._serving.pop(id(machine), None)
+        if serving is None:
+            return
+        arrival, start, request_type, archetype = serving
+        if failed:
+            group = (request_type, archetype)
+            self.failures[group] = self.failures.get(group, 0) + 1
+            return
+        now = self.clock()
+        self._record(Interval.SERVICE, request_type, archetype, now - start)
+        self._record(Interval.TOTAL, request_type, archetype, now - arrival)
+
+    def left(self, customer: Customer, walked_out: bool = True) -> None:
+        """``customer`` left the queue without being served."""
+        waiting = self._waiting.pop(id(customer), None)
+        if waiting is not None and walked_out:
+            group = waiting[1:]
+            self.walkouts[group] = self.walkouts.get(group, 0) + 1
+
+    # --- reporting -------------------------------------------------------
+    def sketch(
+        self,
+        interval: Interval,
+        request_type: Optional[str] = None,
+        archetype: Optional[str] = None,
+    ) -> QuantileSketch:
+        """Merged sketch of ``interval`` for the matching groups."""
+        merged = QuantileSketch(self.relative_accuracy)
+        for (kind, rtype, arch), sketch in self.sketches.items():
+            if kind is interval and request_type in (None, rtype) and archetype in (None, arch):
+                merged.merge(sketch)
+        return merged
+
+    def summary(self, by: Iterable[str] = ()) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Count, mean, max and p50/p95/p99 per group and interval.
+
+        ``by`` names the fields to group on (``"request_type"`` and/or
+        ``"archetype"``); groups are labelled like ``"copy/elderly"`` and
+        ``"all"`` when nothing is grouped.
+        """
+        fields = tuple(by)
+        unknown = set(fields) - {"request_type", "archetype"}
+        if unknown:
+            raise ValueError(f"cannot group by {', '.join(sorted(unknown))}")
+        groups: Dict[str, Dict[Interval, QuantileSketch]] = {}
+        for (interval, request_type, archetype), sketch in self.sketches.items():
+            values = {"request_type": request_type, "archetype": archetype}
+            label = "/".join(values[name] for name in fields) or "all"
+            per_interval = groups.setdefault(label, {})
+            merged = per_interval.get(interval)
+            if merged is None:
+                merged = per_interval[interval] = QuantileSketch(self.relative_accuracy)
+            merged.merge(sketch)
+        return {
+            label: {
+                interval.value: self._describe(sketch)
+                for interval, sketch in sorted(per_interval.items(), key=lambda i: i[0].value)
+            }
+            for label, per_interval in sorted(groups.items())
+        }
+
+    def _describe(self, sketch: QuantileSketch) -> Dict[str, float]:
+        result = {"count": float(sketch.count), "mean": sketch.mean, "max": sketch.max}
+        for q in self.QUANTILES:
+            result[f"p{q * 100:g}"] = sketch.quantile(q)
+        return result
+
+    def check(self, slos: Iterable[SLO]) -> SLOReport:
+        """Compare the recorded quantiles against ``slos``."""
+        results = []
+        for slo in slos:
+            sketch = self.sketch(slo.interval, slo.request_type, slo.archetype)
+            observed = sketch.quantile(slo.quantile) if sketch.count else None
+            results.append(SLOResult(slo, observed, sketch.count))
+        return SLOReport(results)
@@ -1,18 +1,53 @@
-"""Machine modules for the print shop simulation."""
+"""Machine modules for the print shop simulation.
+
+The base class and cues are imported eagerly; the concrete machines are
+loaded on first access so importing the package stays cheap for code that
+only needs a few of them.
+"""
+
+from importlib import import_module
+from typing import Any, List
 
 from .base import Machine, MachineError
-from .printer import Printer
-from .binder import Binder
-from .cutter import Cutter
-from .laminator import Laminator
-from .folder import Folder
+from .cues import Cue, CueBus, CueChannel, CueKind, cue_bus
+
+# public name -> submodule defining it, imported on first attribute access
+_LAZY = {
+    "Printer": ".printer",
+    "Binder": ".binder",
+    "Cutter": ".cutter",
+    "CutJob": ".cutter",
+    "plan_batches": ".cutter",
+    "Laminator": ".laminator",
+    "Folder": ".folder",
+}
 
 __all__ = [
     "Machine",
     "MachineError",
+    "Cue",
+    "CueBus",
+    "CueChannel",
+    "CueKind",
+    "cue_bus",
     "Printer",
     "Binder",
     "Cutter",
+    "CutJob",
+    "plan_batches",
     "Laminator",
     "Folder",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value  # later lookups skip this hook
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,26 +1,49 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import TYPE_CHECKING, Any, Callable, List, Optional
+
+from . import cues as _cues
+from .cues import Cue, CueChannel, CueKind
+
+if TYPE_CHECKING:  # pragma: no cover
+    from audio import SoundManager
 
 
 class MachineError(Exception):
     """Raised when a machine encounters an error."""
 
 
-@dataclass
+@dataclass(slots=True)
 class Machine:
     """Base class for print shop machines.
 
     Provides hooks for starting a job, tracking progress and completing a job.
-    Concrete machines should trigger cues on completion or error.
+    Concrete machines should trigger cues on completion or error.  Cues are
+    published on :data:`machines.cues.cue_bus`; ``cues`` holds the ones
+    emitted since the current job started.
+
+    ``on_job_change`` is called with the machine and whether a job is now
+    running whenever a job starts or ends; :class:`~main.Game` uses it to
+    track which machines are busy.
+
+    Machines that make sounds play them on ``sound``, falling back to the
+    shared :data:`audio.sound_manager`; :class:`~main.Game` sets it to its own
+    manager when it has one.
+
+    Machines use ``__slots__``; subclasses list their extra attributes in
+    ``__slots__`` as well so instances stay free of a ``__dict__``.
     """
 
     name: str
     progress_value: int = 0
     job: Optional[str] = None
-    cues: List[str] = field(default_factory=list)
+    cues: List[Cue] = field(default_factory=list)
     locked: bool = False
+    on_job_change: Optional[Callable[["Machine", bool], None]] = field(
+        default=None, repr=False, compare=False
+    )
+    sound: Optional["SoundManager"] = field(default=None, repr=False, compare=False)
 
     def lock(self) -> None:
         """Prevent the machine from being used."""
@@ -30,6 +53,14 @@ class Machine:
         """Allow the machine to be used."""
         self.locked = False
 
+    def can_start(self) -> bool:
+        """Whether :meth:`start_job` would accept a new job right now."""
+        return self.job is None and not self.locked
+
+    def accepts(self, request_type: str) -> bool:
+        """Whether customers with ``request_type`` can be served here."""
+        return True
+
     def start_job(self, job: str) -> None:
         """Begin processing a new job."""
         if self.locked:
@@ -37,8 +68,9 @@ class Machine:
         self.job = job
         self.progress_value = 0
         self.cues.clear()
-        self.trigger_cue("visual: start")
-        self.trigger_cue("audio: start")
+        self.trigger_cue(CueKind.START)
+        if self.on_job_change is not None:
+            self.on_job_change(self, True)
 
     def progress(self, amount: int) -> None:
         """Advance the job by ``amount`` percent."""
@@ -46,23 +78,43 @@ class Machine:
             raise MachineError("No active job")
         self.progress_value = min(100, self.progress_value + amount)
 
+    def ticks_remaining(self, rate: int) -> int:
+        """Return how many ``progress(rate)`` calls end the current job.
+
+        The job ends either by reaching 100 percent or by faulting; at least one
+        call is always needed.
+        """
+        if self.job is None:
+            raise MachineError("No active job")
+        return max(1, -(-(100 - self.progress_value) // rate))
+
+    def expected_ticks(self, rate: int) -> int:
+        """Return how many ``progress(rate)`` calls a new job is expected to take."""
+        return max(1, -(-100 // rate))
+
     def complete(self) -> str:
         """Mark the current job as complete and emit cues."""
         if self.job is None:
             raise MachineError("No active job")
-        self.trigger_cue("visual: complete")
-        self.trigger_cue("audio: complete")
+        self.trigger_cue(CueKind.COMPLETE)
         job = self.job
         self.job = None
+        if self.on_job_change is not None:
+            self.on_job_change(self, False)
         return job
 
     def error(self, reason: str) -> None:
         """Abort the current job and emit error cues."""
-        self.trigger_cue(f"visual: error {reason}")
-        self.trigger_cue(f"audio: error {reason}")
+        self.trigger_cue(CueKind.ERROR, reason)
         self.job = None
+        if self.on_job_change is not None:
+            self.on_job_change(self, False)
         raise MachineError(reason)
 
-    def trigger_cue(self, cue: str) -> None:
-        """Record a visual or audio cue."""
-        self.cues.append(cue)
+    def trigger_cue(self, kind: CueKind, payload: Any = None) -> None:
+        """Emit a visual and an audio cue of ``kind``."""
+        bus = _cues.cue_bus
+        for channel in CueChannel:
+            cue = Cue(self, kind, channel, payload)
+            self.cues.append(cue)
+            bus.publish(cue)
@@ -6,6 +6,8 @@ from .base import Machine, MachineError
 class Binder(Machine):
     """Binding machine where players input the correct spine measurement."""
 
+    __slots__ = ("target_width", "tolerance", "_success")
+
     def __init__(self, target_width: float = 1.0, tolerance: float = 0.05) -> None:
         super().__init__(name="Binder", locked=True)
         self.target_width = target_width
@@ -23,6 +25,15 @@ class Binder(Machine):
         self._success = abs(measurement - self.target_width) <= self.tolerance
         self.progress_value = 100
 
+    def ticks_remaining(self, rate: int) -> int:  # type: ignore[override]
+        """A single measurement finishes the binding."""
+        if self.job is None:
+            raise MachineError("No active job")
+        return 1
+
+    def expected_ticks(self, rate: int) -> int:  # type: ignore[override]
+        return 1
+
     def complete(self) -> str:  # type: ignore[override]
         if self.job is None:
             raise MachineError("No active job")
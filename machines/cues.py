@@ -0,0 +1,124 @@
+"""Typed machine cues and the bus they are published on.
+
+Machines report what they are doing as :class:`Cue` events on
+:data:`cue_bus`.  Audio, HUD and analytics code subscribe to the bus, optionally
+filtered by machine and cue kind, instead of polling machines or parsing cue
+strings::
+
+    cue_bus.subscribe(show_error, kind=CueKind.ERROR)
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle with machines.base
+    from .base import Machine
+
+
+class CueKind(Enum):
+    START = "start"
+    COMPLETE = "complete"
+    ERROR = "error"
+
+
+class CueChannel(Enum):
+    VISUAL = "visual"
+    AUDIO = "audio"
+
+
+class Cue:
+    """A single machine event.
+
+    ``payload`` carries kind specific data, the failure reason for
+    :attr:`CueKind.ERROR` cues and ``None`` otherwise.
+    """
+
+    __slots__ = ("machine", "kind", "channel", "payload")
+
+    def __init__(
+        self,
+        machine: "Machine",
+        kind: CueKind,
+        channel: CueChannel,
+        payload: Any = None,
+    ) -> None:
+        self.machine = machine
+        self.kind = kind
+        self.channel = channel
+        self.payload = payload
+
+    def __repr__(self) -> str:
+        return (
+            f"Cue({self.machine.name!r}, {self.kind.name}, "
+            f"{self.channel.name}, {self.payload!r})"
+        )
+
+    def __str__(self) -> str:
+        text = f"{self.channel.value}: {self.kind.value}"
+        return text if self.payload is None else f"{text} {self.payload}"
+
+
+Subscriber = Callable[[Cue], None]
+# (id of the machine or None, kind or None): machines are unhashable dataclasses
+_Key = Tuple[Optional[int], Optional[CueKind]]
+
+
+class CueBus:
+    """Publish/subscribe hub for machine cues.
+
+    Subscribers are indexed by their ``(machine, kind)`` filter so publishing
+    looks up at most four buckets instead of testing every subscriber.  The
+    last ``history`` cues are kept for late observers; with ``history=0`` and
+    no subscribers :meth:`publish` returns immediately.
+    """
+
+    def __init__(self, history: int = 256) -> None:
+        self.history: Deque[Cue] = deque(maxlen=history)
+        self._subscribers: Dict[_Key, List[Subscriber]] = {}
+        self._count = 0
+
+    def subscribe(
+        self,
+        callback: Subscriber,
+        machine: Optional["Machine"] = None,
+        kind: Optional[CueKind] = None,
+    ) -> Callable[[], None]:
+        """Call ``callback`` for matching cues; returns an unsubscribe function."""
+        key: _Key = (None if machine is None else id(machine), kind)
+        self._subscribers.setdefault(key, []).append(callback)
+        self._count += 1
+
+        def unsubscribe() -> None:
+            callbacks = self._subscribers.get(key)
+            if callbacks and callback in callbacks:
+                callbacks.remove(callback)
+                self._count -= 1
+                if not callbacks:
+                    del self._subscribers[key]
+
+        return unsubscribe
+
+    def publish(self, cue: Cue) -> None:
+        if self.history.maxlen:
+            self.history.append(cue)
+        if not self._count:
+            return
+        subscribers = self._subscribers
+        machine = id(cue.machine)
+        for key in ((None, None), (machine, None), (None, cue.kind), (machine, cue.kind)):
+            callbacks = subscribers.get(key)
+            if callbacks:
+                for callback in tuple(callbacks):
+                    callback(cue)
+
+    def clear(self) -> None:
+        """Drop all subscribers and the recorded history."""
+        self._subscribers.clear()
+        self._count = 0
+        self.history.clear()
+
+
+cue_bus = CueBus()
@@ -6,6 +6,8 @@ from .base import Machine, MachineError
 class Folder(Machine):
     """Folding machine that may jam at a specified progress level."""
 
+    __slots__ = ("jam_at",)
+
     def __init__(self, jam_at: int | None = None) -> None:
         super().__init__(name="Folder", locked=True)
         self.jam_at = jam_at
@@ -15,3 +17,10 @@ class Folder(Machine):
         if self.jam_at is not None and self.progress_value >= self.jam_at:
             self.error("fold jam")
 
+    def ticks_remaining(self, rate: int) -> int:  # type: ignore[override]
+        """Account for a jam that would interrupt the job early."""
+        ticks = super().ticks_remaining(rate)
+        if self.jam_at is not None and self.jam_at <= 100:
+            ticks = min(ticks, max(1, -(-(self.jam_at - self.progress_value) // rate)))
+        return ticks
+
@@ -6,10 +6,15 @@ from .base import Machine, MachineError
 class Laminator(Machine):
     """Simple laminator that can run out of film."""
 
+    __slots__ = ("film_available",)
+
     def __init__(self, film_available: bool = True) -> None:
         super().__init__(name="Laminator", locked=True)
         self.film_available = film_available
 
+    def can_start(self) -> bool:  # type: ignore[override]
+        return self.film_available and super().can_start()
+
     def start_job(self, job: str) -> None:  # type: ignore[override]
         if not self.film_available:
             self.error("out of film")
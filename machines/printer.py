@@ -7,11 +7,16 @@ from audio import SoundEvent, sound_manager
 class Printer(Machine):
     """Simulates a printer with potential jams or paper shortages."""
 
+    __slots__ = ("paper_available", "jam_at")
+
     def __init__(self, paper_available: bool = True, jam_at: int | None = None) -> None:
         super().__init__(name="Printer")
         self.paper_available = paper_available
         self.jam_at = jam_at
 
+    def can_start(self) -> bool:  # type: ignore[override]
+        return self.paper_available and super().can_start()
+
     def start_job(self, job: str) -> None:  # type: ignore[override]
         if not self.paper_available:
             self.error("out of paper")
@@ -22,8 +27,15 @@ class Printer(Machine):
         if self.jam_at is not None and self.progress_value >= self.jam_at:
             self.error("paper jam")
 
+    def ticks_remaining(self, rate: int) -> int:  # type: ignore[override]
+        """Account for a jam that would interrupt the job early."""
+        ticks = super().ticks_remaining(rate)
+        if self.jam_at is not None and self.jam_at <= 100:
+            ticks = min(ticks, max(1, -(-(self.jam_at - self.progress_value) // rate)))
+        return ticks
+
     def complete(self) -> str:  # type: ignore[override]
         """Complete the print job and trigger an alert sound."""
         job = super().complete()
-        sound_manager.play(SoundEvent.ALERT, caption="printer job complete")
+        (self.sound or sound_manager).play(SoundEvent.ALERT, caption="printer job complete")
         return job
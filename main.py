@@ -7,13 +7,62 @@ machines and tutorial systems.  When run as a script it provides a tiny
 interactive shell so the module can be exercised from the command line.
 """
 
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+import argparse
+import sys
+from dataclasses import dataclass, field
+from functools import partial, wraps
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
 
+from audio import SoundManager
 from customers.customer import Customer
 from customers.queue import QueueManager
-from machines import Binder, Machine, Printer
-from tutorial import Tutorial, default_tutorial
+from dispatch import Assignment, Dispatcher
+from machines import Binder, CueKind, Machine, MachineError, Printer
+from tutorial import Tutorial, TutorialMode, default_tutorial
+
+if TYPE_CHECKING:  # pragma: no cover - journal imports this module
+    from journal import Journal
+    from latency import LatencyTracker
+    from metrics import Metrics
+
+Event = Dict[str, Any]
+
+# machines the ``spawn`` command can create
+SPAWNABLE: Dict[str, Callable[[], Machine]] = {"printer": Printer, "binder": Binder}
+
+
+def _binder_progress(machine: Binder, amount: int) -> None:
+    # binder expects a spine width measurement; use its target width
+    machine.progress(machine.target_width)
+
+
+# machine type -> how Game.progress_jobs advances it; others use progress(amount)
+PROGRESS_HANDLERS: Dict[type, Callable[..., None]] = {Binder: _binder_progress}
+
+
+def progress_handler(machine: Machine) -> Callable[[int], None]:
+    """Return the callable :meth:`Game.progress_jobs` uses to advance ``machine``."""
+    for cls in type(machine).__mro__:
+        handler = PROGRESS_HANDLERS.get(cls)
+        if handler is not None:
+            return partial(handler, machine)
+    return machine.progress
+
+
+def _job_failed(machine: Machine) -> bool:
+    """Whether the job ``machine`` just ended was aborted by an error."""
+    return bool(machine.cues) and machine.cues[-1].kind is CueKind.ERROR
 
 
 @dataclass
@@ -23,39 +72,224 @@ class Game:
     The game tracks a queue of customers, a collection of spawned machines and
     the active tutorial sequence.  Machines can be spawned dynamically and when
     both a printer and binder exist the default tutorial is started
-    automatically.
+    automatically, unless :attr:`tutorial_mode` skips it or turns it off;
+    headless runs use :attr:`TutorialMode.OFF` so no tutorial is created or
+    notified.  Job starts, completions and failures are reported to an
+    active tutorial (see :meth:`tutorial.Tutorial.notify`).
+
+    Several machines of one type form a pool: the first is keyed by its
+    lower-cased name (``"printer"``) and later ones are numbered
+    (``"printer-2"``).  :meth:`dispatch` hands waiting customers to idle
+    machines using :attr:`dispatcher`.
+
+    Spawned machines report job starts and ends back to the game, which keeps
+    the running ones in an active set so :meth:`progress_jobs` never looks at
+    idle machines.
+
+    :meth:`execute` runs one shell command and returns the events it caused;
+    when :attr:`journal` is set every command is recorded there together with
+    its events.
+
+    :attr:`sound` is the game's own sound manager; the queue and every spawned
+    machine play through it.  Headless runs pass an
+    :class:`audio.NullSoundManager`.  Without one the shared
+    :data:`audio.sound_manager` is used.
+
+    With an enabled :attr:`metrics` registry the game counts jobs and
+    walk-outs and times its hot paths (see :mod:`metrics`); without one the
+    methods run uninstrumented.  :attr:`latency` works the same way for
+    wait and service time percentiles (see :meth:`track_latency`).
     """
 
-    queue: QueueManager = QueueManager()
+    queue: QueueManager = field(default_factory=QueueManager)
     machines: Dict[str, Machine] = None  # type: ignore[assignment]
     tutorial: Optional[Tutorial] = None
+    dispatcher: Dispatcher = field(default_factory=Dispatcher)
+    journal: Optional["Journal"] = None
+    sound: Optional[SoundManager] = None
+    metrics: Optional["Metrics"] = None
+    latency: Optional["LatencyTracker"] = None
+    tutorial_mode: TutorialMode = TutorialMode.GUIDED
 
     def __post_init__(self) -> None:
+        if self.sound is not None:
+            self.queue.sound = self.sound
         self.machines = {}
+        self.pools: Dict[str, List[str]] = {}
+        # id(machine) -> (spawn index, progress handler); machines are unhashable
+        self._handlers: Dict[int, Tuple[int, Callable[[int], None]]] = {}
+        # spawn index -> (machine, progress handler) for machines with a job
+        self._active: Dict[int, Tuple[Machine, Callable[[int], None]]] = {}
+        self.walkouts = 0
+        self._on_job_change: Callable[[Machine, bool], None] = self._job_changed
+        if self.metrics is not None and self.metrics.enabled:
+            self._instrument(self.metrics)
+        if self.latency is not None:
+            self.track_latency(self.latency)
+
+    def _instrument(self, metrics: "Metrics") -> None:
+        """Wrap the hot paths of this game with timers and counters."""
+        self.progress_jobs = metrics.timed("game_progress_jobs", self.progress_jobs)  # type: ignore[method-assign]
+        self.assign_next_customer = metrics.timed(  # type: ignore[method-assign]
+            "game_assign_next_customer", self.assign_next_customer
+        )
+        self.dispatch = metrics.timed("game_dispatch", self.dispatch)  # type: ignore[method-assign]
+        self.queue.tick = metrics.timed("queue_tick", self.queue.tick)  # type: ignore[method-assign]
+        metrics.counter("walkouts_total", read=lambda: self.walkouts)
+        metrics.gauge("queue_length", lambda: len(self.queue))
+        metrics.gauge("active_machines", lambda: len(self._active))
+
+        def count_job(machine: Machine, running: bool) -> None:
+            self._job_changed(machine, running)
+            if running:
+                outcome = "started"
+            elif _job_failed(machine):
+                outcome = "failed"
+            else:
+                outcome = "completed"
+            metrics.inc(f"jobs_{outcome}_total", machine=machine.name.lower())
+
+        self._on_job_change = count_job
+
+    def track_latency(self, tracker: "LatencyTracker") -> None:
+        """Report queue and job events of this game to ``tracker``.
+
+        The queue's ``add_customer``/``restore`` and walk-out paths,
+        :meth:`dispatch` and :meth:`assign_next_customer` are wrapped on the
+        instance, and job ends are picked up from the machines.
+        """
+        self.latency = tracker
+        queue = self.queue
+        add_customer, restore = queue.add_customer, queue.restore
+
+        def add(customer: Customer) -> None:
+            tracker.arrived(customer)
+            add_customer(customer)
+
+        def restore_all(customers: Iterable[Customer]) -> None:
+            customers = list(customers)
+            for customer in customers:
+                tracker.arrived(customer)
+            restore(customers)
+
+        def walkouts(func: Callable[..., List[Customer]]) -> Callable[..., List[Customer]]:
+            @wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> List[Customer]:
+                left = func(*args, **kwargs)
+                for customer in left:
+                    tracker.left(customer)
+                return left
+
+            return wrapper
+
+        queue.add_customer = add  # type: ignore[method-assign]
+        queue.restore = restore_all  # type: ignore[method-assign]
+        queue.tick = walkouts(queue.tick)  # type: ignore[method-assign]
+        if hasattr(queue, "advance"):
+            queue.advance = walkouts(queue.advance)  # type: ignore[attr-defined]
+
+        dispatch, assign = self.dispatch, self.assign_next_customer
+
+        def tracked_dispatch() -> List[Assignment]:
+            assignments = dispatch()
+            for assignment in assignments:
+                if assignment.error is None:
+                    tracker.started(assignment.customer, assignment.machine)
+                else:
+                    tracker.left(assignment.customer, walked_out=False)
+            return assignments
+
+        def tracked_assign(machine_name: str) -> Optional[Customer]:
+            customer = assign(machine_name)
+            if customer is not None:
+                tracker.started(customer, self.machines[machine_name])
+            return customer
+
+        self.dispatch = tracked_dispatch  # type: ignore[method-assign]
+        self.assign_next_customer = tracked_assign  # type: ignore[method-assign]
+
+        on_job_change = self._on_job_change
+
+        def job_changed(machine: Machine, running: bool) -> None:
+            on_job_change(machine, running)
+            if not running:
+                tracker.finished(machine, failed=_job_failed(machine))
+
+        self._on_job_change = job_changed
+        for machine in self.machines.values():
+            machine.on_job_change = job_changed
 
     # ------------------------------------------------------------------
     # State management helpers
     def spawn_machine(self, machine: Machine) -> Machine:
         """Add a machine to the shop and start the tutorial if possible."""
-        self.machines[machine.name.lower()] = machine
-        if {"printer", "binder"} <= set(self.machines) and self.tutorial is None:
+        kind = machine.name.lower()
+        pool = self.pools.setdefault(kind, [])
+        key = kind if not pool else f"{kind}-{len(pool) + 1}"
+        pool.append(key)
+        self.machines[key] = machine
+        self._handlers[id(machine)] = (len(self._handlers), progress_handler(machine))
+        machine.on_job_change = self._on_job_change
+        if self.sound is not None:
+            machine.sound = self.sound
+        if machine.job is not None:
+            self._job_changed(machine, True)
+        if (
+            self.tutorial is None
+            and self.tutorial_mode is not TutorialMode.OFF
+            and {"printer", "binder"} <= set(self.machines)
+        ):
             self.tutorial = default_tutorial(
                 self.machines["printer"], self.machines["binder"]
             )
-            self.tutorial.start()
+            if self.tutorial_mode is TutorialMode.SKIP:
+                self.tutorial.fast_forward()
+            else:
+                self.tutorial.start()
         return machine
 
-    def add_customer(self, request_type: str, patience: int) -> Customer:
-        """Create and enqueue a new :class:`Customer`."""
-        customer = Customer(request_type, patience)
+    def _job_changed(self, machine: Machine, running: bool) -> None:
+        index, handler = self._handlers[id(machine)]
+        if running:
+            self._active[index] = (machine, handler)
+        else:
+            self._active.pop(index, None)
+        tutorial = self.tutorial
+        if tutorial is not None and tutorial.active:
+            if running:
+                event = "job_started"
+            elif _job_failed(machine):
+                event = "job_failed"
+            else:
+                event = "job_completed"
+            tutorial.notify(event, machine.name.lower())
+
+    def active_machines(self) -> List[Machine]:
+        """Machines currently running a job, in spawn order."""
+        return [self._active[index][0] for index in sorted(self._active)]
+
+    def add_customer(
+        self, request_type: str, patience: int, archetype: Type[Customer] = Customer
+    ) -> Customer:
+        """Create and enqueue a new customer of class ``archetype``."""
+        customer = archetype(request_type, patience)
         self.queue.add_customer(customer)
         return customer
 
+    def pool(self, kind: str) -> List[Machine]:
+        """Machines of type ``kind`` (e.g. ``"printer"``) in spawn order."""
+        return [self.machines[key] for key in self.pools.get(kind, ())]
+
+    def dispatch(self) -> List[Assignment]:
+        """Start jobs for waiting customers on idle compatible machines."""
+        return self.dispatcher.dispatch(self.queue, self.machines)
+
     def assign_next_customer(self, machine_name: str) -> Optional[Customer]:
         """Assign the next customer in queue to ``machine_name``.
 
         The customer's ``request_type`` is used as the job identifier for the
-        machine.  ``None`` is returned if the queue is empty.
+        machine.  ``None`` is returned if the queue is empty.  Use
+        :meth:`dispatch` to pick machines automatically.
         """
         machine = self.machines[machine_name]
         customer = self.queue.pop_next()
@@ -66,71 +300,207 @@ class Game:
     def progress_jobs(self, amount: int) -> List[str]:
         """Advance all active machine jobs by ``amount`` percent.
 
+        Only machines in the active set are visited, in spawn order.
         Completed job identifiers are returned.  The queue patience is ticked to
         simulate time passing.
         """
         completed: List[str] = []
-        for machine in self.machines.values():
-            if machine.job is None:
-                continue
-            if isinstance(machine, Binder):
-                # binder expects a spine width measurement; use its target width
-                machine.progress(machine.target_width)
-            else:
-                machine.progress(amount)
+        active = self._active
+        for index in sorted(active):
+            machine, handler = active[index]
+            handler(amount)
             if machine.progress_value >= 100:
                 completed.append(machine.complete())
         # customers waiting lose a little patience as time progresses
-        self.queue.tick()
+        self.walkouts += len(self.queue.tick())
         return completed
 
+    # ------------------------------------------------------------------
+    # Commands
+    def execute(self, command: Sequence[str]) -> List[Event]:
+        """Run a shell command such as ``["add", "copy", "5"]``.
+
+        Returns the resulting events as JSON-serialisable dicts.  Invalid
+        commands and machine faults are reported as events instead of raised,
+        so a command stream can always be replayed.
+        """
+        events = self._execute(command)
+        if self.journal is not None:
+            self.journal.record(self, command, events)
+        return events
+
+    def _execute(self, command: Sequence[str]) -> List[Event]:
+        cmd = command[0].lower() if command else ""
+        try:
+            if cmd == "spawn" and len(command) >= 2:
+                factory = SPAWNABLE.get(command[1].lower())
+                if factory is None:
+                    return [{"event": "unknown_machine", "name": command[1]}]
+                key = self._key_of(self.spawn_machine(factory()))
+                return [{"event": "spawned", "machine": key}]
+            if cmd == "add" and len(command) >= 3:
+                archetype: Type[Customer] = Customer
+                if len(command) >= 4:
+                    from customers.arrivals import ARCHETYPE_NAMES
+
+                    archetype = ARCHETYPE_NAMES.get(command[3].lower())  # type: ignore[assignment]
+                    if archetype is None:
+                        return [{"event": "bad_argument", "command": list(command)}]
+                self.add_customer(command[1], int(command[2]), archetype)
+                return [{"event": "customer_added", "request_type": command[1]}]
+            if cmd == "process" and len(command) == 1:
+                events = [
+                    {"event": "job_started", "machine": a.key, "job": a.customer.request_type}
+                    if a.error is None
+                    else {"event": "job_refused", "machine": a.key, "reason": a.error}
+                    for a in self.dispatch()
+                ]
+                return events or [{"event": "nothing_to_process"}]
+            if cmd == "process" and len(command) >= 2:
+                name = command[1].lower()
+                if name not in self.machines:
+                    return [{"event": "unknown_machine", "name": name}]
+                customer = self.assign_next_customer(name)
+                if customer is None:
+                    return [{"event": "queue_empty"}]
+                return [{"event": "job_started", "machine": name, "job": customer.request_type}]
+            if cmd == "progress" and len(command) >= 2:
+                walkouts = self.walkouts
+                events = [
+                    {"event": "job_completed", "job": job}
+                    for job in self.progress_jobs(int(command[1]))
+                ]
+                if self.walkouts > walkouts:
+                    events.append({"event": "walkouts", "count": self.walkouts - walkouts})
+                return events
+        except MachineError as exc:
+            return [{"event": "machine_error", "reason": str(exc)}]
+        except ValueError:
+            return [{"event": "bad_argument", "command": list(command)}]
+        return [{"event": "unknown_command", "command": list(command)}]
+
+    def _key_of(self, machine: Machine) -> str:
+        return self.pools[machine.name.lower()][-1]
+
 
 # ----------------------------------------------------------------------
 # Command line interface
 
-def main() -> None:  # pragma: no cover - exercised via CLI example
-    game = Game()
-    print("Print Shop interactive shell. Commands: spawn <printer|binder>, add <type> <patience>, process <machine>, progress <amount>, quit")
-    while True:
+
+def describe(event: Event) -> str:
+    """Human readable form of an event returned by :meth:`Game.execute`."""
+    kind = event["event"]
+    if kind == "spawned":
+        return f"Spawned {event['machine']}"
+    if kind == "unknown_machine":
+        return "Unknown machine"
+    if kind == "customer_added":
+        return "Customer added"
+    if kind == "job_started":
+        return f"Started {event['job']} on {event['machine']}"
+    if kind == "job_refused":
+        return f"{event['machine']} refused job: {event['reason']}"
+    if kind == "nothing_to_process":
+        return "No customers or idle machines"
+    if kind == "queue_empty":
+        return "No customers in queue"
+    if kind == "job_completed":
+        return f"Completed {event['job']}"
+    if kind == "walkouts":
+        return f"{event['count']} customer(s) walked out"
+    if kind == "machine_error":
+        return f"Machine error: {event['reason']}"
+    if kind == "bad_argument":
+        return "Invalid argument"
+    return "Unknown command"
+
+
+def main(argv: Optional[List[str]] = None) -> int:  # pragma: no cover - exercised via CLI example
+    from journal import Journal, replay
+    from metrics import Metrics
+
+    parser = argparse.ArgumentParser(description="Print shop interactive shell")
+    parser.add_argument("--journal", help="append every command and its events to this JSONL file")
+    parser.add_argument("--replay", help="run the commands of a journal and verify the events")
+    parser.add_argument("--quiet", action="store_true", help="do not print replayed events")
+    parser.add_argument(
+        "--metrics",
+        help="write game loop metrics to this file on exit (JSON for .json, else Prometheus text)",
+    )
+    parser.add_argument(
+        "--realtime", action="store_true",
+        help="keep the shop running: tick at a fixed rate while reading commands",
+    )
+    parser.add_argument("--tick-rate", type=float, default=10.0, help="ticks per second (realtime)")
+    parser.add_argument("--amount", type=int, default=10, help="progress per tick (realtime)")
+    parser.add_argument("--listen", type=int, metavar="PORT",
+                        help="also accept commands on this localhost TCP port (realtime)")
+    parser.add_argument("--arrivals", help="feed customers from this arrival log (realtime)")
+    parser.add_argument("--auto-dispatch", action="store_true",
+                        help="hand waiting customers to idle machines every tick (realtime)")
+    parser.add_argument(
+        "--tutorial", choices=[mode.value for mode in TutorialMode], default="guided",
+        help="guided tutorial, skip it (machines unlocked) or turn it off",
+    )
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        with open(args.replay, encoding="utf-8") as source:
+            result = replay(source, output=None if args.quiet else sys.stdout)
+        print(result.summary(), file=sys.stderr)
+        return 0 if result.ok else 1
+
+    game = Game(
+        metrics=Metrics() if args.metrics else None,
+        tutorial_mode=TutorialMode(args.tutorial),
+    )
+    if args.journal:
+        game.journal = Journal.open(args.journal, game)
+    if args.realtime:
         try:
-            parts = input("> ").split()
-        except EOFError:
-            print()
-            break
-        if not parts:
-            continue
-        cmd = parts[0].lower()
-        if cmd == "spawn" and len(parts) >= 2:
-            typ = parts[1].lower()
-            if typ == "printer":
-                game.spawn_machine(Printer())
-                print("Spawned printer")
-            elif typ == "binder":
-                game.spawn_machine(Binder())
-                print("Spawned binder")
-            else:
-                print("Unknown machine")
-        elif cmd == "add" and len(parts) >= 3:
-            req = parts[1]
-            patience = int(parts[2])
-            game.add_customer(req, patience)
-            print("Customer added")
-        elif cmd == "process" and len(parts) >= 2:
-            machine_name = parts[1].lower()
-            cust = game.assign_next_customer(machine_name)
-            if cust:
-                print(f"Started {cust.request_type} on {machine_name}")
-            else:
-                print("No customers in queue")
-        elif cmd == "progress" and len(parts) >= 2:
-            amount = int(parts[1])
-            for job in game.progress_jobs(amount):
-                print(f"Completed {job}")
-        elif cmd in {"quit", "exit"}:
-            break
-        else:
-            print("Unknown command")
+            _run_realtime(game, args)
+        finally:
+            if game.journal is not None:
+                game.journal.close(game)
+            if game.metrics is not None:
+                game.metrics.write(args.metrics)
+        return 0
+    print("Print Shop interactive shell. Commands: spawn <printer|binder>, add <type> <patience> [archetype], process [machine], progress <amount>, quit")
+    try:
+        while True:
+            try:
+                parts = input("> ").split()
+            except EOFError:
+                print()
+                break
+            if not parts:
+                continue
+            if parts[0].lower() in {"quit", "exit"}:
+                break
+            for event in game.execute(parts):
+                print(describe(event))
+    finally:
+        if game.journal is not None:
+            game.journal.close(game)
+        if game.metrics is not None:
+            game.metrics.write(args.metrics)
+    return 0
+
+
+def _run_realtime(game: Game, args: argparse.Namespace) -> None:  # pragma: no cover - CLI
+    import asyncio
+
+    from customers.arrivals import read_arrivals
+    from runtime import Runtime, aiter_arrivals
+
+    runtime = Runtime(game, args.tick_rate, args.amount, args.auto_dispatch)
+    arrivals = [aiter_arrivals(read_arrivals(args.arrivals))] if args.arrivals else []
+    print("Print Shop running in real time; type commands, quit to stop")
+    try:
+        asyncio.run(runtime.run(arrivals, stdin=True, port=args.listen))
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == "__main__":  # pragma: no cover - CLI entry point
-    main()
+    sys.exit(main())
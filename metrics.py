@@ -0,0 +1,226 @@
+"""Counters, gauges and timers for the game loop.
+
+A :class:`Metrics` registry passed as :attr:`main.Game.metrics` instruments
+that game when it is created:
+
+* counters ``jobs_started_total``, ``jobs_completed_total`` and
+  ``jobs_failed_total`` labelled by machine type, and ``walkouts_total``;
+* gauges ``queue_length`` and ``active_machines``, read when exported;
+* timers around :meth:`~main.Game.progress_jobs`,
+  :meth:`~main.Game.assign_next_customer`, :meth:`~main.Game.dispatch` and
+  the queue's ``tick``.
+
+Instrumentation works by wrapping those methods on the instance, so a game
+without a registry, or with a disabled :class:`NullMetrics`, runs the plain
+methods and pays nothing.  :meth:`Metrics.write` exports to a local file as
+JSON or in the Prometheus text format, replacing the file atomically so a
+scraper never reads a partial export.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+import tempfile
+import time
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class MetricsFormat(Enum):
+    """File formats understood by :meth:`Metrics.write`."""
+
+    JSON = "json"
+    PROMETHEUS = "prometheus"
+
+    @classmethod
+    def for_path(cls, path: str) -> "MetricsFormat":
+        """JSON for ``.json`` files, the Prometheus text format otherwise."""
+        return cls.JSON if path.endswith(".json") else cls.PROMETHEUS
+
+
+class Counter:
+    """Monotonic count; read from ``read`` at export time when one is given."""
+
+    __slots__ = ("value", "read")
+
+    def __init__(self, read: Optional[Callable[[], float]] = None) -> None:
+        self.value = 0
+        self.read = read
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+    def get(self) -> float:
+        return self.read() if self.read is not None else self.value
+
+
+class Timer:
+    """Call count, total and longest duration of a timed code path."""
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+def _key(name: str, labels: Dict[str, str]) -> Tuple[str, Labels]:
+    return name, tuple(sorted(labels.items()))
+
+
+def _series(name: str, labels: Labels) -> str:
+    if not labels:
+        return name
+    body = ",".join(f'{key}="{value}"' for key, value in labels)
+    return f"{name}{{{body}}}"
+
+
+class Metrics:
+    """Registry of counters, gauges and timers.
+
+    Metric names are exported with ``prefix`` and an underscore in front;
+    ``clock`` is the time source of the timers.
+    """
+
+    enabled = True
+
+    def __init__(
+        self, prefix: str = "printshop", clock: Callable[[], float] = time.perf_counter
+    ) -> None:
+        self.prefix = prefix
+        self.clock = clock
+        self.counters: Dict[Tuple[str, Labels], Counter] = {}
+        self.gauges: Dict[Tuple[str, Labels], Callable[[], float]] = {}
+        self.timers: Dict[str, Timer] = {}
+
+    # --- registration ----------------------------------------------------
+    def counter(
+        self, name: str, read: Optional[Callable[[], float]] = None, **labels: str
+    ) -> Counter:
+        """Return the counter ``name`` with ``labels``, creating it if needed."""
+        key = _key(name, labels)
+        counter = self.counters.get(key)
+        if counter is None:
+            counter = self.counters[key] = Counter(read)
+        return counter
+
+    def inc(self, name: str, amount: int = 1, **labels: str) -> None:
+        """Add ``amount`` to the counter ``name`` with ``labels``."""
+        self.counter(name, **labels).inc(amount)
+
+    def gauge(self, name: str, read: Callable[[], float], **labels: str) -> None:
+        """Register a gauge whose value is ``read()`` at export time."""
+        self.gauges[_key(name, labels)] = read
+
+    def timer(self, name: str) -> Timer:
+        """Return the timer ``name``, creating it if needed."""
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = Timer()
+        return timer
+
+    def timed(self, name: str, func: F) -> F:
+        """Wrap ``func`` so every call is recorded on the timer ``name``."""
+        timer = self.timer(name)
+        clock = self.clock
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timer.record(clock() - start)
+
+        return wrapper  # type: ignore[return-value]
+
+    # --- export ----------------------------------------------------------
+    def snapshot(self) -> Dict[str, Any]:
+        """Current values as a JSON-serialisable dict."""
+
+        def flat(key: Tuple[str, Labels]) -> str:
+            return _series(key[0], key[1])
+
+        return {
+            "counters": {flat(key): c.get() for key, c in self.counters.items()},
+            "gauges": {flat(key): read() for key, read in self.gauges.items()},
+            "timers": {
+                name: {"count": t.count, "total": t.total, "max": t.max, "mean": t.mean}
+                for name, t in self.timers.items()
+            },
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        typed = set()
+
+        def emit(kind: str, name: str, labels: Labels, value: float) -> None:
+            full = self._full(name)
+            if full not in typed:
+                typed.add(full)
+                lines.append(f"# TYPE {full} {kind}")
+            lines.append(f"{_series(full, labels)} {value}")
+
+        for (name, labels), counter in sorted(self.counters.items()):
+            emit("counter", name, labels, counter.get())
+        for (name, labels), read in sorted(self.gauges.items()):
+            emit("gauge", name, labels, read())
+        for name, timer in sorted(self.timers.items()):
+            full = self._full(f"{name}_seconds")
+            lines.append(f"# TYPE {full} summary")
+            lines.append(f"{full}_sum {timer.total}")
+            lines.append(f"{full}_count {timer.count}")
+            emit("gauge", f"{name}_seconds_max", (), timer.max)
+        return "\n".join(lines) + "\n"
+
+    def _full(self, name: str) -> str:
+        return f"{self.prefix}_{name}" if self.prefix else name
+
+    def write(self, path: str, fmt: Optional[MetricsFormat] = None) -> None:
+        """Export to ``path``; the format defaults to :meth:`MetricsFormat.for_path`."""
+        fmt = fmt or MetricsFormat.for_path(path)
+        text = self.to_json() if fmt is MetricsFormat.JSON else self.to_prometheus()
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp = tempfile.mkstemp(dir=directory, prefix=".metrics-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as target:
+                target.write(text)
+            os.replace(temp, path)
+        except BaseException:
+            os.unlink(temp)
+            raise
+
+
+class NullMetrics(Metrics):
+    """Disabled registry: nothing is instrumented and every call is a no-op."""
+
+    enabled = False
+
+    def inc(self, name: str, amount: int = 1, **labels: str) -> None:
+        pass
+
+    def gauge(self, name: str, read: Callable[[], float], **labels: str) -> None:
+        pass
+
+    def timed(self, name: str, func: F) -> F:
+        return func
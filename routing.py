@@ -0,0 +1,391 @@
+"""Multi-step orders routed across machine types.
+
+A :class:`Route` is a DAG over machine kinds (the pool names of
+:class:`~main.Game`, such as ``"printer"`` or ``"cutter"``): every step lists
+the steps that must finish before it may start, so an order can fan out to
+several machines and join again::
+
+    booklet = Route.chain("booklet", "printer", "cutter", "laminator", "binder")
+    cards = Route("cards", {
+        "printer": (),
+        "cutter": ("printer",),
+        "laminator": ("printer",),
+        "binder": ("cutter", "laminator"),
+    })
+
+A :class:`Router` runs orders tick by tick on the machines of a game.  Every
+machine kind has a WIP buffer of steps that are ready to run.  Idle machines
+take steps from their kind's buffer in FIFO order, and when a machine's
+``complete()`` returns, the steps that become ready are handed off to their
+buffers.  With a buffer ``capacity`` a finished step that finds a successor's
+buffer full stays with its machine, which is *blocked* and takes no new
+work until the hand-off goes through.
+
+:class:`RoutingReport` gives throughput, lead times, per-kind utilization and
+WIP, and the bottleneck: the kind with the most work reaching it relative to
+what its machines can do.  :func:`rank_additions` re-runs a scenario with one
+extra machine of each candidate kind to show which one buys the most
+throughput.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from audio import NullSoundManager
+from machines import Cutter, Machine, MachineError
+from main import Game, progress_handler
+from tutorial import TutorialMode
+
+
+class Route:
+    """Steps over machine kinds with their prerequisites.
+
+    ``steps`` maps each machine kind to the kinds that must finish first.
+    A route visits every kind at most once.  :attr:`order` is a topological
+    order of the steps and ``ValueError`` is raised for unknown prerequisites
+    or cycles.
+    """
+
+    def __init__(self, name: str, steps: Mapping[str, Sequence[str]]) -> None:
+        if not steps:
+            raise ValueError("a route needs at least one step")
+        self.name = name
+        self.requires: Dict[str, Tuple[str, ...]] = {
+            step: tuple(before) for step, before in steps.items()
+        }
+        self.successors: Dict[str, List[str]] = {step: [] for step in self.requires}
+        for step, before in self.requires.items():
+            for prerequisite in before:
+                if prerequisite not in self.requires:
+                    raise ValueError(f"{name}: {step} requires unknown step {prerequisite}")
+                self.successors[prerequisite].append(step)
+        self.roots = [step for step, before in self.requires.items() if not before]
+        self.order = self._topological_order()
+
+    @classmethod
+    def chain(cls, name: str, *kinds: str) -> "Route":
+        """A route visiting ``kinds`` one after another."""
+        return cls(name, {kind: kinds[index - 1:index] for index, kind in enumerate(kinds)})
+
+    def _topological_order(self) -> List[str]:
+        missing = {step: len(before) for step, before in self.requires.items()}
+        ready = list(self.roots)
+        order: List[str] = []
+        while ready:
+            step = ready.pop(0)
+            order.append(step)
+            for successor in self.successors[step]:
+                missing[successor] -= 1
+                if not missing[successor]:
+                    ready.append(successor)
+        if len(order) != len(self.requires):
+            raise ValueError(f"{self.name}: steps form a cycle")
+        return order
+
+    def __repr__(self) -> str:
+        return f"Route({self.name!r}, {self.requires!r})"
+
+
+@dataclass(eq=False)
+class Order:
+    """One order travelling along ``route``."""
+
+    label: str
+    route: Route
+    released: int
+    done: set = field(default_factory=set)
+    finished: Optional[int] = None
+
+    def job(self, step: str) -> str:
+        """Job identifier the machine running ``step`` is given."""
+        return f"{self.label}:{step}"
+
+
+@dataclass
+class KindStats:
+    """Per machine kind counters collected by :class:`Router`.
+
+    ``arrived`` counts steps that became ready for the kind and ``steps``
+    the ones it finished.  ``busy`` and ``blocked`` are machine-ticks;
+    ``wip_total`` sums the buffer depth over all ticks, so
+    ``wip_total / ticks`` is the mean WIP.
+    """
+
+    machines: int = 0
+    arrived: int = 0
+    busy: int = 0
+    blocked: int = 0
+    steps: int = 0
+    wip_total: int = 0
+    wip_max: int = 0
+
+
+@dataclass
+class RoutingReport:
+    """Outcome of :meth:`Router.run`.
+
+    ``completed`` and ``failed`` hold the orders; failed orders are paired
+    with the step and reason that stopped them.
+    """
+
+    ticks: int
+    completed: List[Order]
+    failed: List[Tuple[Order, str, str]]
+    kinds: Dict[str, KindStats]
+
+    @property
+    def throughput(self) -> float:
+        """Orders finished per tick."""
+        return len(self.completed) / self.ticks if self.ticks else 0.0
+
+    @property
+    def mean_lead_time(self) -> float:
+        """Mean ticks from release to the last step finishing."""
+        if not self.completed:
+            return 0.0
+        return sum(o.finished - o.released for o in self.completed) / len(self.completed)  # type: ignore[operator]
+
+    def utilization(self, kind: str) -> float:
+        """Share of machine-ticks the ``kind`` machines spent running a step."""
+        stats = self.kinds[kind]
+        capacity = stats.machines * self.ticks
+        return stats.busy / capacity if capacity else 0.0
+
+    def mean_wip(self, kind: str) -> float:
+        return self.kinds[kind].wip_total / self.ticks if self.ticks else 0.0
+
+    def load(self, kind: str) -> float:
+        """Work that reached ``kind`` over the work its machines could do.
+
+        Above 1 the kind cannot keep up and WIP piles up in front of it.
+        Unlike utilization this tells a saturated constraint from a machine
+        that is merely kept busy by the arrival rate.
+        """
+        stats = self.kinds[kind]
+        if not stats.steps:
+            return self.utilization(kind)
+        capacity = stats.machines * self.ticks
+        return stats.arrived * stats.busy / stats.steps / capacity if capacity else 0.0
+
+    @property
+    def bottleneck(self) -> Optional[str]:
+        """Kind with the highest :meth:`load`; a longer buffer breaks ties."""
+        if not self.kinds:
+            return None
+        return max(self.kinds, key=lambda kind: (self.load(kind), self.mean_wip(kind)))
+
+
+def _start_cutter(machine: Cutter, order: Order, step: str) -> None:
+    # one cut per order; orders of a route share a cut type
+    machine.start_job(order.job(step), order.route.name, 1)
+
+
+# machine type -> how the router starts a step; others use start_job(job)
+STARTERS: Dict[type, Callable[..., None]] = {Cutter: _start_cutter}
+
+
+def _starter(machine: Machine) -> Callable[[Order, str], None]:
+    for cls in type(machine).__mro__:
+        starter = STARTERS.get(cls)
+        if starter is not None:
+            return lambda order, step: starter(machine, order, step)
+    return lambda order, step: machine.start_job(order.job(step))
+
+
+class Router:
+    """Run routed orders on the machines of ``game``.
+
+    Parameters
+    ----------
+    game:
+        Game holding the machines; a silent one is created when omitted.
+        Machines must be unlocked to take work.
+    rate:
+        Progress every busy machine makes per tick, as in
+        :meth:`Game.progress_jobs`.
+    rates:
+        Per-kind overrides of ``rate``, to model slower or faster steps.
+    capacity:
+        Maximum number of steps waiting in each kind's buffer; ``None`` for
+        unbounded buffers.
+    """
+
+    def __init__(
+        self,
+        game: Optional[Game] = None,
+        rate: int = 10,
+        rates: Optional[Mapping[str, int]] = None,
+        capacity: Optional[int] = None,
+    ) -> None:
+        self.game = game or Game(sound=NullSoundManager(), tutorial_mode=TutorialMode.OFF)
+        self.rate = rate
+        self.rates = dict(rates or {})
+        self.capacity = capacity
+        self.now = 0
+        self.buffers: Dict[str, Deque[Tuple[Order, str]]] = {}
+        self.stats: Dict[str, KindStats] = {}
+        self.completed: List[Order] = []
+        self.failed: List[Tuple[Order, str, str]] = []
+        self._orders = 0
+        # id(machine) -> (kind, progress handler, starter)
+        self._machines: Dict[int, Tuple[str, Callable[[int], None], Callable[[Order, str], None]]] = {}
+        # id(machine) -> step it is running
+        self._running: Dict[int, Tuple[Order, str]] = {}
+        # id(machine) -> finished steps waiting for room downstream
+        self._blocked: Dict[int, List[Tuple[Order, str]]] = {}
+        for machine in self.game.machines.values():
+            self._register(machine)
+
+    # ------------------------------------------------------------------
+    # Setup
+    def _register(self, machine: Machine) -> None:
+        kind = machine.name.lower()
+        self._machines[id(machine)] = (kind, progress_handler(machine), _starter(machine))
+        self.buffers.setdefault(kind, deque())
+        self.stats.setdefault(kind, KindStats()).machines += 1
+
+    def add_machine(self, machine: Machine) -> Machine:
+        """Spawn ``machine`` in the game and make it available to routes."""
+        self.game.spawn_machine(machine)
+        self._register(machine)
+        return machine
+
+    def submit(self, route: Route, label: Optional[str] = None) -> Order:
+        """Release a new order of ``route``; its first steps become ready."""
+        missing = [kind for kind in route.requires if kind not in self.buffers]
+        if missing:
+            raise ValueError(f"no machine for step(s) {', '.join(missing)} of {route.name}")
+        order = Order(label or f"{route.name}-{self._orders}", route, self.now)
+        self._orders += 1
+        for step in route.roots:
+            self.buffers[step].append((order, step))
+            self.stats[step].arrived += 1
+        return order
+
+    # ------------------------------------------------------------------
+    # Running
+    def tick(self) -> None:
+        """Start ready steps on idle machines, then advance every busy machine."""
+        self._dispatch()
+        for machine in self.game.active_machines():
+            running = self._running.get(id(machine))
+            if running is None:
+                continue  # a job the router did not start
+            kind, handler, _ = self._machines[id(machine)]
+            self.stats[kind].busy += 1
+            order, step = running
+            try:
+                handler(self.rates.get(kind, self.rate))
+                if machine.progress_value < 100:
+                    continue
+                machine.complete()
+            except MachineError as exc:
+                del self._running[id(machine)]
+                self.failed.append((order, step, str(exc)))
+                continue
+            del self._running[id(machine)]
+            self.stats[kind].steps += 1
+            self._hand_off(machine, order, step)
+        self.now += 1
+        for kind, buffer in self.buffers.items():
+            stats = self.stats[kind]
+            stats.wip_total += len(buffer)
+            stats.wip_max = max(stats.wip_max, len(buffer))
+
+    def _hand_off(self, machine: Machine, order: Order, step: str) -> None:
+        order.done.add(step)
+        route = order.route
+        if len(order.done) == len(route.requires):
+            order.finished = self.now + 1
+            self.completed.append(order)
+            return
+        blocked = self._blocked.setdefault(id(machine), [])
+        for successor in route.successors[step]:
+            if all(before in order.done for before in route.requires[successor]):
+                blocked.append((order, successor))
+        self._flush(id(machine))
+
+    def _flush(self, machine_id: int) -> None:
+        blocked = self._blocked.get(machine_id)
+        while blocked:
+            order, step = blocked[0]
+            buffer = self.buffers[step]
+            if self.capacity is not None and len(buffer) >= self.capacity:
+                return
+            buffer.append(blocked.pop(0))
+            self.stats[step].arrived += 1
+
+    def _dispatch(self) -> None:
+        for machine_id in list(self._blocked):
+            self._flush(machine_id)
+            if not self._blocked[machine_id]:
+                del self._blocked[machine_id]
+        for kind, buffer in self.buffers.items():
+            for machine in self.game.pool(kind):
+                machine_id = id(machine)
+                if machine_id in self._blocked:
+                    self.stats[kind].blocked += 1
+                    continue
+                if not buffer or machine_id in self._running or not machine.can_start():
+                    continue
+                order, step = buffer.popleft()
+                try:
+                    self._machines[machine_id][2](order, step)
+                except MachineError as exc:
+                    self.failed.append((order, step, str(exc)))
+                    continue
+                self._running[machine_id] = (order, step)
+
+    def run(self, ticks: int, orders: Iterable[Tuple[int, Route]] = ()) -> RoutingReport:
+        """Tick ``ticks`` times, releasing ``(tick, route)`` orders when due.
+
+        ``orders`` must be sorted by tick; orders due before the current tick
+        are released immediately.
+        """
+        pending = iter(orders)
+        upcoming = next(pending, None)
+        end = self.now + ticks
+        while self.now < end:
+            while upcoming is not None and upcoming[0] <= self.now:
+                self.submit(upcoming[1])
+                upcoming = next(pending, None)
+            self.tick()
+        return self.report()
+
+    def report(self) -> RoutingReport:
+        return RoutingReport(self.now, list(self.completed), list(self.failed), self.stats)
+
+
+def rank_additions(
+    build: Callable[[], Router],
+    ticks: int,
+    orders: Callable[[], Iterable[Tuple[int, Route]]],
+    candidates: Mapping[str, Callable[[], Machine]],
+) -> List[Tuple[str, float]]:
+    """Throughput with one extra machine of each candidate kind, best first.
+
+    ``build`` creates a fresh router for every trial and ``orders`` a fresh
+    order stream, so trials do not share state.
+    """
+    results = []
+    for kind, factory in candidates.items():
+        router = build()
+        machine = factory()
+        machine.unlock()
+        router.add_machine(machine)
+        results.append((kind, router.run(ticks, orders()).throughput))
+    results.sort(key=lambda result: -result[1])
+    return results
@@ -0,0 +1,244 @@
+"""Real-time asyncio runtime for the print shop.
+
+:class:`Runtime` keeps a :class:`~main.Game` running on its own: the game is
+ticked at a fixed rate, one ``progress`` command per tick, while customers
+arrive from async generators and operators type commands on stdin or send
+them over a local TCP socket.  Everything runs on one event loop thread and
+every change goes through :meth:`~main.Game.execute`, so commands and ticks
+never interleave mid-update and a journal attached to the game records the
+session for :func:`journal.replay`.
+
+Arrival times are counted in ticks from the start of the run.  An arrival
+due at tick ``t`` is added once tick ``t`` has run, before the next one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, List, Optional
+
+from customers.arrivals import Arrival
+from main import Event, Game, describe
+
+QUIT_COMMANDS = {"quit", "exit"}
+
+
+async def aiter_arrivals(arrivals: Iterable[Arrival]) -> AsyncIterator[Arrival]:
+    """Adapt a blocking iterable of arrivals (such as a log reader) to an async one.
+
+    Control returns to the event loop after every record so a long log does
+    not stall the ticks.
+    """
+    for arrival in arrivals:
+        yield arrival
+        await asyncio.sleep(0)
+
+
+class Runtime:
+    """Drive ``game`` in real time.
+
+    Parameters
+    ----------
+    game:
+        Game to run.
+    tick_rate:
+        Ticks per second.
+    amount:
+        Percentage passed to ``progress`` on every tick.
+    auto_dispatch:
+        Hand waiting customers to idle machines (the ``process`` command)
+        before every tick.
+    output:
+        Receives the description of every event caused by ticks, arrivals
+        and stdin commands; socket clients get the replies to their own
+        commands instead.
+    """
+
+    def __init__(
+        self,
+        game: Game,
+        tick_rate: float = 10.0,
+        amount: int = 10,
+        auto_dispatch: bool = False,
+        output: Callable[[str], None] = print,
+    ) -> None:
+        if tick_rate <= 0:
+            raise ValueError("tick_rate must be positive")
+        self.game = game
+        self.interval = 1.0 / tick_rate
+        self.amount = amount
+        self.auto_dispatch = auto_dispatch
+        self.output = output
+        self.ticks = 0
+        # ticks dropped because the loop fell more than one interval behind
+        self.skipped = 0
+        self.port: Optional[int] = None
+        self._ticked = asyncio.Condition()
+        self._stop = asyncio.Event()
+
+    # ------------------------------------------------------------------
+    # Game updates
+    def execute(self, command: List[str]) -> List[Event]:
+        """Run one command on the game and report its events to :attr:`output`."""
+        events = self.game.execute(command)
+        self._report(events)
+        return events
+
+    def _report(self, events: List[Event]) -> None:
+        for event in events:
+            self.output(describe(event))
+
+    async def tick(self) -> None:
+        """Advance the game by one tick and wake arrivals that are now due."""
+        if self.auto_dispatch:
+            events = self.game.execute(["process"])
+            self._report([e for e in events if e["event"] != "nothing_to_process"])
+        self.execute(["progress", str(self.amount)])
+        self.ticks += 1
+        async with self._ticked:
+            self._ticked.notify_all()
+
+    async def _tick_loop(self, until: Optional[int]) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while until is None or self.ticks < until:
+            deadline += self.interval
+            delay = deadline - loop.time()
+            if delay < -self.interval:
+                # fell behind (e.g. a slow command): resume the cadence from now
+                missed = int(-delay / self.interval)
+                self.skipped += missed
+                deadline += missed * self.interval
+                delay = deadline - loop.time()
+            await asyncio.sleep(max(0.0, delay))
+            await self.tick()
+        self.stop()
+
+    async def wait_for_tick(self, tick: int) -> None:
+        """Return once ``tick`` ticks have run."""
+        async with self._ticked:
+            await self._ticked.wait_for(lambda: self.ticks >= tick)
+
+    async def feed(self, arrivals: AsyncIterable[Arrival]) -> None:
+        """Add the customers of ``arrivals`` as their tick comes round."""
+        async for arrival in arrivals:
+            await self.wait_for_tick(arrival.time)
+            self.execute(
+                ["add", arrival.request_type, str(arrival.patience), arrival.archetype]
+            )
+
+    # ------------------------------------------------------------------
+    # Operator input
+    async def serve_commands(
+        self,
+        reader: asyncio.StreamReader,
+        reply: Callable[[str], None],
+        stop_on_quit: bool,
+    ) -> None:
+        """Execute the commands read line by line from ``reader``.
+
+        ``quit`` or end of input ends this stream, and the whole runtime
+        when ``stop_on_quit`` is set.
+        """
+        while True:
+            line = await reader.readline()
+            parts = line.decode("utf-8", "replace").split()
+            if not line or (parts and parts[0].lower() in QUIT_COMMANDS):
+                break
+            if parts:
+                for event in self.game.execute(parts):
+                    reply(describe(event))
+        if stop_on_quit:
+            self.stop()
+
+    async def _serve_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        def reply(text: str) -> None:
+            writer.write(text.encode("utf-8") + b"\n")
+
+        try:
+            await self.serve_commands(reader, reply, stop_on_quit=False)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _serve_stdin(self) -> None:
+        await self.serve_commands(await _stdin_reader(), self.output, stop_on_quit=True)
+
+    # ------------------------------------------------------------------
+    # Running
+    def stop(self) -> None:
+        """Ask :meth:`run` to return after the current step."""
+        self._stop.set()
+
+    async def run(
+        self,
+        arrivals: Iterable[AsyncIterable[Arrival]] = (),
+        stdin: bool = False,
+        port: Optional[int] = None,
+        host: str = "127.0.0.1",
+        until: Optional[int] = None,
+    ) -> None:
+        """Run until :meth:`stop` is called, stdin ends or ``until`` ticks pass.
+
+        ``arrivals`` are consumed concurrently.  With ``port`` set, commands
+        are also accepted from TCP clients on ``host``; port 0 picks a free
+        port, available as :attr:`port` once the server is listening.
+        """
+        self._stop.clear()
+        tasks = [asyncio.create_task(self._tick_loop(until))]
+        tasks += [asyncio.create_task(self.feed(source)) for source in arrivals]
+        if stdin:
+            tasks.append(asyncio.create_task(self._serve_stdin()))
+        errors: List[BaseException] = []
+
+        def check(task: "asyncio.Task[None]") -> None:
+            if not task.cancelled() and task.exception() is not None:
+                errors.append(task.exception())  # type: ignore[arg-type]
+                self.stop()
+
+        for task in tasks:
+            task.add_done_callback(check)
+        server = None
+        try:
+            if port is not None:
+                server = await asyncio.start_server(self._serve_client, host, port)
+                self.port = server.sockets[0].getsockname()[1]
+            await self._stop.wait()
+        finally:
+            if server is not None:
+                server.close()
+                await server.wait_closed()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if errors:
+            raise errors[0]
+
+
+async def _stdin_reader() -> asyncio.StreamReader:
+    """A stream reader over stdin that does not block the event loop.
+
+    Pipes and terminals are read by the loop itself; anything else (such as
+    a redirected regular file) is read by a daemon thread.
+    """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    try:
+        await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), sys.stdin
+        )
+    except (ValueError, OSError, NotImplementedError):
+
+        def pump() -> None:
+            for line in sys.stdin.buffer:
+                loop.call_soon_threadsafe(reader.feed_data, line)
+            loop.call_soon_threadsafe(reader.feed_eof)
+
+        threading.Thread(target=pump, name="stdin-reader", daemon=True).start()
+    return reader
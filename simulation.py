@@ -0,0 +1,227 @@
+"""Headless discrete-event simulation of the print shop.
+
+:class:`Simulation` drives a :class:`~main.Game` without calling
+:meth:`~main.Game.progress_jobs` once per tick.  Job completions and customer
+arrivals are kept in a heap-based event calendar and walk-outs are read from a
+:class:`~customers.queue.DeadlineQueueManager`, so the clock jumps straight
+from one event to the next.  One simulated tick corresponds to one
+``progress_jobs(rate)`` call and the engine produces the same completions as
+the tick-based loop::
+
+    for t in range(until):
+        ...add customers arriving at t...
+        ...assign waiting customers to idle machines...
+        game.progress_jobs(rate)
+"""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from audio import NullSoundManager
+from customers.arrivals import Arrival, ArrivalFeeder
+from customers.customer import Customer
+from customers.queue import DeadlineQueueManager
+from latency import LatencyTracker
+from machines import Binder, Machine, MachineError
+from main import Game
+from tutorial import TutorialMode
+
+
+class EventKind(IntEnum):
+    """Calendar event types, ordered by processing priority within a tick."""
+
+    COMPLETION = 0
+    ARRIVAL = 1
+
+
+@dataclass
+class SimulationReport:
+    """Outcome of a simulation run.
+
+    ``completed`` holds ``(time, machine, job)`` tuples.  ``failed`` (jobs
+    that faulted while running) and ``rejected`` (customers whose job could
+    not be started) hold ``(time, machine, reason, customer)`` tuples.
+    ``walkouts`` holds ``(time, customer)`` tuples and ``served`` the customers
+    whose job finished successfully.
+    """
+
+    completed: List[Tuple[int, str, str]] = field(default_factory=list)
+    failed: List[Tuple[int, str, str, Customer]] = field(default_factory=list)
+    rejected: List[Tuple[int, str, str, Customer]] = field(default_factory=list)
+    walkouts: List[Tuple[int, Customer]] = field(default_factory=list)
+    served: List[Customer] = field(default_factory=list)
+    events: int = 0
+    time: int = 0
+
+
+def advance_machine(machine: Machine, ticks: int, rate: int) -> None:
+    """Apply ``ticks`` worth of ``Game.progress_jobs(rate)`` to ``machine``."""
+    if isinstance(machine, Binder):
+        # binder expects a spine width measurement; use its target width
+        machine.progress(machine.target_width)
+    else:
+        machine.progress(ticks * rate)
+
+
+class Simulation:
+    """Event-driven engine wrapping a :class:`Game`.
+
+    Parameters
+    ----------
+    game:
+        Game to drive.  Its queue must be a
+        :class:`~customers.queue.DeadlineQueueManager` so walk-out times can be
+        predicted; a fresh silent game (see :class:`audio.NullSoundManager`)
+        with such a queue is created when omitted.
+    rate:
+        Percentage every machine advances per tick, the ``amount`` passed to
+        :meth:`Game.progress_jobs` in the equivalent tick loop.
+    latency:
+        Tracker for wait and service times (see :mod:`latency`), attached
+        to the game.  The game's tracker is switched to the simulation
+        clock, so its percentiles are in ticks.
+    """
+
+    def __init__(
+        self,
+        game: Optional[Game] = None,
+        rate: int = 10,
+        latency: Optional[LatencyTracker] = None,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.game = game or Game(
+            queue=DeadlineQueueManager(),
+            sound=NullSoundManager(),
+            tutorial_mode=TutorialMode.OFF,
+        )
+        if not isinstance(self.game.queue, DeadlineQueueManager):
+            raise TypeError("Simulation requires a DeadlineQueueManager queue")
+        if latency is not None:
+            self.game.track_latency(latency)
+        if self.game.latency is not None:
+            self.game.latency.clock = lambda: self.now
+        self.rate = rate
+        self.now = 0
+        self.report = SimulationReport()
+        self._calendar: List[Tuple[int, int, int, object]] = []
+        self._seq = 0
+        # machine key -> (customer being served, time the machine was last synced)
+        self._running: Dict[str, Tuple[Customer, int]] = {}
+        self._feeders: List[ArrivalFeeder] = []
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    def schedule(self, time: int, kind: EventKind, payload: object) -> None:
+        """Put an event on the calendar."""
+        if time < self.now:
+            raise ValueError("cannot schedule events in the past")
+        heapq.heappush(self._calendar, (time, kind, self._seq, payload))
+        self._seq += 1
+
+    def add_arrival(self, time: int, customer: Customer) -> None:
+        """Schedule ``customer`` to join the queue at ``time``."""
+        self.schedule(time, EventKind.ARRIVAL, customer)
+
+    def add_stream(self, arrivals: Iterable[Arrival]) -> ArrivalFeeder:
+        """Feed time-ordered ``arrivals`` (e.g. from a log file) into the queue.
+
+        Unlike :meth:`add_arrival` the records are not put on the calendar;
+        they are read one at a time as the clock reaches them.
+        """
+        feeder = ArrivalFeeder(arrivals, self.game.queue)
+        self._feeders.append(feeder)
+        return feeder
+
+    def next_event_time(self) -> Optional[int]:
+        """Time of the next calendar event, streamed arrival or walk-out, if any."""
+        candidates = []
+        if self._calendar:
+            candidates.append(self._calendar[0][0])
+        for feeder in self._feeders:
+            if feeder.next_time is not None:
+                candidates.append(max(self.now, feeder.next_time))
+        walkout = self.game.queue.ticks_until_walkout()
+        if walkout is not None:
+            candidates.append(self.now + walkout)
+        return min(candidates) if candidates else None
+
+    # ------------------------------------------------------------------
+    # Execution
+    def run(self, until: int) -> SimulationReport:
+        """Process every event up to and including time ``until``.
+
+        Running machines are synced to ``until`` on return so the game state
+        can be inspected; calling :meth:`run` again continues the simulation.
+        """
+        self._dispatch()
+        while True:
+            next_time = self.next_event_time()
+            if next_time is None or next_time > until:
+                break
+            self._advance_to(next_time)
+            self._process_calendar()
+            self._dispatch()
+        self._advance_to(max(self.now, until))
+        self._sync_running()
+        self.report.time = self.now
+        return self.report
+
+    def _advance_to(self, time: int) -> None:
+        if time == self.now:
+            return
+        for customer in self.game.queue.advance(time - self.now):
+            self.report.walkouts.append((time, customer))
+            self.report.events += 1
+        self.now = time
+
+    def _process_calendar(self) -> None:
+        calendar = self._calendar
+        while calendar and calendar[0][0] == self.now:
+            _, kind, _, payload = heapq.heappop(calendar)
+            self.report.events += 1
+            if kind is EventKind.COMPLETION:
+                self._complete(payload)  # type: ignore[arg-type]
+            else:
+                self.game.queue.add_customer(payload)  # type: ignore[arg-type]
+        for feeder in self._feeders:
+            self.report.events += len(feeder.feed(self.now))
+
+    def _complete(self, key: str) -> None:
+        machine = self.game.machines[key]
+        customer, synced = self._running.pop(key)
+        try:
+            advance_machine(machine, self.now - synced, self.rate)
+            job = machine.complete()
+        except MachineError as exc:
+            self.report.failed.append((self.now, key, str(exc), customer))
+        else:
+            self.report.completed.append((self.now, key, job))
+            self.report.served.append(customer)
+
+    def _dispatch(self) -> None:
+        """Hand waiting customers to idle machines with the game's dispatcher.
+
+        Machines that cannot take a job (locked, out of paper or film) are
+        skipped before a customer is taken from the queue.
+        """
+        for assignment in self.game.dispatch():
+            key, machine, customer = assignment.key, assignment.machine, assignment.customer
+            if assignment.error is not None:
+                self.report.rejected.append((self.now, key, assignment.error, customer))
+                continue
+            self._running[key] = (customer, self.now)
+            ticks = machine.ticks_remaining(self.rate)
+            self.schedule(self.now + ticks, EventKind.COMPLETION, key)
+
+    def _sync_running(self) -> None:
+        for key, (customer, synced) in self._running.items():
+            ticks = self.now - synced
+            machine = self.game.machines[key]
+            if ticks and not isinstance(machine, Binder):
+                advance_machine(machine, ticks, self.rate)
+                self._running[key] = (customer, self.now)
@@ -0,0 +1,488 @@
+"""Compact binary snapshots of a :class:`~main.Game`.
+
+A snapshot holds the queue (customer archetypes, request types, patience,
+satisfaction), every machine's job, progress and lock state including cutter
+batches and backlog, and the tutorial position.  Customers are written column
+by column as packed little-endian arrays, and strings are written once in a
+table and referred to by index, so saving and loading cost a handful of list
+comprehensions rather than pickling one object graph per customer.
+
+Layout (all integers little-endian)::
+
+    header   magic "PSNP", u16 version, u8 kind (FULL or DELTA)
+    strings  u32 count, u32 lengths[count], utf-8 blob
+    queue    u8 queue class, u32 count, then one packed array per column
+    machines u32 count, one record per machine
+    tutorial u8 present, i32 index, u8 active
+
+A :class:`Checkpointer` writes a full snapshot and then deltas against it.
+A delta lists the customers that left since the full snapshot, the current
+patience of those still waiting, the customers whose satisfaction or DIY flag
+changed, and the new arrivals (request types of waiting customers are taken to
+be fixed); machines and the tutorial are small and are always written out.
+:func:`load` needs the full snapshot a delta was taken against::
+
+    checkpoints = Checkpointer(game)
+    checkpoints.full()
+    ...
+    delta = checkpoints.delta()
+    game = load(delta, base=checkpoints.base)
+
+Dispatcher load counters, machine cues and sound history are not saved, nor
+is the ``priority`` function of an
+:class:`~customers.queue.IndexedQueueManager`: its customers come back in
+service order in a single lane.
+"""
+
+from __future__ import annotations
+
+import gc
+import math
+import struct
+import sys
+from array import array
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Type
+
+from customers.customer import Customer, DIYCustomer
+from customers.pool import ARCHETYPES
+from customers.queue import DeadlineQueueManager, IndexedQueueManager, QueueManager
+from machines import Binder, Cutter, CutJob, Folder, Laminator, Machine, Printer
+from main import Game
+
+MAGIC = b"PSNP"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHB")
+_U32 = struct.Struct("<I")
+_MACHINE = struct.Struct("<IBiiB")  # key, type code, progress, job, locked
+_TUTORIAL = struct.Struct("<BiB")
+_CUT_JOB = struct.Struct("<IIid")
+_NONE = -1
+
+QUEUE_TYPES: Tuple[Type[QueueManager], ...] = (
+    QueueManager,
+    DeadlineQueueManager,
+    IndexedQueueManager,
+)
+MACHINE_TYPES: Tuple[Type[Machine], ...] = (
+    Machine,
+    Printer,
+    Binder,
+    Cutter,
+    Laminator,
+    Folder,
+)
+_ARCHETYPE_CODES = {cls: code for code, cls in enumerate(ARCHETYPES)}
+_MACHINE_CODES = {cls: code for code, cls in enumerate(MACHINE_TYPES)}
+
+
+class SnapshotKind(IntEnum):
+    FULL = 0
+    DELTA = 1
+
+
+class SnapshotError(ValueError):
+    """Raised for data that is not a snapshot this version can read."""
+
+
+# ----------------------------------------------------------------------
+# Low-level encoding
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    # bulk (de)serialisation allocates one object per customer, which would
+    # otherwise trigger repeated full collections
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _packed(typecode: str, values: Sequence) -> bytes:
+    data = array(typecode, values)
+    if sys.byteorder != "little":  # pragma: no cover - big-endian hosts
+        data.byteswap()
+    return data.tobytes()
+
+
+class _Writer:
+    def __init__(self, strings: Optional[Dict[str, int]] = None) -> None:
+        self.parts: List[bytes] = []
+        self.strings: Dict[str, int] = dict(strings or {})
+        self._first_new = len(self.strings)
+
+    def string(self, value: Optional[str]) -> int:
+        if value is None:
+            return _NONE
+        return self.strings.setdefault(value, len(self.strings))
+
+    def u32(self, value: int) -> None:
+        self.parts.append(_U32.pack(value))
+
+    def column(self, typecode: str, values: Sequence) -> None:
+        self.parts.append(_packed(typecode, values))
+
+    def finish(self, kind: SnapshotKind) -> bytes:
+        """Prefix the header and the strings added by this writer."""
+        new = list(self.strings)[self._first_new:]
+        encoded = [text.encode("utf-8") for text in new]
+        head = [
+            _HEADER.pack(MAGIC, VERSION, kind),
+            _U32.pack(len(encoded)),
+            _packed("I", [len(text) for text in encoded]),
+            b"".join(encoded),
+        ]
+        return b"".join(head + self.parts)
+
+
+class _Reader:
+    def __init__(self, data: bytes, strings: Optional[List[str]] = None) -> None:
+        self.view = memoryview(data)
+        self.offset = 0
+        magic, version, kind = self.unpack(_HEADER)
+        if magic != MAGIC:
+            raise SnapshotError("not a print shop snapshot")
+        if version != VERSION:
+            raise SnapshotError(f"unsupported snapshot version {version}")
+        self.kind = SnapshotKind(kind)
+        self.strings: List[str] = list(strings or [])
+        count = self.u32()
+        lengths = self.column("I", count)
+        blob = self.take(sum(lengths))
+        start = 0
+        for length in lengths:
+            self.strings.append(str(blob[start:start + length], "utf-8"))
+            start += length
+
+    def take(self, size: int) -> memoryview:
+        chunk = self.view[self.offset:self.offset + size]
+        if len(chunk) != size:
+            raise SnapshotError("truncated snapshot")
+        self.offset += size
+        return chunk
+
+    def unpack(self, layout: struct.Struct) -> tuple:
+        return layout.unpack(self.take(layout.size))
+
+    def u32(self) -> int:
+        return self.unpack(_U32)[0]
+
+    def column(self, typecode: str, count: int) -> array:
+        data = array(typecode)
+        data.frombytes(self.take(count * data.itemsize))
+        if sys.byteorder != "little":  # pragma: no cover - big-endian hosts
+            data.byteswap()
+        return data
+
+    def string(self, index: int) -> Optional[str]:
+        return None if index == _NONE else self.strings[index]
+
+
+# ----------------------------------------------------------------------
+# Sections
+
+
+def _archetype_code(customer: Customer) -> int:
+    # pool views and subclasses map to their closest known archetype
+    archetype = getattr(customer, "archetype", type(customer))
+    for cls in archetype.__mro__:
+        if cls in _ARCHETYPE_CODES:
+            return _ARCHETYPE_CODES[cls]
+    raise SnapshotError(f"cannot save customer type {type(customer).__name__}")
+
+
+def _write_customers(
+    out: _Writer, customers: Sequence[Customer]
+) -> Tuple[List[int], List[bool]]:
+    """Write the customer columns; returns the satisfaction and help columns."""
+    strings = out.strings
+    codes = [_ARCHETYPE_CODES.get(type(c)) for c in customers]
+    if None in codes:
+        codes = [
+            _archetype_code(c) if code is None else code
+            for code, c in zip(codes, customers)
+        ]
+    diy = _ARCHETYPE_CODES[DIYCustomer]
+    satisfaction = [c.satisfaction for c in customers]
+    helped = [
+        code == diy and c.called_for_help  # type: ignore[attr-defined]
+        for code, c in zip(codes, customers)
+    ]
+    out.u32(len(customers))
+    out.column("B", codes)
+    out.column("I", [strings.setdefault(c.request_type, len(strings)) for c in customers])
+    out.column("i", [c.patience for c in customers])
+    out.column("i", satisfaction)
+    out.column("B", helped)
+    return satisfaction, helped
+
+
+def _read_customers(reader: _Reader) -> List[Customer]:
+    count = reader.u32()
+    archetypes = reader.column("B", count)
+    requests = reader.column("I", count)
+    patience = reader.column("i", count)
+    satisfaction = reader.column("i", count)
+    helped = reader.column("B", count)
+    strings = reader.strings
+    customers = [
+        ARCHETYPES[code](strings[request], p, s)
+        for code, request, p, s in zip(archetypes, requests, patience, satisfaction)
+    ]
+    for index in (i for i, flag in enumerate(helped) if flag):
+        customers[index].called_for_help = True  # type: ignore[attr-defined]
+    return customers
+
+
+def _optional_int(value: Optional[int]) -> int:
+    return _NONE if value is None else value
+
+
+def _write_extra(out: _Writer, machine: Machine) -> None:
+    parts = out.parts
+    if isinstance(machine, Printer):
+        parts.append(struct.pack("<?i", machine.paper_available, _optional_int(machine.jam_at)))
+    elif isinstance(machine, Folder):
+        parts.append(struct.pack("<i", _optional_int(machine.jam_at)))
+    elif isinstance(machine, Laminator):
+        parts.append(struct.pack("<?", machine.film_available))
+    elif isinstance(machine, Binder):
+        success = _NONE if machine._success is None else int(machine._success)
+        parts.append(struct.pack("<ddb", machine.target_width, machine.tolerance, success))
+    elif isinstance(machine, Cutter):
+        parts.append(struct.pack(
+            "<ddiddi",
+            machine.time_per_cut,
+            machine.setup_time,
+            machine.total_cuts,
+            machine.time_spent,
+            machine.time_required,
+            out.string(machine.current_cut_type),
+        ))
+        out.u32(len(machine.jobs))
+        out.column("I", [out.string(job) for job in machine.jobs])
+        out.u32(len(machine.pending))
+        for job in machine.pending:
+            due = math.nan if job.due is None else job.due
+            parts.append(_CUT_JOB.pack(out.string(job.job), out.string(job.cut_type), job.cuts, due))
+    else:
+        out.u32(out.string(machine.name))
+
+
+def _read_machine(reader: _Reader, code: int) -> Machine:
+    cls = MACHINE_TYPES[code]
+    if cls is Printer:
+        paper, jam_at = reader.unpack(struct.Struct("<?i"))
+        return Printer(paper, None if jam_at == _NONE else jam_at)
+    if cls is Folder:
+        (jam_at,) = reader.unpack(struct.Struct("<i"))
+        return Folder(None if jam_at == _NONE else jam_at)
+    if cls is Laminator:
+        (film,) = reader.unpack(struct.Struct("<?"))
+        return Laminator(film)
+    if cls is Binder:
+        width, tolerance, success = reader.unpack(struct.Struct("<ddb"))
+        binder = Binder(width, tolerance)
+        binder._success = None if success == _NONE else bool(success)
+        return binder
+    if cls is Cutter:
+        per_cut, setup, total, spent, required, cut_type = reader.unpack(struct.Struct("<ddiddi"))
+        cutter = Cutter(per_cut, setup)
+        cutter.total_cuts, cutter.time_spent, cutter.time_required = total, spent, required
+        cutter.current_cut_type = reader.string(cut_type)
+        cutter.jobs = [reader.strings[index] for index in reader.column("I", reader.u32())]
+        for _ in range(reader.u32()):
+            job, kind, cuts, due = reader.unpack(_CUT_JOB)
+            cutter.pending.append(CutJob(
+                reader.strings[job], reader.strings[kind], cuts, None if math.isnan(due) else due,
+            ))
+        return cutter
+    return Machine(name=reader.strings[reader.u32()])
+
+
+def _write_game(out: _Writer, game: Game) -> None:
+    out.u32(len(game.machines))
+    for key, machine in game.machines.items():
+        code = _MACHINE_CODES.get(type(machine))
+        if code is None:
+            raise SnapshotError(f"cannot save machine type {type(machine).__name__}")
+        out.parts.append(_MACHINE.pack(
+            out.string(key),
+            code,
+            machine.progress_value,
+            out.string(machine.job),
+            machine.locked,
+        ))
+        _write_extra(out, machine)
+    tutorial = game.tutorial
+    if tutorial is None:
+        out.parts.append(_TUTORIAL.pack(0, 0, 0))
+    else:
+        out.parts.append(_TUTORIAL.pack(1, tutorial.index, tutorial.active))
+
+
+def _build_game(reader: _Reader, queue_code: int, customers: List[Customer]) -> Game:
+    queue = QUEUE_TYPES[queue_code]()
+    queue.restore(customers)
+    game = Game(queue=queue)
+    locks = []
+    for _ in range(reader.u32()):
+        key, code, progress, job, locked = reader.unpack(_MACHINE)
+        machine = _read_machine(reader, code)
+        machine.progress_value = progress
+        machine.job = reader.string(job)
+        game.spawn_machine(machine)
+        if reader.strings[key] not in game.machines:
+            raise SnapshotError(f"machine {reader.strings[key]!r} restored out of order")
+        locks.append((machine, bool(locked)))
+    present, index, active = reader.unpack(_TUTORIAL)
+    if present and game.tutorial is not None:
+        game.tutorial.index, game.tutorial.active = index, bool(active)
+    # spawning may start the tutorial and unlock machines; restore saved locks
+    for machine, locked in locks:
+        machine.locked = locked
+    return game
+
+
+# ----------------------------------------------------------------------
+# Public API
+
+
+def save(game: Game) -> bytes:
+    """Return a full snapshot of ``game``."""
+    with _gc_paused():
+        return Checkpointer(game)._full(game.queue.list_customers(), track=False)
+
+
+def load(data: bytes, base: Optional[bytes] = None) -> Game:
+    """Rebuild a :class:`Game` from a full snapshot or a delta and its ``base``."""
+    with _gc_paused():
+        return _load(data, base)
+
+
+def _load(data: bytes, base: Optional[bytes]) -> Game:
+    reader = _Reader(data)
+    if reader.kind is SnapshotKind.FULL:
+        queue_code = reader.unpack(struct.Struct("<B"))[0]
+        return _build_game(reader, queue_code, _read_customers(reader))
+    if base is None:
+        raise SnapshotError("a delta snapshot needs the full snapshot it was taken against")
+    base_reader = _Reader(base)
+    if base_reader.kind is not SnapshotKind.FULL:
+        raise SnapshotError("the base of a delta must be a full snapshot")
+    base_reader.unpack(struct.Struct("<B"))
+    customers = _read_customers(base_reader)
+    # the delta's string table continues the base's
+    reader = _Reader(data, base_reader.strings)
+    queue_code = reader.unpack(struct.Struct("<B"))[0]
+    removed = reader.column("I", reader.u32())
+    for index in removed:
+        customers[index] = None  # type: ignore[call-overload]
+    survivors = [customer for customer in customers if customer is not None]
+    for customer, patience in zip(survivors, reader.column("i", len(survivors))):
+        customer.patience = patience
+    changed = reader.column("I", reader.u32())
+    satisfaction = reader.column("i", len(changed))
+    helped = reader.column("B", len(changed))
+    for index, value, flag in zip(changed, satisfaction, helped):
+        customer = survivors[index]
+        customer.satisfaction = value
+        if isinstance(customer, DIYCustomer):
+            customer.called_for_help = bool(flag)
+    survivors.extend(_read_customers(reader))
+    return _build_game(reader, queue_code, survivors)
+
+
+class Checkpointer:
+    """Write full snapshots of a game and deltas against the last one.
+
+    :attr:`base` is the last full snapshot, the one to pass to :func:`load`
+    together with a delta.  The checkpointer keeps the customers of that
+    snapshot alive to recognise them by identity.  When the queue was
+    reordered since then, which FIFO queues never do, :meth:`delta` writes a
+    full snapshot instead and makes it the new base.
+    """
+
+    def __init__(self, game: Game) -> None:
+        self.game = game
+        self.base: Optional[bytes] = None
+        self._customers: List[Customer] = []
+        self._positions: Dict[int, int] = {}
+        self._satisfaction: List[int] = []
+        self._helped: List[bool] = []
+        self._strings: Dict[str, int] = {}
+
+    def _queue_code(self) -> bytes:
+        code = QUEUE_TYPES.index(type(self.game.queue))
+        return struct.pack("<B", code)
+
+    def full(self) -> bytes:
+        """Write a full snapshot and make it the base for later deltas."""
+        with _gc_paused():
+            return self._full(self.game.queue.list_customers(), track=True)
+
+    def _full(self, customers: List[Customer], track: bool) -> bytes:
+        out = _Writer()
+        out.parts.append(self._queue_code())
+        satisfaction, helped = _write_customers(out, customers)
+        _write_game(out, self.game)
+        data = out.finish(SnapshotKind.FULL)
+        if track:
+            self.base = data
+            self._customers = customers
+            self._positions = dict(zip(map(id, customers), range(len(customers))))
+            self._satisfaction, self._helped = satisfaction, helped
+            self._strings = out.strings
+        return data
+
+    def delta(self) -> bytes:
+        """Write the changes since :attr:`base`."""
+        with _gc_paused():
+            return self._delta()
+
+    def _delta(self) -> bytes:
+        customers = self.game.queue.list_customers()
+        if self.base is None:
+            return self._full(customers, track=True)
+        positions = self._positions
+        survivors: List[Customer] = []
+        kept: List[int] = []
+        arrivals: List[Customer] = []
+        for customer in customers:
+            position = positions.get(id(customer))
+            if position is None:
+                arrivals.append(customer)
+                continue
+            if arrivals or (kept and position <= kept[-1]):
+                # an old customer behind a new one or out of order
+                return self._full(customers, track=True)
+            survivors.append(customer)
+            kept.append(position)
+        remaining = set(kept)
+        removed = [index for index in range(len(self._customers)) if index not in remaining]
+
+        out = _Writer(self._strings)
+        out.parts.append(self._queue_code())
+        out.u32(len(removed))
+        out.column("I", removed)
+        out.column("i", [customer.patience for customer in survivors])
+        satisfaction, helped = self._satisfaction, self._helped
+        changed = [
+            index
+            for index, (customer, position) in enumerate(zip(survivors, kept))
+            if customer.satisfaction != satisfaction[position]
+            or getattr(customer, "called_for_help", False) != helped[position]
+        ]
+        out.u32(len(changed))
+        out.column("I", changed)
+        out.column("i", [survivors[index].satisfaction for index in changed])
+        out.column("B", [getattr(survivors[index], "called_for_help", False) for index in changed])
+        _write_customers(out, arrivals)
+        _write_game(out, self.game)
+        return out.finish(SnapshotKind.DELTA)
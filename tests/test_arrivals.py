@@ -0,0 +1,72 @@
+import itertools
+import json
+
+import pytest
+
+from customers.arrivals import (
+    Arrival,
+    ArrivalFeeder,
+    read_arrivals,
+    read_binary,
+    write_binary,
+)
+from customers.customer import ElderlyCustomer
+from customers.queue import DeadlineQueueManager, QueueManager
+from machines import Printer
+from simulation import Simulation
+
+ARRIVALS = [
+    Arrival(0, "copy", "average", 30),
+    Arrival(0, "scan", "elderly", 10),
+    Arrival(4, "copy", "rushed", 20),
+    Arrival(9, "bind", "diy", 50),
+    Arrival(9, "copy", "customer", 5),
+]
+
+
+def test_jsonl_and_binary_logs_round_trip(tmp_path):
+    jsonl = tmp_path / "arrivals.jsonl"
+    jsonl.write_text("".join(json.dumps(a._asdict()) + "\n" for a in ARRIVALS))
+    binary = tmp_path / "arrivals.bin"
+    assert write_binary(str(binary), read_arrivals(str(jsonl))) == len(ARRIVALS)
+    assert list(read_arrivals(str(binary))) == ARRIVALS
+
+    reader = read_binary(str(binary))
+    assert next(reader) == ARRIVALS[0]
+    reader.close()  # releases the memory map mid-file
+
+
+def test_feeder_releases_customers_as_time_advances():
+    queue = QueueManager()
+    feeder = ArrivalFeeder(iter(ARRIVALS), queue)
+    assert len(feeder.feed(3)) == 2
+    assert isinstance(queue.list_customers()[1], ElderlyCustomer)
+    assert feeder.next_time == 4
+    assert len(feeder.feed(9)) == 3
+    assert feeder.next_time is None and feeder.released == 5
+
+
+def test_feeder_reads_lazily_and_rejects_unsorted_logs():
+    endless = (Arrival(t, "copy") for t in itertools.count())
+    feeder = ArrivalFeeder(endless, DeadlineQueueManager())
+    assert len(feeder.feed(99)) == 100
+    assert len(feeder.queue) == 100
+
+    feeder = ArrivalFeeder([Arrival(5, "copy"), Arrival(3, "copy")], QueueManager())
+    with pytest.raises(ValueError):
+        feeder.feed(10)
+
+
+def test_simulation_consumes_streams_like_scheduled_arrivals():
+    def run(streamed):
+        sim = Simulation(rate=25)
+        sim.game.spawn_machine(Printer())
+        if streamed:
+            sim.add_stream(iter(ARRIVALS))
+        else:
+            for arrival in ARRIVALS:
+                sim.add_arrival(arrival.time, arrival.customer())
+        report = sim.run(until=40)
+        return report.completed, [(t, c.request_type) for t, c in report.walkouts]
+
+    assert run(streamed=True) == run(streamed=False)
@@ -1,7 +1,17 @@
-from audio import SoundEvent, sound_manager
+import subprocess
+import sys
+
+from audio import (
+    AudioDispatcher,
+    NullSoundManager,
+    SoundEvent,
+    SoundManager,
+    sound_manager,
+)
 from customers.customer import Customer
 from customers.queue import QueueManager
 from machines import Printer
+from main import Game
 from ui.hud import CaptionToggle, VolumeSlider
 from types import SimpleNamespace
 from unittest.mock import MagicMock
@@ -75,3 +85,104 @@ def test_muting_channel_stops_playback(monkeypatch):
     sound_manager.mute_channel("effects", True)
     sound_manager.play(SoundEvent.BELL)
     mock_sound.play.assert_not_called()
+
+
+def _decoding_mixer(sounds):
+    def decode(path):
+        sound = MagicMock()
+        sound.get_length.return_value = 1.0
+        sounds[path] = sound
+        return sound
+
+    # 10 Hz, 8-bit mono: every decoded sound measures 10 bytes
+    return SimpleNamespace(Sound=decode, get_init=lambda: (10, 8, 1))
+
+
+def test_preloaded_sound_plays_on_first_play(monkeypatch):
+    sounds = {}
+    monkeypatch.setattr("audio.mixer", _decoding_mixer(sounds))
+    manager = SoundManager()
+    for future in manager.preloading:
+        future.result()
+    manager.play(SoundEvent.BELL)
+    manager.close()
+    sounds[str(manager._resolve_sound(SoundEvent.BELL))].play.assert_called_once()
+
+
+def test_play_decodes_in_background_and_lru_evicts(monkeypatch):
+    sounds = {}
+    monkeypatch.setattr("audio.mixer", _decoding_mixer(sounds))
+    manager = SoundManager(cache_budget=15, decode_workers=1)
+    for future in manager.preloading:
+        future.result()
+    manager.sounds.clear()
+    manager.play(SoundEvent.BELL)  # cache miss: nothing plays, decode is queued
+    assert manager.history == [SoundEvent.BELL]
+    for future in manager.preload([SoundEvent.BELL, SoundEvent.ALERT]):
+        future.result()
+    manager.close()
+
+    assert SoundEvent.ALERT in manager.sounds
+    assert SoundEvent.BELL not in manager.sounds  # evicted by the byte budget
+    assert manager.sounds.size == 10
+    manager.play(SoundEvent.ALERT)
+    sounds[str(manager._resolve_sound(SoundEvent.ALERT))].play.assert_called_once()
+    assert manager._resolve_sound(SoundEvent.ALERT) is manager._resolve_sound(SoundEvent.ALERT)
+
+
+def test_dispatcher_coalesces_bursts_and_rate_limits(monkeypatch):
+    sounds = {}
+    monkeypatch.setattr("audio.mixer", _decoding_mixer(sounds))
+    now = [0.0]
+    dispatcher = AudioDispatcher(
+        window=0.1, rate_limits={SoundEvent.BELL: 1.0}, clock=lambda: now[0]
+    )
+    manager = SoundManager(dispatcher=dispatcher)
+    for future in manager.preloading:
+        future.result()
+    manager.close()
+    manager.toggle_captions(True)
+    for _ in range(200):
+        manager.play(SoundEvent.BELL, caption="customer entered")
+    assert len(manager.history) == 200  # history and captions stay per call
+    assert len(manager.captions) == 200
+    bell = sounds[str(manager._resolve_sound(SoundEvent.BELL))]
+    assert not bell.play.called  # nothing touches the mixer before the frame ends
+
+    assert manager.drain() == 1
+    assert bell.play.call_count == 1
+    assert dispatcher.coalesced == 199
+
+    now[0] = 0.5
+    manager.play(SoundEvent.BELL)
+    assert manager.drain() == 0  # rate limited: deferred, not dropped
+    now[0] = 1.2
+    assert manager.drain() == 1
+    assert bell.play.call_count == 2
+
+
+def test_game_plays_through_its_own_sound_manager():
+    sound_manager.history.clear()
+    manager = SoundManager()
+    game = Game(sound=manager)
+    game.queue.add_customer(Customer("print", patience=5))
+    printer = game.spawn_machine(Printer())
+    printer.start_job("flyer")
+    printer.complete()
+    assert manager.history == [SoundEvent.BELL, SoundEvent.ALERT]
+    assert sound_manager.history == []
+
+    silent = Game(sound=NullSoundManager())
+    silent.queue.add_customer(Customer("print", patience=5))
+    assert silent.sound.history == [] and silent.sound.preloading == []
+
+
+def test_headless_import_skips_audio_and_concrete_machines():
+    probe = (
+        "import sys, machines, audio\n"
+        "assert audio.mixer is None and not audio._mixer_attempted\n"
+        "assert 'machines.printer' not in sys.modules\n"
+        "assert 'concurrent.futures' not in sys.modules\n"
+        "assert machines.Printer.__module__ == 'machines.printer'\n"
+    )
+    subprocess.run([sys.executable, "-c", probe], check=True)
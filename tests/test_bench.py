@@ -0,0 +1,42 @@
+from bench import suite
+
+
+def _document(**timings):
+    return {
+        "version": suite.BASELINE_VERSION,
+        "results": {name: {"best": best, "median": best} for name, best in timings.items()},
+    }
+
+
+def test_compare_flags_regressions_over_threshold():
+    baseline = _document(fast=1.0, slow=1.0, gone=1.0)
+    current = _document(fast=1.1, slow=1.5, new=9.0)
+    regressions = suite.compare(baseline, current, threshold=0.25)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("slow:")
+
+
+def test_benchmarks_run_headless():
+    document = suite.run_all(repeat=1, names=["workflow"])
+    assert list(document["results"]) == ["workflow.run_workflow"]
+
+
+def test_filtered_run_merges_into_baseline():
+    baseline = _document(kept=1.0, replaced=1.0)
+    merged = suite.merge(baseline, _document(replaced=2.0))
+    assert merged["results"]["kept"]["best"] == 1.0
+    assert merged["results"]["replaced"]["best"] == 2.0
+
+
+def test_environment_mismatch_is_reported():
+    old = dict(_document(), python="3.11.7", machine="x86_64")
+    assert suite.environment_mismatch(old, dict(old)) is None
+    assert "python" in suite.environment_mismatch(old, dict(old, python="3.12.1"))
+
+
+def test_memory_report_measures_bytes_per_object():
+    from bench import memory
+
+    sizes = memory.measure(customers=1000, machines=100)
+    assert set(sizes) == {"customer", "machine"}
+    assert all(size > 0 for size in sizes.values())
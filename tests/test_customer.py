@@ -41,3 +41,17 @@ def test_delegate_interaction():
     assert helper.patience == 2
     assert helper.satisfaction == 1
     assert recipient.satisfaction == 1
+
+
+def test_customers_are_slotted_and_intern_request_types():
+    first = DIYCustomer(b"copy".decode(), patience=5)
+    second = ElderlyCustomer(b"copy".decode(), patience=5)
+    assert first.request_type is second.request_type
+    assert not hasattr(first, "__dict__")
+
+    class Tagged(AverageCustomer):
+        pass
+
+    tagged = Tagged("scan", patience=2)
+    tagged.tag = "vip"  # subclasses without slots keep a __dict__
+    assert tagged == Tagged("scan", patience=2) and tagged.tag == "vip"
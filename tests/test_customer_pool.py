@@ -0,0 +1,62 @@
+import pytest
+
+from customers.customer import Customer, DIYCustomer, ElderlyCustomer, RushedCustomer
+
+np = pytest.importorskip("numpy")
+
+from customers.pool import CustomerPool  # noqa: E402
+
+
+def test_pool_tick_matches_per_object_decay():
+    specs = [
+        (Customer, 3),
+        (ElderlyCustomer, 4),
+        (RushedCustomer, 5),
+        (Customer, 1),
+    ]
+    pool = CustomerPool(capacity=2)
+    objects = []
+    for cls, patience in specs:
+        pool.add("print", patience, cls)
+        objects.append(cls("print", patience))
+
+    for amount in (1, 2, 3):
+        walked = pool.tick(amount)
+        expected = []
+        for index, cust in enumerate(objects):
+            if cust.walked_out:
+                continue
+            cust.decrement_patience(amount)
+            if cust.walked_out:
+                expected.append(index)
+        assert walked.tolist() == expected
+        assert pool.patience[: len(objects)].tolist() == [c.patience for c in objects]
+
+
+def test_pool_views_keep_customer_api():
+    pool = CustomerPool()
+    pool.add_many("copy", [3, 3], RushedCustomer)
+    helper, recipient = list(pool)
+    assert isinstance(helper, Customer)
+    assert helper.archetype is RushedCustomer
+    helper.assist(recipient)
+    assert helper.patience == 1
+    assert recipient.satisfaction == 1
+    helper.request_type = "scan"
+    assert pool.view(0).request_type == "scan"
+    assert pool.request_types == ["copy", "scan"]
+
+
+def test_pool_views_follow_their_archetype():
+    pool = CustomerPool()
+    diy = pool.add("print", 4, DIYCustomer)
+    rushed = pool.add("copy", 4, RushedCustomer)
+    assert isinstance(diy, DIYCustomer)
+    assert isinstance(rushed, RushedCustomer)
+    diy.handle_jam()
+    assert diy.called_for_help
+    assert pool.called_for_help[0]
+    assert rushed == RushedCustomer("copy", 4)
+    assert rushed != Customer("copy", 4)
+    rushed.decrement_patience()
+    assert rushed.patience == 2
@@ -0,0 +1,78 @@
+from dataclasses import replace
+
+from customers.customer import Customer
+from customers.queue import IndexedQueueManager
+from dispatch import DispatchPolicy, Dispatcher, machine_kind
+from experiments import Scenario, run_scenario
+from machines import Binder, Cutter, Printer
+from main import Game
+
+
+def _game(policy, *machines, **kwargs):
+    game = Game(dispatcher=Dispatcher(policy, **kwargs))
+    for machine in machines:
+        game.spawn_machine(machine).unlock()
+    return game
+
+
+def test_spawning_builds_pools_with_unique_keys():
+    game = Game()
+    first, second = game.spawn_machine(Printer()), game.spawn_machine(Printer())
+    assert list(game.machines) == ["printer", "printer-2"]
+    assert game.pool("printer") == [first, second]
+    assert machine_kind("printer-2") == "printer"
+    assert machine_kind("printer") == "printer"
+
+
+def test_least_loaded_spreads_jobs_over_pool():
+    game = _game(DispatchPolicy.LEAST_LOADED, Printer(), Printer(), Printer())
+    used = []
+    for _ in range(3):
+        game.add_customer("copy", patience=50)
+        (assignment,) = game.dispatch()
+        used.append(assignment.key)
+        assignment.machine.complete()
+    assert used == ["printer", "printer-2", "printer-3"]
+
+
+def test_shortest_expected_finish_prefers_fast_machine():
+    game = _game(DispatchPolicy.SHORTEST_EXPECTED_FINISH, Printer(), Binder())
+    game.add_customer("copy", patience=50)
+    assert [a.key for a in game.dispatch()] == ["binder"]
+
+
+def test_dispatch_respects_routes_and_queue_order():
+    game = _game(
+        DispatchPolicy.FIRST_IDLE, Printer(), Binder(), Cutter(),
+        routes={"bind": ("binder",)},
+    )
+    for request in ("bind", "bind", "copy"):
+        game.queue.add_customer(Customer(request, patience=50))
+    assignments = game.dispatch()
+    # the second "bind" customer waits for the binder and blocks the line
+    assert [(a.key, a.customer.request_type) for a in assignments] == [("binder", "bind")]
+    assert [c.request_type for c in game.queue.list_customers()] == ["bind", "copy"]
+
+
+def test_skip_blocked_lets_idle_machines_serve_later_customers():
+    game = Game(
+        queue=IndexedQueueManager(),
+        dispatcher=Dispatcher(routes={"bind": ("binder",)}, skip_blocked=True),
+    )
+    for machine in (Printer(), Binder()):
+        game.spawn_machine(machine).unlock()
+    for request in ("bind", "bind", "copy"):
+        game.queue.add_customer(Customer(request, patience=50))
+    assignments = game.dispatch()
+    assert sorted((a.key, a.customer.request_type) for a in assignments) == [
+        ("binder", "bind"), ("printer", "copy")
+    ]
+    assert [c.request_type for c in game.queue.list_customers()] == ["bind"]
+
+
+def test_throughput_scales_with_pool_size():
+    base = Scenario(machines=("printer",), duration=1_000, arrival_rate=0.5, patience=(5, 30))
+    one = run_scenario(base, seed=3)
+    pooled = replace(base, machines=("printer",) * 3, policy=DispatchPolicy.LEAST_LOADED)
+    three = run_scenario(pooled, seed=3)
+    assert three.jobs_completed > 2 * one.jobs_completed
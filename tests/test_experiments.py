@@ -0,0 +1,36 @@
+from experiments import Scenario, derive_seed, run_experiment, run_scenario, summarise
+
+SCENARIO = Scenario(
+    machines=("printer", "binder", "binder"),
+    duration=2_000,
+    arrival_rate=0.05,
+    rush_hours=((500, 800, 3.0),),
+    archetypes=(("average", 2.0), ("rushed", 1.0)),
+    patience=(20, 200),
+)
+
+
+def test_experiment_is_reproducible_across_worker_counts():
+    serial = run_experiment(SCENARIO, runs=6, master_seed=42, workers=1)
+    parallel = run_experiment(SCENARIO, runs=6, master_seed=42, workers=2)
+    assert serial.runs == parallel.runs
+    assert serial.summary == parallel.summary
+    assert [run.seed for run in serial.runs] == [derive_seed(42, i) for i in range(6)]
+    assert serial.summary["jobs_completed"].mean > 0
+
+
+def test_summarise_confidence_interval():
+    estimate = summarise([1.0, 2.0, 3.0, 4.0])
+    assert estimate.mean == 2.5
+    assert estimate.low < 2.5 < estimate.high
+    assert summarise([5.0]).low == 5.0
+
+
+def test_runs_do_not_leak_audio_state():
+    from audio import sound_manager
+
+    before = list(sound_manager.history)
+    first = run_scenario(SCENARIO, seed=1)
+    assert sound_manager.history == before
+    assert run_scenario(SCENARIO, seed=1) == first
+    assert sound_manager.history == before
@@ -0,0 +1,15 @@
+from ui.frame_stats import FrameStats
+
+
+def test_frame_stats_histogram_and_window():
+    stats = FrameStats(window=3)
+    stats.record(0.001, 0.002, 0.001)  # 4 ms
+    stats.record(0.002, 0.010, 0.002)  # 14 ms
+    stats.record(0.005, 0.030, 0.005)  # 40 ms
+    assert stats.histogram() == [1, 0, 1, 0, 1, 0, 0]
+    stats.record(0.0, 0.2, 0.0)  # pushes the 4 ms frame out of the window
+    assert len(stats) == 3
+    assert stats.histogram() == [0, 0, 1, 0, 1, 0, 1]
+    assert stats.histogram("draw")[-1] == 1
+    assert abs(stats.percentile(0.5) - 0.04) < 1e-12
+    assert abs(stats.mean("events") - 0.007 / 3) < 1e-12
@@ -1,5 +1,7 @@
+import pytest
+
 from main import Game
-from machines import Printer
+from machines import Binder, MachineError, Printer
 
 
 def test_game_loop_completes_job():
@@ -10,3 +12,27 @@ def test_game_loop_completes_job():
     assert game.progress_jobs(50) == []
     assert game.progress_jobs(50) == ["copy"]
     assert game.queue.list_customers() == []
+
+
+def test_games_do_not_share_queue():
+    first, second = Game(), Game()
+    first.add_customer("copy", patience=5)
+    assert first.queue is not second.queue
+    assert len(second.queue) == 0
+
+
+def test_progress_jobs_only_visits_running_machines():
+    game = Game()
+    idle, busy = game.spawn_machine(Printer()), game.spawn_machine(Printer(jam_at=30))
+    binder = game.spawn_machine(Binder())
+    binder.unlock()
+    busy.start_job("flyer")
+    binder.start_job("report")
+    assert game.active_machines() == [busy, binder]
+
+    assert game.progress_jobs(20) == ["report"]
+    assert game.active_machines() == [busy]
+    with pytest.raises(MachineError):
+        game.progress_jobs(20)  # the printer jams
+    assert game.active_machines() == []
+    assert idle.progress_value == 0
@@ -0,0 +1,65 @@
+import io
+import json
+
+from journal import Journal, replay, state_digest
+from main import Game
+
+COMMANDS = [
+    ["spawn", "printer"],
+    ["spawn", "binder"],
+    ["spawn", "printer"],
+    ["add", "copy", "3"],
+    ["add", "scan", "9"],
+    ["add", "bind", "1"],
+    ["process"],
+    ["progress", "60"],
+    ["progress", "60"],
+    ["process", "binder"],
+    ["add", "copy", "oops"],
+    ["dance"],
+]
+
+
+def _record(**options):
+    stream = io.StringIO()
+    game = Game()
+    game.journal = Journal(stream, game, **options)
+    events = [game.execute(command) for command in COMMANDS]
+    game.journal.checkpoint(game)
+    return game, events, stream.getvalue().splitlines()
+
+
+def test_execute_reports_events_instead_of_raising():
+    _, events, _ = _record()
+    assert events[2] == [{"event": "spawned", "machine": "printer-2"}]
+    assert {"event": "job_completed", "job": "copy"} in events[8]
+    assert events[10][0]["event"] == "bad_argument"
+    assert events[11][0]["event"] == "unknown_command"
+
+
+def test_replay_reproduces_recorded_session():
+    game, _, lines = _record(checkpoint_every=4)
+    output = io.StringIO()
+    result = replay(lines, output=output)
+    assert result.ok, result.mismatches
+    assert result.commands == len(COMMANDS)
+    assert result.checkpoints == 4
+    assert state_digest(result.game) == state_digest(game)
+    assert "Completed copy" in output.getvalue().splitlines()
+
+
+def test_replay_detects_divergence():
+    _, _, lines = _record()
+    # a journal from a build where the first printer took a different key
+    edited = json.loads(lines[1])
+    edited["events"] = [{"event": "spawned", "machine": "printer-1"}]
+    lines[1] = json.dumps(edited)
+    # and a different final state
+    edited = json.loads(lines[-1])
+    edited["checkpoint"] = "0" * 64
+    lines[-1] = json.dumps(edited)
+
+    result = replay(lines)
+    assert not result.ok
+    assert result.mismatches[0].startswith("command 0 ['spawn', 'printer']")
+    assert result.mismatches[1] == f"state differs at checkpoint {len(COMMANDS)}"
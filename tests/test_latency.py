@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from audio import NullSoundManager
+from customers.customer import ElderlyCustomer, RushedCustomer
+from latency import SLO, Interval, LatencyTracker, QuantileSketch
+from machines import Printer
+from main import Game
+from simulation import Simulation
+
+
+def test_sketch_quantiles_stay_within_relative_accuracy():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(3, 1.5) for _ in range(50_000)]
+    first, second = QuantileSketch(0.01), QuantileSketch(0.01)
+    for index, value in enumerate(values):
+        (first if index % 2 else second).add(value)
+    first.merge(second)
+    values.sort()
+    for q in (0.5, 0.95, 0.99):
+        exact = values[int(q * (len(values) - 1))]
+        assert first.quantile(q) == pytest.approx(exact, rel=0.02)
+    assert first.count == len(values) and len(first.buckets) < 2048
+    assert first.quantile(1) == values[-1]
+
+    capped = QuantileSketch(0.01, max_buckets=512)
+    for value in values:
+        capped.add(value)
+    assert len(capped.buckets) == 512
+    assert capped.quantile(0.99) == pytest.approx(first.quantile(0.99))
+    with pytest.raises(ValueError):
+        capped.merge(QuantileSketch(0.05))
+
+
+def test_game_tracks_wait_service_and_walkouts_per_group():
+    now = [0]
+    tracker = LatencyTracker(clock=lambda: now[0])
+    game = Game(sound=NullSoundManager(), latency=tracker)
+    game.spawn_machine(Printer())
+    game.queue.add_customer(ElderlyCustomer("copy", 50))
+    game.add_customer("scan", 2)
+    now[0] = 3
+    game.dispatch()  # the elderly customer waited 3
+    for tick in range(4, 14):
+        now[0] = tick
+        game.progress_jobs(10)  # "scan" walks out meanwhile
+    summary = tracker.summary(by=["request_type", "archetype"])
+    copy = summary["copy/elderly"]
+    assert copy["wait"]["p50"] == pytest.approx(3, rel=0.01)
+    assert copy["service"]["p99"] == pytest.approx(10, rel=0.01)
+    assert copy["total"]["max"] == 13
+    assert tracker.walkouts == {("scan", "customer"): 1}
+    assert not tracker._waiting and not tracker._serving
+
+
+def test_simulation_reports_ticks_and_checks_slos():
+    tracker = LatencyTracker()
+    sim = Simulation(rate=25, latency=tracker)
+    sim.game.spawn_machine(Printer())
+    for tick in range(0, 400, 2):
+        archetype = RushedCustomer if tick % 4 else ElderlyCustomer
+        sim.add_arrival(tick, archetype("copy", 10_000))
+    sim.run(until=2_000)
+
+    assert tracker.sketch(Interval.SERVICE).quantile(0.99) == pytest.approx(4, rel=0.01)
+    report = tracker.check([
+        SLO(Interval.SERVICE, 0.95, 5),
+        SLO(Interval.WAIT, 0.5, 10, archetype="rushed"),
+        SLO(Interval.TOTAL, 0.99, 100, request_type="scan"),
+    ])
+    assert [r.met for r in report.results] == [True, False, True]
+    assert report.results[2].observed is None and not report.met
+    assert report.format().splitlines()[1].startswith("MISS  rushed wait p50 <= 10")
+    with pytest.raises(ValueError):
+        tracker.summary(by=["machine"])
@@ -1,6 +1,20 @@
 import pytest
 
-from machines import Binder, MachineError, Printer, Cutter, Laminator, Folder
+from machines import (
+    Binder,
+    Cue,
+    CutJob,
+    CueBus,
+    CueChannel,
+    CueKind,
+    Cutter,
+    Folder,
+    Laminator,
+    MachineError,
+    Printer,
+    cue_bus,
+    plan_batches,
+)
 
 
 def test_binder_measurement_success():
@@ -10,7 +24,7 @@ def test_binder_measurement_success():
     binder.start_job("bind report")
     binder.progress(1.05)  # within tolerance
     binder.complete()
-    assert any("visual: complete" in cue for cue in binder.cues)
+    assert any("visual: complete" in str(cue) for cue in binder.cues)
 
 
 def test_binder_measurement_failure_triggers_cues():
@@ -20,7 +34,7 @@ def test_binder_measurement_failure_triggers_cues():
     binder.progress(0.5)  # wrong measurement
     with pytest.raises(MachineError):
         binder.complete()
-    assert any("error binding failed" in cue for cue in binder.cues)
+    assert any("error binding failed" in str(cue) for cue in binder.cues)
 
 
 def test_printer_jam_triggers_cues():
@@ -28,7 +42,7 @@ def test_printer_jam_triggers_cues():
     printer.start_job("print flyer")
     with pytest.raises(MachineError):
         printer.progress(60)
-    assert any("error paper jam" in cue for cue in printer.cues)
+    assert any("error paper jam" in str(cue) for cue in printer.cues)
 
 
 def test_cutter_stacks_same_cut_type():
@@ -43,13 +57,40 @@ def test_cutter_stacks_same_cut_type():
     assert cutter.progress_value == 100
 
 
+def test_cutter_plans_one_batch_per_cut_type():
+    cutter = Cutter(time_per_cut=1.0, setup_time=5.0)
+    cutter.unlock()
+    for index in range(6):
+        cutter.queue_job(f"job-{index}", ("trim", "crease")[index % 2], cuts=1)
+    batch = cutter.start_next_batch()
+    assert [job.job for job in batch] == ["job-0", "job-2", "job-4"]
+    assert cutter.time_required == 8
+    cutter.progress(8)
+    assert cutter.complete() == "job-0+job-2+job-4"
+    assert [job.job for job in cutter.start_next_batch()] == ["job-1", "job-3", "job-5"]
+    assert cutter.pending == []
+
+
+def test_plan_batches_splits_only_for_due_dates():
+    jobs = [
+        CutJob("late", "trim", 4),
+        CutJob("urgent", "trim", 1, due=3.0),
+        CutJob("other", "crease", 1, due=10.0),
+    ]
+    assert len(plan_batches([CutJob(j.job, j.cut_type, j.cuts) for j in jobs], 2.0, 1.0)) == 2
+    batches = plan_batches(jobs, setup_time=2.0, time_per_cut=1.0)
+    assert [[job.job for job in batch] for batch in batches] == [
+        ["urgent"], ["other"], ["late"],
+    ]
+
+
 def test_laminator_out_of_film_triggers_cues():
     laminator = Laminator(film_available=False)
     assert laminator.locked
     laminator.unlock()
     with pytest.raises(MachineError):
         laminator.start_job("laminate poster")
-    assert any("error out of film" in cue for cue in laminator.cues)
+    assert any("error out of film" in str(cue) for cue in laminator.cues)
 
 
 def test_folder_jam_triggers_cues():
@@ -59,7 +100,7 @@ def test_folder_jam_triggers_cues():
     folder.start_job("fold brochure")
     with pytest.raises(MachineError):
         folder.progress(60)
-    assert any("error fold jam" in cue for cue in folder.cues)
+    assert any("error fold jam" in str(cue) for cue in folder.cues)
 
 
 def test_advanced_machines_start_locked():
@@ -67,3 +108,42 @@ def test_advanced_machines_start_locked():
     assert Cutter().locked
     assert Laminator().locked
     assert Folder().locked
+
+
+def test_cue_bus_filters_by_machine_and_kind():
+    bus = CueBus(history=4)
+    first, second = Printer(), Printer(jam_at=50)
+    everything, errors, from_first = [], [], []
+    bus.subscribe(everything.append)
+    bus.subscribe(errors.append, kind=CueKind.ERROR)
+    unsubscribe = bus.subscribe(from_first.append, machine=first)
+    for machine in (first, second):
+        for channel in CueChannel:
+            bus.publish(Cue(machine, CueKind.START, channel))
+    bus.publish(Cue(second, CueKind.ERROR, CueChannel.AUDIO, "paper jam"))
+    unsubscribe()
+    bus.publish(Cue(first, CueKind.COMPLETE, CueChannel.VISUAL))
+
+    assert len(everything) == 6
+    assert [cue.payload for cue in errors] == ["paper jam"]
+    assert [cue.machine for cue in from_first] == [first, first]
+    assert len(bus.history) == 4
+
+
+def test_machines_publish_cues_on_global_bus():
+    printer = Printer(jam_at=50)
+    seen = []
+    unsubscribe = cue_bus.subscribe(seen.append, machine=printer, kind=CueKind.ERROR)
+    try:
+        printer.start_job("print flyer")
+        with pytest.raises(MachineError):
+            printer.progress(60)
+    finally:
+        unsubscribe()
+    assert {cue.channel for cue in seen} == set(CueChannel)
+    assert all(cue.payload == "paper jam" for cue in seen)
+
+
+def test_machines_are_slotted():
+    for machine in (Printer(), Cutter(), Binder(), Laminator(), Folder()):
+        assert not hasattr(machine, "__dict__"), type(machine).__name__
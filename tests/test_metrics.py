@@ -0,0 +1,60 @@
+import json
+
+from machines import Binder, Printer
+from main import Game
+from metrics import Metrics, MetricsFormat, NullMetrics
+
+
+def _session(metrics):
+    game = Game(metrics=metrics)
+    game.spawn_machine(Printer())
+    game.spawn_machine(Printer(jam_at=50))
+    game.spawn_machine(Binder()).unlock()
+    for request, patience in [("copy", 50), ("copy", 50), ("bind", 50), ("scan", 1)]:
+        game.add_customer(request, patience)
+    game.assign_next_customer("printer")
+    game.assign_next_customer("printer-2")
+    game.assign_next_customer("binder")
+    game.execute(["progress", "60"])  # printer-2 jams
+    game.execute(["progress", "60"])
+    return game
+
+
+def test_counters_gauges_and_timers():
+    metrics = Metrics(clock=iter(range(1000)).__next__)
+    game = _session(metrics)
+    values = metrics.snapshot()
+    counters = values["counters"]
+    assert counters['jobs_started_total{machine="printer"}'] == 2
+    assert counters['jobs_completed_total{machine="printer"}'] == 1
+    assert counters['jobs_failed_total{machine="printer"}'] == 1
+    assert counters['jobs_completed_total{machine="binder"}'] == 1
+    assert counters["walkouts_total"] == game.walkouts == 1
+    assert values["gauges"] == {"queue_length": 0, "active_machines": 0}
+    assert values["timers"]["game_progress_jobs"]["count"] == 2
+    assert values["timers"]["queue_tick"]["count"] == 1  # the jam aborts the first tick
+    assert values["timers"]["game_assign_next_customer"]["total"] == 3
+
+
+def test_exports_json_and_prometheus(tmp_path):
+    metrics = Metrics()
+    _session(metrics)
+    json_path = tmp_path / "metrics.json"
+    metrics.write(str(json_path))
+    assert json.loads(json_path.read_text())["counters"]["walkouts_total"] == 1
+
+    prom_path = tmp_path / "metrics.prom"
+    metrics.write(str(prom_path))
+    text = prom_path.read_text()
+    assert MetricsFormat.for_path(str(prom_path)) is MetricsFormat.PROMETHEUS
+    assert "# TYPE printshop_jobs_started_total counter" in text
+    assert 'printshop_jobs_started_total{machine="printer"} 2' in text
+    assert "printshop_game_progress_jobs_seconds_count 2" in text
+    # written through a temporary file that is renamed into place
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["metrics.json", "metrics.prom"]
+
+
+def test_disabled_metrics_leave_the_game_uninstrumented():
+    game = _session(NullMetrics())
+    assert "progress_jobs" not in vars(game)
+    assert game.metrics.snapshot() == {"counters": {}, "gauges": {}, "timers": {}}
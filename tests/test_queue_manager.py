@@ -1,5 +1,13 @@
-from customers.customer import Customer
-from customers.queue import QueueManager
+import pytest
+
+from customers.customer import (
+    AverageCustomer,
+    Customer,
+    DIYCustomer,
+    ElderlyCustomer,
+    RushedCustomer,
+)
+from customers.queue import DeadlineQueueManager, IndexedQueueManager, QueueManager
 
 
 def test_queue_manager_walk_out():
@@ -9,3 +17,120 @@ def test_queue_manager_walk_out():
     walked_out = manager.tick()
     assert walked_out == [cust]
     assert len(manager) == 0
+
+
+def _mixed_customers():
+    return [
+        Customer("copy", patience=3),
+        ElderlyCustomer("print", patience=4),
+        RushedCustomer("bind", patience=5),
+        AverageCustomer("scan", patience=1),
+        RushedCustomer("copy", patience=2),
+    ]
+
+
+def test_deadline_queue_matches_fifo_walkouts():
+    fifo = QueueManager()
+    deadline = DeadlineQueueManager()
+    for cust in _mixed_customers():
+        fifo.add_customer(cust)
+    for cust in _mixed_customers():
+        deadline.add_customer(cust)
+
+    for amount in (1, 3, 1, 2, 1):
+        expected = fifo.tick(amount)
+        actual = deadline.tick(amount)
+        assert actual == expected
+        assert deadline.list_customers() == fifo.list_customers()
+        assert len(deadline) == len(fifo)
+
+
+def test_deadline_queue_pop_next_syncs_patience():
+    manager = DeadlineQueueManager()
+    manager.add_customer(ElderlyCustomer("print", patience=5))
+    manager.add_customer(RushedCustomer("bind", patience=6))
+    manager.tick(2)
+    first = manager.pop_next()
+    assert isinstance(first, ElderlyCustomer)
+    assert first.patience == 4
+    second = manager.pop_next()
+    assert second.patience == 2
+    assert manager.pop_next() is None
+    assert manager.tick(10) == []
+
+
+def test_deadline_queue_keeps_patience_changed_by_assist():
+    fifo = QueueManager()
+    deadline = DeadlineQueueManager()
+    pairs = []
+    for manager in (fifo, deadline):
+        helper, recipient = Customer("scan", patience=3), Customer("copy", patience=3)
+        manager.add_customer(helper)
+        manager.add_customer(recipient)
+        pairs.append((helper, recipient))
+
+    for manager, (helper, recipient) in zip((fifo, deadline), pairs):
+        manager.tick()
+        helper.assist(recipient)
+    deadline.reschedule(pairs[1][0])
+    assert [c.patience for c in deadline.list_customers()] == [1, 2]
+    assert deadline.list_customers() == fifo.list_customers()
+    assert deadline.tick() == fifo.tick() == [pairs[0][0]]
+    assert deadline.list_customers() == fifo.list_customers()
+
+
+def test_deadline_queue_rejects_decrement_patience_overrides():
+    class Stubborn(Customer):
+        def decrement_patience(self, amount=1):
+            return self.patience
+
+    class Calm(Customer):
+        @staticmethod
+        def patience_decay(amount=1):
+            return 0
+
+    manager = DeadlineQueueManager()
+    with pytest.raises(TypeError):
+        manager.add_customer(Stubborn("copy", patience=2))
+    manager.add_customer(Calm("copy", patience=2))
+    assert manager.tick(5) == []
+
+
+def test_indexed_queue_matches_fifo_and_finds_by_type_and_archetype():
+    fifo = QueueManager()
+    indexed = IndexedQueueManager()
+    fifo.restore(_mixed_customers())
+    indexed.restore(_mixed_customers())
+    for amount in (1, 3):
+        assert indexed.tick(amount) == fifo.tick(amount)
+        assert indexed.list_customers() == fifo.list_customers()
+
+    indexed.restore([RushedCustomer("copy", 9), DIYCustomer("bind", 9)])
+    assert indexed.peek_request("copy") == RushedCustomer("copy", 9)
+    assert indexed.pop_archetype(RushedCustomer) == RushedCustomer("copy", 9)
+    assert indexed.pop_archetype(RushedCustomer) is None  # the rushed ones walked out
+    assert indexed.pop_for(lambda request: request in {"bind", "scan"}) == DIYCustomer("bind", 9)
+    assert indexed.pop_request("bind") is None
+    assert [c.request_type for c in indexed.list_customers()] == ["print"]
+    assert len(indexed) == 1
+
+
+def test_indexed_queue_priority_lanes_and_removal():
+    queue = IndexedQueueManager(priority=lambda c: isinstance(c, RushedCustomer))
+    calm, rushed, other = Customer("copy", 5), RushedCustomer("copy", 5), Customer("scan", 5)
+    queue.restore([calm, rushed, other])
+    assert queue.list_customers() == [rushed, calm, other]
+    assert queue.peek_request("copy") is rushed
+    assert queue.remove(rushed) and not queue.remove(rushed)
+    assert queue.pop_request("copy") is calm
+    assert queue.pop_next() is other and queue.pop_next() is None
+
+
+def test_pop_for_skips_blocked_customers_in_every_queue():
+    for queue in (QueueManager(), DeadlineQueueManager(), IndexedQueueManager()):
+        queue.restore([Customer("bind", 5), Customer("copy", 5), Customer("copy", 6)])
+        assert queue.pop_for(lambda request: request == "copy") == Customer("copy", 5)
+        assert queue.pop_for(lambda request: request == "laminate") is None
+        assert [c.patience for c in queue.list_customers()] == [5, 6]
+        assert queue.pop_next().request_type == "bind"
+        assert len(queue) == 1
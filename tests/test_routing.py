@@ -0,0 +1,89 @@
+import pytest
+
+from machines import Binder, Cutter, Folder, Laminator, Printer
+from routing import Route, Router, rank_additions
+
+CARDS = Route("cards", {
+    "printer": (),
+    "cutter": ("printer",),
+    "laminator": ("printer",),
+    "binder": ("cutter", "laminator"),
+})
+
+
+def unlocked(machine):
+    machine.unlock()
+    return machine
+
+
+def shop(**rates):
+    router = Router(rate=50, rates=rates)
+    for factory in (Printer, Cutter, Laminator, Binder):
+        router.add_machine(unlocked(factory()))
+    return router
+
+
+def test_routes_validate_and_order_steps():
+    assert Route.chain("b", "printer", "binder").requires == {
+        "printer": (), "binder": ("printer",)
+    }
+    assert CARDS.order[0] == "printer" and CARDS.order[-1] == "binder"
+    with pytest.raises(ValueError, match="cycle"):
+        Route("loop", {"printer": ("binder",), "binder": ("printer",)})
+    with pytest.raises(ValueError, match="unknown"):
+        Route("x", {"binder": ("folder",)})
+    with pytest.raises(ValueError, match="no machine"):
+        shop().submit(Route.chain("f", "printer", "folder"))
+
+
+def test_orders_fan_out_join_and_hand_off_on_completion():
+    router = shop()
+    order = router.submit(CARDS)
+    router.tick()
+    router.tick()  # printing done: cutter and laminator both get the order
+    assert order.done == {"printer"}
+    assert [len(router.buffers[k]) for k in ("cutter", "laminator")] == [1, 1]
+    report = router.run(10)
+    assert report.completed == [order] and order.done == set(CARDS.requires)
+    assert report.kinds["binder"].steps == 1
+    assert report.mean_lead_time == order.finished - order.released
+
+
+def test_bottleneck_and_best_extra_machine():
+    def build():
+        return shop(laminator=10)
+
+    def orders():
+        return ((tick, CARDS) for tick in range(0, 200, 2))
+
+    report = build().run(200, orders())
+    assert report.bottleneck == "laminator"
+    assert report.load("laminator") > 5 > report.load("printer")
+    assert report.utilization("laminator") > 0.95
+    assert report.utilization("binder") < 0.5
+    assert report.mean_wip("laminator") > report.mean_wip("cutter")
+
+    ranking = rank_additions(build, 200, orders, {"printer": Printer, "laminator": Laminator})
+    assert ranking[0][0] == "laminator"
+    assert ranking[0][1] > 1.5 * ranking[1][1]
+
+
+def test_bounded_buffers_block_upstream_machines():
+    router = Router(rate=50, rates={"folder": 5}, capacity=2)
+    router.add_machine(Printer())
+    router.add_machine(unlocked(Folder()))
+    slow = Route.chain("slow", "printer", "folder")
+    report = router.run(100, ((0, slow) for _ in range(10)))
+    assert report.kinds["folder"].wip_max <= 2
+    assert report.kinds["printer"].blocked > 0
+    assert len(report.completed) == 4
+
+
+def test_failed_steps_drop_the_order():
+    router = Router(rate=50)
+    router.add_machine(Printer(jam_at=60))
+    router.add_machine(unlocked(Binder()))
+    order = router.submit(Route.chain("b", "printer", "binder"))
+    report = router.run(5)
+    assert report.failed == [(order, "printer", "paper jam")]
+    assert not report.completed and not router.game.active_machines()
@@ -0,0 +1,64 @@
+import asyncio
+
+from customers.arrivals import Arrival
+from customers.customer import ElderlyCustomer
+from machines import Printer
+from main import Game
+from runtime import Runtime, aiter_arrivals
+
+
+def test_ticks_and_async_arrivals_run_the_shop():
+    game = Game()
+    game.spawn_machine(Printer())
+    lines = []
+    runtime = Runtime(game, tick_rate=1000, amount=50, auto_dispatch=True, output=lines.append)
+    arrivals = [Arrival(0, "copy", "elderly", 50), Arrival(3, "scan", "average", 50)]
+
+    asyncio.run(runtime.run([aiter_arrivals(arrivals)], until=12))
+
+    assert runtime.ticks == 12
+    assert lines.count("Customer added") == 2
+    assert "Completed copy" in lines and "Completed scan" in lines
+    # the scan customer only entered after tick 3 had run
+    assert lines.index("Completed copy") < lines.index("Started scan on printer")
+
+
+def test_socket_commands_run_while_the_shop_ticks():
+    game = Game()
+    runtime = Runtime(game, tick_rate=200, amount=25, output=lambda line: None)
+
+    async def operator():
+        while runtime.port is None:
+            await asyncio.sleep(0)
+        reader, writer = await asyncio.open_connection("127.0.0.1", runtime.port)
+        writer.write(b"spawn printer\nadd copy 90 elderly\nprocess printer\nbogus\nquit\n")
+        await writer.drain()
+        replies = (await reader.read()).decode().splitlines()
+        writer.close()
+        await runtime.wait_for_tick(runtime.ticks + 5)
+        runtime.stop()
+        return replies
+
+    async def session():
+        task = asyncio.create_task(operator())
+        await runtime.run(port=0)
+        return await task
+
+    replies = asyncio.run(session())
+    assert replies == [
+        "Spawned printer",
+        "Customer added",
+        "Started copy on printer",
+        "Unknown command",
+    ]
+    assert game.machines["printer"].job is None  # finished by the ticks
+    assert runtime.ticks >= 5
+
+
+def test_add_command_accepts_an_archetype():
+    game = Game()
+    assert game.execute(["add", "copy", "5", "elderly"]) == [
+        {"event": "customer_added", "request_type": "copy"}
+    ]
+    assert isinstance(game.queue.peek_next(), ElderlyCustomer)
+    assert game.execute(["add", "copy", "5", "ghost"])[0]["event"] == "bad_argument"
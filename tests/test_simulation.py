@@ -0,0 +1,77 @@
+import random
+
+from customers.customer import Customer, ElderlyCustomer, RushedCustomer
+from customers.queue import DeadlineQueueManager
+from machines import Binder, Printer
+from main import Game
+from simulation import Simulation
+
+
+def _arrivals(seed, count, horizon):
+    rng = random.Random(seed)
+    kinds = (Customer, ElderlyCustomer, RushedCustomer)
+    arrivals = [
+        (rng.randrange(horizon), rng.choice(kinds), rng.randint(0, 40))
+        for _ in range(count)
+    ]
+    return sorted(arrivals, key=lambda arrival: arrival[0])
+
+
+def _tick_loop(arrivals, until, rate):
+    """Reference run on the default tick-based Game and QueueManager."""
+    game = Game()
+    game.spawn_machine(Printer())
+    binder = game.spawn_machine(Binder())
+    binder.unlock()
+    completed, walkouts = [], []
+    pending = list(arrivals)
+    for t in range(until):
+        while pending and pending[0][0] == t:
+            _, cls, patience = pending.pop(0)
+            game.queue.add_customer(cls("copy", patience))
+        for name, machine in game.machines.items():
+            if machine.job is None and not machine.locked and len(game.queue):
+                game.assign_next_customer(name)
+        waiting = game.queue.list_customers()
+        for job in game.progress_jobs(rate):
+            completed.append((t + 1, job))
+        remaining = {id(c) for c in game.queue.list_customers()}
+        walkouts.extend((t + 1, c) for c in waiting if id(c) not in remaining)
+    return completed, walkouts, game.queue.list_customers()
+
+
+def test_event_engine_matches_tick_loop():
+    arrivals = _arrivals(seed=7, count=150, horizon=200)
+    expected, expected_walkouts, expected_queue = _tick_loop(arrivals, until=300, rate=15)
+    assert expected_walkouts
+
+    sim = Simulation(rate=15)
+    sim.game.spawn_machine(Printer())
+    sim.game.spawn_machine(Binder()).unlock()
+    for time, cls, patience in arrivals:
+        sim.add_arrival(time, cls("copy", patience))
+    report = sim.run(until=300)
+
+    assert [(t, job) for t, _, job in report.completed] == expected
+    assert report.walkouts == expected_walkouts
+    assert sim.game.queue.list_customers() == expected_queue
+    assert len(report.served) + len(report.walkouts) + len(expected_queue) == 150
+
+
+def test_event_engine_skips_machines_that_cannot_start():
+    sim = Simulation(rate=50)
+    sim.game.spawn_machine(Printer(paper_available=False))
+    for time in range(5):
+        sim.add_arrival(time, Customer("copy", patience=100))
+    report = sim.run(until=10)
+    assert report.rejected == report.failed == report.served == []
+    assert len(sim.game.queue) == 5
+
+
+def test_event_engine_skips_idle_time():
+    sim = Simulation(rate=10)
+    sim.game.spawn_machine(Printer())
+    sim.add_arrival(1_000_000, Customer("copy", patience=5))
+    report = sim.run(until=2_000_000)
+    assert report.completed == [(1_000_010, "printer", "copy")]
+    assert report.events == 2
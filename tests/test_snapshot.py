@@ -0,0 +1,96 @@
+import pytest
+
+from customers.customer import (
+    AverageCustomer,
+    Customer,
+    DIYCustomer,
+    ElderlyCustomer,
+    RushedCustomer,
+)
+from customers.queue import DeadlineQueueManager, IndexedQueueManager, QueueManager
+from machines import Binder, Cutter, Printer
+from main import Game
+from snapshot import Checkpointer, SnapshotError, SnapshotKind, load, save
+
+
+def _machine_state(game):
+    return [
+        (key, type(m), m.job, m.progress_value, m.locked)
+        for key, m in game.machines.items()
+    ]
+
+
+def _shop(queue):
+    game = Game(queue=queue)
+    game.spawn_machine(Printer(jam_at=90))
+    game.spawn_machine(Printer())
+    game.spawn_machine(Binder(target_width=2.0))
+    cutter = game.spawn_machine(Cutter(setup_time=3.0))
+    cutter.unlock()
+    cutter.queue_job("cards", "trim", 2, due=10.0)
+    cutter.queue_job("flyers", "trim", 1)
+    cutter.queue_job("posters", "crease", 4)
+    cutter.start_next_batch()
+    cutter.progress(2.5)
+    kinds = (Customer, AverageCustomer, ElderlyCustomer, RushedCustomer, DIYCustomer)
+    for index in range(50):
+        game.queue.add_customer(kinds[index % 5](f"req-{index % 3}", 20 + index, index % 4))
+    game.queue.list_customers()[4].handle_jam()
+    game.dispatch()
+    game.progress_jobs(30)  # the binder job completes the tutorial
+    return game
+
+
+@pytest.mark.parametrize(
+    "queue_type", [QueueManager, DeadlineQueueManager, IndexedQueueManager]
+)
+def test_full_snapshot_round_trip(queue_type):
+    game = _shop(queue_type())
+    restored = load(save(game))
+
+    assert type(restored.queue) is queue_type
+    assert restored.queue.list_customers() == game.queue.list_customers()
+    assert _machine_state(restored) == _machine_state(game)
+    assert restored.active_machines() != []
+    original, copy = game.machines["cutter"], restored.machines["cutter"]
+    assert copy.jobs == original.jobs and copy.pending == original.pending
+    assert copy.time_spent == original.time_spent
+    assert restored.machines["printer"].jam_at == 90
+    assert restored.tutorial.is_complete() and game.tutorial.is_complete()
+
+
+def test_delta_snapshot_applies_to_its_base():
+    game = _shop(DeadlineQueueManager())
+    checkpoints = Checkpointer(game)
+    checkpoints.full()
+    game.queue.pop_next()
+    game.queue.tick(5)
+    game.queue.list_customers()[10].satisfaction = 99
+    game.queue.add_customer(DIYCustomer("new request", 7))
+    game.machines["printer-2"].progress(20)
+
+    delta = checkpoints.delta()
+    assert len(delta) < len(checkpoints.base)
+    restored = load(delta, base=checkpoints.base)
+    assert restored.queue.list_customers() == game.queue.list_customers()
+    assert _machine_state(restored) == _machine_state(game)
+    with pytest.raises(SnapshotError):
+        load(delta)
+
+
+def test_delta_falls_back_to_full_snapshot_when_reordered():
+    game = Game()
+    first, second = Customer("a", 5), Customer("b", 5)
+    game.queue.restore([first, second])
+    checkpoints = Checkpointer(game)
+    checkpoints.full()
+    game.queue = QueueManager()
+    game.queue.restore([second, first])
+    data = checkpoints.delta()
+    assert data[6] == SnapshotKind.FULL and checkpoints.base == data
+    assert load(data).queue.list_customers() == [second, first]
+
+
+def test_rejects_foreign_data():
+    with pytest.raises(SnapshotError):
+        load(b"not a snapshot at all")
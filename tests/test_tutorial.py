@@ -1,7 +1,12 @@
+import io
+
 import pytest
 
+from audio import NullSoundManager
+from journal import Journal, replay
 from machines import Binder, Printer
-from tutorial import default_tutorial
+from main import Game
+from tutorial import TutorialMode, default_tutorial
 from ui.pause_menu import PauseMenu
 
 
@@ -23,3 +28,44 @@ def test_tutorial_unlocks_machines_and_replays():
     menu.replay_tutorial()
     assert binder.locked  # tutorial reset relocks binder
     assert tut.current_step().station == "Printer"
+
+
+def test_events_complete_steps_and_skip_ahead():
+    printer, binder = Printer(), Binder()
+    tut = default_tutorial(printer, binder)
+    tut.start()
+    assert not tut.notify("job_started", "binder")  # no step waits for it
+    assert tut.notify("arrived", "printer") and tut.index == 1
+    binder.lock()
+    tut.current_step()
+    assert binder.locked  # polling does not unlock machines again
+
+    assert tut.notify("arrived", "binder")  # skips "Start the print job"
+    assert tut.current_step().station == "Binder" and not binder.locked
+    assert tut.notify("job_completed", "binder") and tut.is_complete()
+    assert not tut.notify("job_completed", "binder")
+
+
+def test_game_reports_jobs_and_headless_modes_skip_the_tutorial():
+    game = Game(sound=NullSoundManager())
+    binder = game.spawn_machine(Binder())
+    game.spawn_machine(Printer())
+    game.add_customer("copy", 5)
+    game.dispatch()
+    assert game.tutorial.current_step().instruction == "Carry prints to the binder"
+    assert not binder.locked
+
+    stream = io.StringIO()
+    off = Game(tutorial_mode=TutorialMode.OFF)
+    off.journal = Journal(stream, off)
+    for command in (["spawn", "printer"], ["spawn", "binder"], ["process", "binder"]):
+        off.execute(command)
+    assert off.machines["binder"].locked and off.tutorial is None
+    off.journal.checkpoint(off)
+    result = replay(io.StringIO(stream.getvalue()))
+    assert result.ok and result.game.tutorial_mode is TutorialMode.OFF
+
+    skipped = Game(tutorial_mode=TutorialMode.SKIP)
+    skipped.spawn_machine(Printer())
+    assert not skipped.spawn_machine(Binder()).locked
+    assert skipped.tutorial.is_complete()
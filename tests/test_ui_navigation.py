@@ -49,3 +49,37 @@ def test_navigator_pathfinding_and_instant_modes():
 
     nav_fast = Navigator(graph, NavigationMode.INSTANT)
     assert nav_fast.select_station("counter", "cutter") == ["cutter"]
+
+
+def test_navigator_routing_table_invalidated_on_mutation():
+    graph = {"counter": ["printer", "binder"], "printer": ["cutter"], "binder": []}
+    nav = Navigator(graph)
+    nav.precompute()
+    assert nav.select_station("counter", "cutter") == ["counter", "printer", "cutter"]
+    assert nav.select_station("cutter", "counter") == []
+
+    nav.add_edge("binder", "cutter")
+    nav.remove_edge("printer", "cutter")
+    assert nav.select_station("counter", "cutter") == ["counter", "binder", "cutter"]
+
+
+def test_navigator_weighted_routes_and_astar():
+    graph = {"counter": ["printer", "binder"], "printer": ["cutter"], "binder": ["cutter"]}
+    weights = {("counter", "printer"): 5.0, ("printer", "cutter"): 5.0,
+               ("counter", "binder"): 1.0, ("binder", "cutter"): 2.0}
+    positions = {"counter": (0, 0), "printer": (4, 3), "binder": (1, 0), "cutter": (3, 0)}
+    nav = Navigator(graph, weights=weights, positions=positions)
+    assert nav.select_station("counter", "cutter") == ["counter", "binder", "cutter"]
+    assert nav.shortest_path("counter", "cutter") == ["counter", "binder", "cutter"]
+    # unweighted search still counts hops
+    assert nav._bfs_path("counter", "cutter") == ["counter", "printer", "cutter"]
+
+
+def test_navigator_graph_is_read_only():
+    nav = Navigator({"a": ["b"], "b": []})
+    with pytest.raises(TypeError):
+        nav.graph["b"] = ["c"]
+    with pytest.raises(AttributeError):
+        nav.graph["b"].append("c")
+    nav.graph = {"a": ["b"], "b": ["c"]}
+    assert nav.select_station("a", "c") == ["a", "b", "c"]
@@ -1,5 +1,8 @@
+import pytest
+
 from customers.customer import Customer
-from workflow import Station, run_workflow
+from ui.hud import JobHUD
+from workflow import Pipeline, Station, run_workflow
 
 
 def test_run_workflow_increases_satisfaction():
@@ -7,3 +10,40 @@ def test_run_workflow_increases_satisfaction():
     station = Station()
     run_workflow(customer, station)
     assert customer.satisfaction == 4
+
+
+def test_pipeline_streams_batches_through_stage_pools():
+    customers = [Customer(f"job-{i}", patience=3) for i in range(100)]
+    stations = []
+
+    def station():
+        stations.append(Station())
+        return stations[-1]
+
+    pipeline = Pipeline(workers=[1, 3, 1, 2], batch_size=8, capacity=1, station_factory=station)
+    batches = list(pipeline.run(iter(customers)))
+
+    assert [c for batch in batches for c in batch] == customers  # input order kept
+    assert all(c.satisfaction == 4 for c in customers)
+    assert pipeline.steps == tuple(JobHUD.steps)
+    assert len(stations) == 7
+    for stats in pipeline.stats:
+        assert (stats.customers, stats.batches) == (100, 13)
+        assert stats.throughput > 0 and stats.max_latency >= stats.mean_latency > 0
+
+
+def test_pipeline_stops_on_stage_errors_and_early_exit():
+    class Broken(Station):
+        def process(self, request_type):
+            if request_type == "bad":
+                raise RuntimeError("station on fire")
+            return super().process(request_type)
+
+    customers = [Customer("ok", 3)] * 50 + [Customer("bad", 3)]
+    pipeline = Pipeline(batch_size=4, station_factory=Broken)
+    with pytest.raises(RuntimeError, match="on fire"):
+        pipeline.process(customers)
+
+    endless = (Customer("ok", 3) for _ in iter(int, 1))
+    first = next(Pipeline(batch_size=4, capacity=1).run(endless))
+    assert len(first) == 4
@@ -3,23 +3,55 @@
 The tutorial guides the player through the first few jobs by presenting
 instructions that include the relevant control input and workstation.  Advanced
 machines remain locked until a step that references them becomes active.
+
+Steps list the game events that complete them in ``until``, as
+``(event, station)`` triggers such as ``("job_started", "printer")``; a
+``None`` station matches the event at any station.  :meth:`Tutorial.notify`
+looks an incoming event up in an index of those triggers, so reporting an
+event costs the same however long the tutorial is, and an event that
+completes a later step skips the steps before it.  :class:`~main.Game` reports
+job starts, completions and failures; the UI reports ``("arrived", station)``
+when the player reaches a workstation.
+
+:class:`TutorialMode` lets headless runs fast-forward past the tutorial or
+not create one at all.
 """
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Optional
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
 
 from machines.base import Machine
 
+# (event, station kind); a ``None`` station matches any station
+Trigger = Tuple[str, Optional[str]]
+
+
+class TutorialMode(Enum):
+    """How :class:`~main.Game` handles the tutorial."""
+
+    # start the tutorial once a printer and a binder exist
+    GUIDED = "guided"
+    # create the tutorial already completed, with every step's machine unlocked
+    SKIP = "skip"
+    # never create a tutorial
+    OFF = "off"
+
 
 @dataclass
 class TutorialStep:
-    """A single step in the tutorial sequence."""
+    """A single step in the tutorial sequence.
+
+    ``until`` holds the triggers completing the step; steps without any only
+    advance through :meth:`Tutorial.next_step`.
+    """
 
     instruction: str
     control: str
     station: str
     machine: Optional[Machine] = None
+    until: Tuple[Trigger, ...] = ()
 
 
 class Tutorial:
@@ -34,19 +66,38 @@ class Tutorial:
         self.steps = steps
         self.index = 0
         self.active = False
+        # trigger -> indices of the steps it completes, ascending
+        self._triggers: Dict[Trigger, List[int]] = {}
+        for index, step in enumerate(steps):
+            for trigger in step.until:
+                self._triggers.setdefault(trigger, []).append(index)
 
     def start(self) -> TutorialStep:
         """Begin the tutorial and return the first step."""
         self.active = True
         self.index = 0
+        self._enter(0)
         return self.current_step()
 
     def current_step(self) -> TutorialStep:
-        """Return the currently active step and unlock its machine."""
-        step = self.steps[self.index]
-        if step.machine:
-            step.machine.unlock()
-        return step
+        """Return the currently active step."""
+        return self.steps[self.index]
+
+    def _enter(self, index: int) -> None:
+        machine = self.steps[index].machine
+        if machine:
+            machine.unlock()
+
+    def _advance_to(self, index: int) -> Optional[TutorialStep]:
+        # steps passed over are entered too, so their machines end up unlocked
+        for skipped in range(self.index + 1, min(index, len(self.steps))):
+            self._enter(skipped)
+        self.index = index
+        if index >= len(self.steps):
+            self.active = False
+            return None
+        self._enter(index)
+        return self.current_step()
 
     def next_step(self) -> Optional[TutorialStep]:
         """Advance to the next step and return it.
@@ -55,11 +106,35 @@ class Tutorial:
         """
         if not self.active:
             return self.start()
-        self.index += 1
-        if self.index >= len(self.steps):
-            self.active = False
-            return None
-        return self.current_step()
+        return self._advance_to(self.index + 1)
+
+    def notify(self, event: str, station: Optional[str] = None) -> bool:
+        """Report a game event; return whether it completed a step.
+
+        The event completes the first step at or after the current one that
+        lists ``(event, station)`` or ``(event, None)`` in its ``until``.
+        Inactive tutorials ignore events.
+        """
+        if not self.active:
+            return False
+        completed = None
+        for trigger in ((event, station), (event, None)):
+            for index in self._triggers.get(trigger, ()):
+                if index >= self.index:
+                    if completed is None or index < completed:
+                        completed = index
+                    break
+        if completed is None:
+            return False
+        self._advance_to(completed + 1)
+        return True
+
+    def fast_forward(self) -> None:
+        """Complete every step at once, unlocking the machines they reference."""
+        for index in range(len(self.steps)):
+            self._enter(index)
+        self.index = len(self.steps)
+        self.active = False
 
     def reset(self) -> None:
         """Reset the tutorial so it can be replayed.
@@ -89,9 +164,13 @@ def default_tutorial(printer: Machine, binder: Machine) -> Tutorial:
     """
 
     steps = [
-        TutorialStep("Approach the printer", "WASD", "Printer", printer),
-        TutorialStep("Start the print job", "E", "Printer"),
-        TutorialStep("Carry prints to the binder", "WASD", "Binder", binder),
-        TutorialStep("Bind the booklet", "E", "Binder"),
+        TutorialStep("Approach the printer", "WASD", "Printer", printer,
+                     until=(("arrived", "printer"),)),
+        TutorialStep("Start the print job", "E", "Printer",
+                     until=(("job_started", "printer"),)),
+        TutorialStep("Carry prints to the binder", "WASD", "Binder", binder,
+                     until=(("arrived", "binder"),)),
+        TutorialStep("Bind the booklet", "E", "Binder",
+                     until=(("job_completed", "binder"),)),
     ]
     return Tutorial(steps)
@@ -0,0 +1,64 @@
+"""Rolling frame-time statistics for the render loop."""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Dict, List, Sequence, Tuple
+
+PHASES = ("events", "draw", "present")
+
+# Histogram bucket upper edges in milliseconds; the last bucket is open ended.
+DEFAULT_EDGES_MS: Tuple[float, ...] = (4.0, 8.0, 16.7, 33.3, 50.0, 100.0)
+
+
+class FrameStats:
+    """Keep the timings of the last ``window`` frames per render phase.
+
+    Each frame is recorded as the seconds spent handling events, drawing and
+    presenting.  :meth:`histogram` buckets the frame totals so a slow machine
+    shows up as frames spilling past the 16.7 ms (60 fps) edge.
+    """
+
+    def __init__(self, window: int = 300, edges_ms: Sequence[float] = DEFAULT_EDGES_MS) -> None:
+        self.edges_ms = tuple(edges_ms)
+        self._frames: Dict[str, Deque[float]] = {
+            phase: deque(maxlen=window) for phase in PHASES
+        }
+        self._totals: Deque[float] = deque(maxlen=window)
+
+    def record(self, events: float, draw: float, present: float) -> None:
+        """Store the phase timings (in seconds) of one frame."""
+        self._frames["events"].append(events)
+        self._frames["draw"].append(draw)
+        self._frames["present"].append(present)
+        self._totals.append(events + draw + present)
+
+    def histogram(self, phase: str | None = None) -> List[int]:
+        """Frame counts per bucket of :attr:`edges_ms`, plus an overflow bucket."""
+        samples = self._totals if phase is None else self._frames[phase]
+        counts = [0] * (len(self.edges_ms) + 1)
+        for seconds in samples:
+            ms = seconds * 1000.0
+            for bucket, edge in enumerate(self.edges_ms):
+                if ms <= edge:
+                    counts[bucket] += 1
+                    break
+            else:
+                counts[-1] += 1
+        return counts
+
+    def mean(self, phase: str | None = None) -> float:
+        """Mean seconds per frame for ``phase`` (or the whole frame)."""
+        samples = self._totals if phase is None else self._frames[phase]
+        return sum(samples) / len(samples) if samples else 0.0
+
+    def percentile(self, fraction: float, phase: str | None = None) -> float:
+        """Seconds below which ``fraction`` of the recorded frames fall."""
+        samples = sorted(self._totals if phase is None else self._frames[phase])
+        if not samples:
+            return 0.0
+        index = min(len(samples) - 1, int(fraction * len(samples)))
+        return samples[index]
+
+    def __len__(self) -> int:
+        return len(self._totals)
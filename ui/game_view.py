@@ -3,40 +3,162 @@
 from __future__ import annotations
 
 import os
+import time
+from enum import Enum
+from typing import List, Optional, Tuple
+
 import pygame
 
+from audio import sound_manager
+from ui.frame_stats import FrameStats
+
 
 ASSETS_DIR = os.path.join(os.path.dirname(__file__), "..", "assets", "images")
 
 
+class RenderMode(Enum):
+    FULL = "full"  # redraw and flip the whole screen every frame
+    DIRTY = "dirty"  # only push regions that changed
+
+
+class Sprite:
+    """An image drawn at a position.
+
+    Inactive sprites (idle machines) are baked into the cached static layer;
+    active ones are drawn every frame they are dirty.
+    """
+
+    __slots__ = ("image", "pos", "active", "dirty", "drawn_rect")
+
+    def __init__(self, image: pygame.Surface, pos: Tuple[int, int], active: bool = False) -> None:
+        self.image = image
+        self.pos = pos
+        self.active = active
+        self.dirty = True
+        self.drawn_rect: Optional[pygame.Rect] = None
+
+    @property
+    def rect(self) -> pygame.Rect:
+        return self.image.get_rect(topleft=self.pos)
+
+    def move(self, pos: Tuple[int, int]) -> None:
+        if pos != self.pos:
+            self.pos = pos
+            self.dirty = True
+
+
 class GameView:
-    """Initialize a window and draw basic shop sprites."""
+    """Initialize a window and draw basic shop sprites.
+
+    In :attr:`RenderMode.DIRTY` the floor and inactive sprites are composited
+    once into a static layer.  Each frame only the areas covered by dirty
+    active sprites are restored from that layer, redrawn and pushed with
+    ``pygame.display.update(rects)``; a frame where nothing changed presents
+    nothing.  Per-phase frame timings are kept in :attr:`stats`.
+    """
 
-    def __init__(self, width: int = 800, height: int = 600, fps: int = 60) -> None:
+    def __init__(
+        self,
+        width: int = 800,
+        height: int = 600,
+        fps: int = 60,
+        mode: RenderMode = RenderMode.DIRTY,
+    ) -> None:
         pygame.init()
         self.screen = pygame.display.set_mode((width, height))
         pygame.display.set_caption("Print Shop Simulator")
         self.clock = pygame.time.Clock()
         self.fps = fps
+        self.mode = mode
+        self.stats = FrameStats()
 
         # Load sprites
         floor_path = os.path.join(ASSETS_DIR, "floor.png")
         machine_path = os.path.join(ASSETS_DIR, "machine.png")
         self.floor = pygame.image.load(floor_path).convert_alpha()
         self.machine = pygame.image.load(machine_path).convert_alpha()
+        self.sprites: List[Sprite] = [Sprite(self.machine, (100, 100))]
+        self._static: Optional[pygame.Surface] = None
+
+    # ------------------------------------------------------------------
+    # Static layer
+    def set_active(self, sprite: Sprite, active: bool) -> None:
+        """Move ``sprite`` between the static layer and the dynamic set."""
+        if sprite.active != active:
+            sprite.active = active
+            sprite.dirty = True
+            self._static = None
+
+    def _compose_static(self) -> pygame.Surface:
+        layer = pygame.Surface(self.screen.get_size()).convert()
+        layer.fill((0, 0, 0))
+        layer.blit(self.floor, (0, 0))
+        for sprite in self.sprites:
+            if not sprite.active:
+                layer.blit(sprite.image, sprite.pos)
+        return layer
+
+    # ------------------------------------------------------------------
+    # Drawing
+    def draw_full(self) -> None:
+        self.screen.fill((0, 0, 0))
+        self.screen.blit(self.floor, (0, 0))
+        for sprite in self.sprites:
+            self.screen.blit(sprite.image, sprite.pos)
+            sprite.dirty = False
+
+    def draw_dirty(self) -> Optional[List[pygame.Rect]]:
+        """Redraw changed regions; ``None`` means the whole screen changed."""
+        if self._static is None:
+            self._static = self._compose_static()
+            self.screen.blit(self._static, (0, 0))
+            for sprite in self.sprites:
+                if sprite.active:
+                    self.screen.blit(sprite.image, sprite.pos)
+                    sprite.drawn_rect = sprite.rect
+                sprite.dirty = False
+            return None
+        rects: List[pygame.Rect] = []
+        for sprite in self.sprites:
+            if not (sprite.active and sprite.dirty):
+                continue
+            rect = sprite.rect
+            if sprite.drawn_rect is not None:
+                # restore the background where the sprite used to be
+                self.screen.blit(self._static, sprite.drawn_rect, sprite.drawn_rect)
+                rects.append(sprite.drawn_rect)
+            self.screen.blit(sprite.image, rect)
+            rects.append(rect)
+            sprite.drawn_rect = rect
+            sprite.dirty = False
+        return rects
 
     def run(self) -> None:
         """Start the main loop rendering the shop each frame."""
         running = True
         while running:
+            start = time.perf_counter()
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
+            drawn = time.perf_counter()
+
+            if self.mode is RenderMode.FULL:
+                self.draw_full()
+                rects: Optional[List[pygame.Rect]] = None
+            else:
+                rects = self.draw_dirty()
+            painted = time.perf_counter()
+
+            if rects is None:
+                pygame.display.flip()
+            elif rects:
+                pygame.display.update(rects)
+            presented = time.perf_counter()
+            self.stats.record(drawn - start, painted - drawn, presented - painted)
 
-            self.screen.fill((0, 0, 0))
-            self.screen.blit(self.floor, (0, 0))
-            self.screen.blit(self.machine, (100, 100))
-            pygame.display.flip()
+            # play sounds queued during this frame
+            sound_manager.drain()
             self.clock.tick(self.fps)
 
         pygame.quit()
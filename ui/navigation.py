@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import heapq
+import math
 from collections import deque
 from enum import Enum
-from typing import Callable, Dict, Iterable, List
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
 
 
 class HotkeyManager:
@@ -28,27 +31,208 @@ class NavigationMode(Enum):
 
 
 class Navigator:
-    """Select stations using either pathfinding or instant travel."""
+    """Select stations using either pathfinding or instant travel.
 
-    def __init__(self, graph: Dict[str, Iterable[str]], mode: NavigationMode = NavigationMode.PATHFINDING) -> None:
-        self.graph = graph
+    The station graph is stored as integer-indexed adjacency lists.  Routes
+    are answered from a routing table holding, per source station, the parent
+    of every reachable station in its shortest-path tree; each tree is built
+    on first use (or all at once by :meth:`precompute`) and the table is only
+    discarded when the graph is changed by assigning :attr:`graph` or through
+    :meth:`add_edge` and :meth:`remove_edge`.  A lookup then costs
+    ``O(path length)``.
+
+    The navigator keeps its own copy of the graph and exposes it read-only;
+    later edits to the dict passed to the constructor are not seen.
+
+    ``weights`` maps ``(station, neighbour)`` pairs to floor distances; when
+    given, routes minimise total distance (Dijkstra) instead of hop count.
+    ``positions`` holds station coordinates used as the A* heuristic by
+    :meth:`shortest_path`; they must be on the same scale as the weights so the
+    straight-line distance never overestimates.
+    """
+
+    def __init__(
+        self,
+        graph: Dict[str, Iterable[str]],
+        mode: NavigationMode = NavigationMode.PATHFINDING,
+        weights: Optional[Dict[Tuple[str, str], float]] = None,
+        positions: Optional[Dict[str, Tuple[float, float]]] = None,
+    ) -> None:
         self.mode = mode
+        self.positions = positions or {}
+        self._weights: Dict[Tuple[str, str], float] = dict(weights or {})
+        self.graph = graph
+
+    # ------------------------------------------------------------------
+    # Graph structure
+    @property
+    def graph(self) -> Mapping[str, Tuple[str, ...]]:
+        """Read-only adjacency mapping; assign a new mapping to replace it."""
+        return self._graph_view
+
+    @graph.setter
+    def graph(self, graph: Dict[str, Iterable[str]]) -> None:
+        self._graph = {node: tuple(neighbours) for node, neighbours in graph.items()}
+        self._graph_view = MappingProxyType(self._graph)
+        self._rebuild()
+
+    def add_edge(self, start: str, end: str, weight: Optional[float] = None) -> None:
+        """Add a directed edge and invalidate the routing table."""
+        self._graph[start] = self._graph.get(start, ()) + (end,)
+        if weight is not None:
+            self._weights[(start, end)] = weight
+        self._rebuild()
+
+    def remove_edge(self, start: str, end: str) -> None:
+        """Remove a directed edge and invalidate the routing table."""
+        neighbours = list(self._graph[start])
+        neighbours.remove(end)
+        self._graph[start] = tuple(neighbours)
+        self._weights.pop((start, end), None)
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        index: Dict[str, int] = {}
+        names: List[str] = []
+        for node, neighbours in self._graph.items():
+            for name in (node, *neighbours):
+                if name not in index:
+                    index[name] = len(names)
+                    names.append(name)
+        self._index = index
+        self._names = names
+        self._adjacency: List[List[int]] = [[] for _ in names]
+        self._costs: List[List[float]] = [[] for _ in names]
+        for node, neighbours in self._graph.items():
+            row = index[node]
+            for neighbour in neighbours:
+                self._adjacency[row].append(index[neighbour])
+                self._costs[row].append(self._weights.get((node, neighbour), 1.0))
+        self._weighted = bool(self._weights)
+        self._routes: List[Optional[List[int]]] = [None] * len(names)
+
+    # ------------------------------------------------------------------
+    # Routing table
+    def precompute(self) -> None:
+        """Fill the routing table for every source station."""
+        for source in range(len(self._names)):
+            self._tree(source)
+
+    def _tree(self, source: int) -> List[int]:
+        parents = self._routes[source]
+        if parents is None:
+            if self._weighted:
+                parents = self._dijkstra(source)
+            else:
+                parents = self._bfs_tree(source)
+            self._routes[source] = parents
+        return parents
 
+    def _bfs_tree(self, source: int, target: int = -1) -> List[int]:
+        """Parent pointers of a breadth-first search; -1 marks unreached."""
+        parents = [-1] * len(self._names)
+        parents[source] = source
+        queue = deque([source])
+        adjacency = self._adjacency
+        while queue:
+            node = queue.popleft()
+            if node == target:
+                break
+            for neighbour in adjacency[node]:
+                if parents[neighbour] < 0:
+                    parents[neighbour] = node
+                    queue.append(neighbour)
+        return parents
+
+    def _dijkstra(self, source: int) -> List[int]:
+        parents = [-1] * len(self._names)
+        distance = [math.inf] * len(self._names)
+        parents[source] = source
+        distance[source] = 0.0
+        heap = [(0.0, source)]
+        while heap:
+            dist, node = heapq.heappop(heap)
+            if dist > distance[node]:
+                continue
+            for neighbour, cost in zip(self._adjacency[node], self._costs[node]):
+                candidate = dist + cost
+                if candidate < distance[neighbour]:
+                    distance[neighbour] = candidate
+                    parents[neighbour] = node
+                    heapq.heappush(heap, (candidate, neighbour))
+        return parents
+
+    def _walk(self, parents: List[int], source: int, target: int) -> List[str]:
+        if parents[target] < 0:
+            return []
+        path = [target]
+        while target != source:
+            target = parents[target]
+            path.append(target)
+        path.reverse()
+        return [self._names[node] for node in path]
+
+    # ------------------------------------------------------------------
+    # Queries
     def select_station(self, start: str, target: str) -> List[str]:
         """Return path to ``target`` based on navigation mode."""
         if self.mode is NavigationMode.INSTANT:
             return [target]
-        return self._bfs_path(start, target)
+        return self.route(start, target)
+
+    def route(self, start: str, target: str) -> List[str]:
+        """Shortest path from the routing table; empty when unreachable."""
+        if start == target:
+            return [start]
+        source = self._index.get(start)
+        goal = self._index.get(target)
+        if source is None or goal is None:
+            return []
+        return self._walk(self._tree(source), source, goal)
+
+    def shortest_path(self, start: str, target: str) -> List[str]:
+        """One-off A* search using :attr:`positions` as the heuristic.
+
+        Stations without a position fall back to a zero heuristic, which makes
+        the search equivalent to Dijkstra.
+        """
+        if start == target:
+            return [start]
+        source = self._index.get(start)
+        goal = self._index.get(target)
+        if source is None or goal is None:
+            return []
+        goal_pos = self.positions.get(target)
+
+        def estimate(node: int) -> float:
+            pos = self.positions.get(self._names[node])
+            if pos is None or goal_pos is None:
+                return 0.0
+            return math.dist(pos, goal_pos)
+
+        parents = [-1] * len(self._names)
+        distance = [math.inf] * len(self._names)
+        parents[source] = source
+        distance[source] = 0.0
+        heap = [(estimate(source), source)]
+        while heap:
+            _, node = heapq.heappop(heap)
+            if node == goal:
+                break
+            for neighbour, cost in zip(self._adjacency[node], self._costs[node]):
+                candidate = distance[node] + cost
+                if candidate < distance[neighbour]:
+                    distance[neighbour] = candidate
+                    parents[neighbour] = node
+                    heapq.heappush(heap, (candidate + estimate(neighbour), neighbour))
+        return self._walk(parents, source, goal)
 
     def _bfs_path(self, start: str, target: str) -> List[str]:
-        queue = deque([(start, [start])])
-        visited = {start}
-        while queue:
-            node, path = queue.popleft()
-            if node == target:
-                return path
-            for neighbour in self.graph.get(node, []):
-                if neighbour not in visited:
-                    visited.add(neighbour)
-                    queue.append((neighbour, path + [neighbour]))
-        return []
+        """Uncached breadth-first search stopping at ``target``."""
+        if start == target:
+            return [start]
+        source = self._index.get(start)
+        goal = self._index.get(target)
+        if source is None or goal is None:
+            return []
+        return self._walk(self._bfs_tree(source, goal), source, goal)
@@ -1,3 +1,30 @@
+"""Customer service workflow: greet, process the job, deliver and check out.
+
+:func:`run_workflow` takes one customer through the steps at a single
+:class:`Station`; :class:`Pipeline` streams batches of customers through the
+same steps with a pool of stations per step.
+"""
+
+from __future__ import annotations
+
+import itertools
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
 from customers.customer import Customer
 
 
@@ -31,3 +58,228 @@ def run_workflow(customer: Customer, station: Station) -> None:
     process_job(customer, station)
     deliver(customer)
     checkout(customer)
+
+
+# ----------------------------------------------------------------------
+# Staged pipeline
+
+StageFunc = Callable[[Customer, Station], None]
+
+
+def _without_station(step: Callable[[Customer], None]) -> StageFunc:
+    def run(customer: Customer, station: Station) -> None:
+        step(customer)
+
+    run.__name__ = step.__name__
+    return run
+
+
+# (name, step) in workflow order; the names are the steps of ui.hud.JobHUD
+STAGES: Tuple[Tuple[str, StageFunc], ...] = (
+    ("greet", _without_station(greet)),
+    ("process_job", process_job),
+    ("deliver", _without_station(deliver)),
+    ("checkout", _without_station(checkout)),
+)
+
+_DONE = object()  # end of input marker passed down the stage queues
+
+
+@dataclass
+class StageStats:
+    """Throughput and latency counters of one pipeline stage.
+
+    ``busy`` is the summed time workers spent running the stage and
+    ``waited`` the summed time batches sat in the stage's inbound queue;
+    a batch's latency is its wait plus its processing time.
+    """
+
+    name: str
+    workers: int
+    customers: int = 0
+    batches: int = 0
+    busy: float = 0.0
+    waited: float = 0.0
+    max_latency: float = 0.0
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, size: int, queued_at: float, start: float, end: float) -> None:
+        with self._lock:
+            self.customers += size
+            self.batches += 1
+            self.busy += end - start
+            self.waited += start - queued_at
+            self.max_latency = max(self.max_latency, end - queued_at)
+            if self.started is None or start < self.started:
+                self.started = start
+            if self.finished is None or end > self.finished:
+                self.finished = end
+
+    @property
+    def throughput(self) -> float:
+        """Customers per second between the stage's first start and last finish."""
+        if self.started is None or self.finished is None or self.finished <= self.started:
+            return 0.0
+        return self.customers / (self.finished - self.started)
+
+    @property
+    def mean_latency(self) -> float:
+        return (self.waited + self.busy) / self.batches if self.batches else 0.0
+
+
+class Pipeline:
+    """Stream customers through the workflow stages in batches.
+
+    Every stage runs on its own pool of worker threads, each with a
+    :class:`Station` from ``station_factory``.  Stages are connected by
+    queues holding at most ``capacity`` batches, so a slow stage holds back
+    the ones before it instead of letting work pile up in memory.  A batch
+    goes through the stages one after another, so each customer receives the
+    same satisfaction increments as with :func:`run_workflow`.
+
+    ``workers`` is either one count for every stage or one count per stage.
+    Threads overlap stages that wait on I/O; pure-Python steps still take
+    turns on the interpreter lock.
+    """
+
+    def __init__(
+        self,
+        workers: Union[int, Sequence[int]] = 2,
+        batch_size: int = 32,
+        capacity: int = 4,
+        station_factory: Callable[[], Station] = Station,
+        stages: Sequence[Tuple[str, StageFunc]] = STAGES,
+    ) -> None:
+        self.stages = tuple(stages)
+        counts = [workers] * len(self.stages) if isinstance(workers, int) else list(workers)
+        if len(counts) != len(self.stages) or min(counts) < 1:
+            raise ValueError("need at least one worker for every stage")
+        if batch_size < 1 or capacity < 1:
+            raise ValueError("batch_size and capacity must be positive")
+        self.workers = counts
+        self.batch_size = batch_size
+        self.capacity = capacity
+        self.station_factory = station_factory
+        self.stats: List[StageStats] = []
+
+    @property
+    def steps(self) -> Tuple[str, ...]:
+        return tuple(name for name, _ in self.stages)
+
+    def run(self, customers: Iterable[Customer]) -> Iterator[List[Customer]]:
+        """Yield the batches of ``customers`` as they finish, in input order.
+
+        ``customers`` is read lazily on a producer thread.  :attr:`stats` is
+        reset at the start of every run.  An exception raised by a stage
+        stops the pipeline and is re-raised here.
+        """
+        self.stats = [
+            StageStats(name, count) for (name, _), count in zip(self.stages, self.workers)
+        ]
+        queues: List["queue.Queue[Any]"] = [
+            queue.Queue(maxsize=self.capacity) for _ in range(len(self.stages) + 1)
+        ]
+        cancel = threading.Event()
+        errors: List[BaseException] = []
+        remaining = list(self.workers)
+        remaining_lock = threading.Lock()
+
+        def put(target: "queue.Queue[Any]", item: object) -> bool:
+            while not cancel.is_set():
+                try:
+                    target.put(item, timeout=0.05)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(source: "queue.Queue[Any]") -> object:
+            while not cancel.is_set():
+                try:
+                    return source.get(timeout=0.05)
+                except queue.Empty:
+                    continue
+            return None
+
+        def produce() -> None:
+            try:
+                source = iter(customers)
+                seq = 0
+                while True:
+                    batch = list(itertools.islice(source, self.batch_size))
+                    if not batch:
+                        break
+                    if not put(queues[0], (seq, time.perf_counter(), batch)):
+                        return
+                    seq += 1
+                for _ in range(self.workers[0]):
+                    put(queues[0], _DONE)
+            except BaseException as exc:  # handed to the consumer
+                errors.append(exc)
+                cancel.set()
+
+        def work(index: int) -> None:
+            _, step = self.stages[index]
+            stats = self.stats[index]
+            inbox, outbox = queues[index], queues[index + 1]
+            try:
+                station = self.station_factory()
+                while True:
+                    item = get(inbox)
+                    if item is None:
+                        return
+                    if item is _DONE:
+                        break
+                    seq, queued_at, batch = item  # type: ignore[misc]
+                    start = time.perf_counter()
+                    for customer in batch:
+                        step(customer, station)
+                    end = time.perf_counter()
+                    stats.record(len(batch), queued_at, start, end)
+                    if not put(outbox, (seq, end, batch)):
+                        return
+                with remaining_lock:
+                    remaining[index] -= 1
+                    last = remaining[index] == 0
+                if last:
+                    # the last worker out passes the end of input on
+                    following = index + 1
+                    count = self.workers[following] if following < len(self.stages) else 1
+                    for _ in range(count):
+                        put(outbox, _DONE)
+            except BaseException as exc:
+                errors.append(exc)
+                cancel.set()
+
+        threads = [threading.Thread(target=produce, name="pipeline-input", daemon=True)]
+        for index, (name, _) in enumerate(self.stages):
+            threads += [
+                threading.Thread(target=work, args=(index,), name=f"pipeline-{name}", daemon=True)
+                for _ in range(self.workers[index])
+            ]
+        for thread in threads:
+            thread.start()
+        try:
+            finished: Dict[int, List[Customer]] = {}
+            next_seq = 0
+            while True:
+                item = get(queues[-1])
+                if item is None or item is _DONE:
+                    break
+                seq, _, batch = item  # type: ignore[misc]
+                finished[seq] = batch
+                while next_seq in finished:
+                    yield finished.pop(next_seq)
+                    next_seq += 1
+            if errors:
+                raise errors[0]
+        finally:
+            cancel.set()
+            for thread in threads:
+                thread.join()
+
+    def process(self, customers: Iterable[Customer]) -> List[Customer]:
+        """Run ``customers`` through the pipeline and return them in order."""
+        return [customer for batch in self.run(customers) for customer in batch]